@@ -0,0 +1,102 @@
+import argparse
+import sys
+
+from .mock_directus import MockDirectus
+from .runner import (
+    compare,
+    environment,
+    load_results,
+    print_table,
+    run_benchmark,
+    save_results,
+)
+from .suite import BENCHMARKS, COLLECTION
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark pydirectus against an in-process mock Directus",
+    )
+    parser.add_argument(
+        "-k", "--only", action="append", help="run benchmarks whose name contains this"
+    )
+    parser.add_argument("--list", action="store_true", help="list the benchmarks")
+    parser.add_argument(
+        "--size", type=int, default=10000, help="items in the collection"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="latency per response in ms"
+    )
+    parser.add_argument(
+        "--file-size", type=int, default=8, help="size of the downloaded file in MiB"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="timed operations")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed operations")
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="compare with results saved before"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="relative change that is not yet a regression",
+    )
+    args = parser.parse_args(argv)
+
+    benchmarks = [
+        benchmark
+        for benchmark in BENCHMARKS
+        if not args.only or any(name in benchmark.name for name in args.only)
+    ]
+    if args.list:
+        for benchmark in benchmarks:
+            print(f"{benchmark.name:26}{benchmark.description}")
+        return 0
+
+    options = {
+        "size": args.size,
+        "latency_ms": args.latency,
+        "file_size_mib": args.file_size,
+        "repeat": args.repeat,
+    }
+    mock = MockDirectus(
+        {COLLECTION: args.size},
+        latency=args.latency / 1000,
+        file_size=args.file_size * 1024 * 1024,
+    )
+
+    baseline = load_results(args.compare) if args.compare else None
+    if baseline and baseline["environment"] != environment(**options):
+        print(
+            "warning: the baseline was measured in another environment, "
+            "compare results of the same machine and options only",
+            file=sys.stderr,
+        )
+
+    results = {}
+    for benchmark in benchmarks:
+        try:
+            result = run_benchmark(benchmark, mock, args.repeat, args.warmup)
+        except ImportError as e:
+            print(f"skipped {benchmark.name}: {e}", file=sys.stderr)
+            continue
+        results[benchmark.name] = result.summary()
+
+    print_table(results, baseline["results"] if baseline else None)
+
+    if args.save:
+        save_results(args.save, results, environment(**options))
+
+    if baseline:
+        regressions = compare(results, baseline["results"], args.tolerance)
+        for name, metric, old, new, change in regressions:
+            print(f"regression: {name} {metric} {old} -> {new} ({change:+.1%})")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+import asyncio
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from collections import Counter
+from typing import Callable, Optional
+
+import httpx
+
+from pydirectus.local_query import run_query
+from pydirectus.utils import endpoint_template
+
+_ITEM = re.compile(r"^/items/(?P<collection>[^/]+)(?:/(?P<id>[^/]+))?$")
+_ASSET = re.compile(r"^/assets/(?P<id>[^/]+)$")
+_FILE = re.compile(r"^/files(?:/(?P<id>[^/]+))?$")
+_RANGE = re.compile(r"^bytes=(\d+)-$")
+
+_WORDS = (
+    "directus lorem ipsum dolor sit amet consectetur adipiscing elit sed do "
+    "eiusmod tempor incididunt ut labore et dolore magna aliqua"
+).split()
+
+
+def synthetic_items(size: int, seed: int = 0) -> list[dict]:
+    """
+    Items shaped like a typical content collection: scalars, text, a list and a
+    nested relation
+    :param size: the number of items
+    :param seed: the seed of the random generator, the same seed yields the same items
+    """
+    rng = random.Random(seed)
+
+    return [
+        {
+            "id": id,
+            "status": rng.choice(("published", "draft", "archived")),
+            "title": " ".join(rng.choices(_WORDS, k=6)),
+            "body": " ".join(rng.choices(_WORDS, k=40)),
+            "price": round(rng.uniform(1, 1000), 2),
+            "stock": rng.randint(0, 500),
+            "tags": rng.sample(_WORDS, k=3),
+            "date_created": f"2024-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}T12:00:00.000Z",
+            "author": {"id": rng.randint(1, 50), "name": rng.choice(_WORDS).title()},
+        }
+        for id in range(1, size + 1)
+    ]
+
+
+def _json(status_code: int, content: bytes) -> httpx.Response:
+    return httpx.Response(
+        status_code, content=content, headers={"Content-Type": "application/json"}
+    )
+
+
+def _error(status_code: int, code: str, message: str) -> httpx.Response:
+    body = {"errors": [{"message": message, "extensions": {"code": code}}]}
+    return _json(status_code, json.dumps(body).encode())
+
+
+class MockDirectus:
+    def __init__(
+        self,
+        collections: Optional[dict[str, int]] = None,
+        latency: float = 0.0,
+        file_size: int = 8 * 1024 * 1024,
+        static_token: str = "benchmark",
+        token_ttl: int = 900000,
+        seed: int = 0,
+    ):
+        """
+        An in-process Directus serving synthetic collections through a mock
+        transport, so the client is benchmarked without network or server
+        variance. Read responses are encoded once and then served from memory, so
+        the time measured is spent in the client.
+        :param collections: collection names and their number of items
+        :param latency: seconds every response is delayed, simulating the network
+          and server time (time.sleep for sync, asyncio.sleep for async clients)
+        :param file_size: the size of the file served from /assets in bytes
+        :param static_token: the static token accepted besides issued access tokens
+        :param token_ttl: the lifetime of access tokens issued on login and refresh in ms
+        :param seed: the seed of the synthetic data
+        """
+        collections = collections if collections is not None else {"articles": 10000}
+        self.collections = {
+            name: synthetic_items(size, seed) for name, size in collections.items()
+        }
+        self._by_id = {
+            name: {str(item["id"]): item for item in items}
+            for name, items in self.collections.items()
+        }
+        self.latency = latency
+        self.file = random.Random(seed).randbytes(file_size)
+        self.static_token = static_token
+        self.token_ttl = token_ttl
+
+        # the number of requests per method and endpoint template, e.g. ("POST", "/auth/refresh")
+        self.requests: Counter = Counter()
+        self._responses: dict[str, bytes] = {}
+        self._access_tokens: dict[str, float] = {}
+        self._refresh_token: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def transport(self) -> "_Transport":
+        """
+        Transport for a DirectusClient, e.g. DirectusClient(..., transport=mock.transport())
+        """
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if self.latency:
+                time.sleep(self.latency)
+            return self.handle(request)
+
+        return _Transport(handler)
+
+    def async_transport(self) -> "_Transport":
+        """
+        Transport for an AsyncDirectusClient
+        """
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if not _FILE.match(request.url.path):
+                # handle reads the other bodies synchronously
+                await request.aread()
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self.handle(request)
+
+        return _Transport(handler)
+
+    def reset(self) -> None:
+        """
+        Reset the request counters, issued tokens and encoded responses are kept
+        """
+        with self._lock:
+            self.requests.clear()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        with self._lock:
+            self.requests[(request.method, endpoint_template(path))] += 1
+
+        if path in ("/auth/login", "/auth/refresh"):
+            return self._auth(request, path)
+        if not self._authorized(request):
+            return _error(401, "TOKEN_EXPIRED", "Token expired.")
+
+        if match := _ITEM.match(path):
+            collection = match["collection"]
+            if collection not in self.collections:
+                return _error(403, "FORBIDDEN", "You don't have permission.")
+            if request.method == "GET":
+                return self._read(request, collection, match["id"])
+            if request.method in ("POST", "PATCH"):
+                # echo the payload, like Directus returning the written items
+                return _json(200, b'{"data":' + request.read() + b"}")
+            if request.method == "DELETE":
+                return httpx.Response(204)
+        elif _ASSET.match(path) and request.method == "GET":
+            return self._asset(request)
+        elif match := _FILE.match(path):
+            if request.method == "POST" and match["id"] is None:
+                return self._upload(request, secrets.token_hex(16))
+            if request.method == "PATCH" and match["id"] is not None:
+                return self._upload(request, match["id"])
+
+        return _error(404, "ROUTE_NOT_FOUND", f"Route {path} doesn't exist.")
+
+    def _authorized(self, request: httpx.Request) -> bool:
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token == self.static_token:
+            return True
+
+        expires = self._access_tokens.get(token)
+        return expires is not None and time.monotonic() < expires
+
+    def _auth(self, request: httpx.Request, path: str) -> httpx.Response:
+        data = json.loads(request.read())
+
+        with self._lock:
+            if (
+                path == "/auth/refresh"
+                and data.get("refresh_token") != self._refresh_token
+            ):
+                return _error(401, "INVALID_CREDENTIALS", "Invalid user credentials.")
+
+            access_token = secrets.token_hex(16)
+            refresh_token = self._refresh_token = secrets.token_hex(16)
+            self._access_tokens[access_token] = time.monotonic() + self.token_ttl / 1000
+
+        body = {
+            "data": {
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+                "expires": self.token_ttl,
+            }
+        }
+        return _json(200, json.dumps(body).encode())
+
+    def _read(
+        self, request: httpx.Request, collection: str, id: Optional[str]
+    ) -> httpx.Response:
+        key = str(request.url)
+        content = self._responses.get(key)
+
+        if content is None:
+            if id is not None:
+                item = self._by_id[collection].get(id)
+                if item is None:
+                    return _error(403, "FORBIDDEN", "You don't have permission.")
+                body = {"data": item}
+            else:
+                body = self._query(collection, request.url.params)
+            content = json.dumps(body).encode()
+            self._responses[key] = content
+
+        return _json(200, content)
+
+    def _query(self, collection: str, params: httpx.QueryParams) -> dict:
+        query: dict = {}
+        for key in ("limit", "offset", "page"):
+            if key in params:
+                query[key] = int(params[key])
+        for key in ("fields", "sort"):
+            values = [v for value in params.get_list(key) for v in value.split(",")]
+            if values:
+                query[key] = values
+        if "filter" in params:
+            query["filter"] = json.loads(params["filter"])
+        if "search" in params:
+            query["search"] = params["search"]
+
+        items = self.collections[collection]
+        body: dict = {"data": run_query(items, query)}
+
+        if "meta" in params:
+            count = len(run_query(items, {"filter": query.get("filter")}, None))
+            body["meta"] = {"filter_count": count, "total_count": len(items)}
+
+        return body
+
+    def _asset(self, request: httpx.Request) -> httpx.Response:
+        start = 0
+        if match := _RANGE.match(request.headers.get("Range", "")):
+            start = int(match[1])
+        if start >= len(self.file):
+            return httpx.Response(416)
+
+        content = memoryview(self.file)[start:]
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "Content-Length": str(len(content)),
+        }
+        if start:
+            headers["Content-Range"] = (
+                f"bytes {start}-{len(self.file) - 1}/{len(self.file)}"
+            )
+
+        return httpx.Response(
+            206 if start else 200, headers=headers, stream=_MemoryStream(content)
+        )
+
+    def _upload(self, request: httpx.Request, id: str) -> httpx.Response:
+        # consume the multipart body in chunks, like a server writing it to storage
+        size = 0
+        for chunk in request.stream:
+            size += len(chunk)
+
+        body = {"data": {"id": id, "filesize": size}}
+        return _json(200, json.dumps(body).encode())
+
+
+class _Transport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Like httpx.MockTransport, but the request body is left to the handler instead
+    of being read into memory first, so uploads are streamed to the mock
+    """
+
+    def __init__(self, handler: Callable):
+        self.handler = handler
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.handler(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.handler(request)
+
+
+class _MemoryStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Serve a file from memory in chunks without copying it, like a socket would
+    """
+
+    def __init__(self, content: memoryview, chunk_size: int = 64 * 1024):
+        self._content = content
+        self._chunk_size = chunk_size
+
+    def __iter__(self):
+        for start in range(0, len(self._content), self._chunk_size):
+            yield bytes(self._content[start : start + self._chunk_size])
+
+    async def __aiter__(self):
+        for chunk in self:
+            yield chunk
@@ -0,0 +1,293 @@
+import asyncio
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, AsyncContextManager, Callable, ContextManager, Optional, Union
+
+from pydirectus.codec import default_codec
+
+from .mock_directus import MockDirectus
+
+# metrics compared against a baseline and whether a higher value is better
+METRICS = {
+    "throughput": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "cpu_us_per_unit": False,
+    "peak_memory_kib": False,
+    "requests_per_op": False,
+}
+
+Setup = Callable[[MockDirectus], Union[ContextManager, AsyncContextManager]]
+
+
+class Benchmark:
+    def __init__(
+        self,
+        name: str,
+        setup: Setup,
+        description: str = "",
+        unit: str = "items",
+        is_async: bool = False,
+    ):
+        """
+        A benchmarked operation
+        :param name: unique name, used as key of the results
+        :param setup: context manager factory, called with the MockDirectus, yielding
+          the operation. The operation returns the number of units it processed.
+        :param description: what is measured
+        :param unit: the unit of the throughput, e.g. items or MiB
+        :param is_async: the setup is an async context manager yielding a coroutine function
+        """
+        self.name = name
+        self.setup = setup
+        self.description = description
+        self.unit = unit
+        self.is_async = is_async
+
+    def __repr__(self) -> str:
+        return f"Benchmark({self.name!r})"
+
+
+class BenchmarkResult:
+    def __init__(
+        self,
+        benchmark: Benchmark,
+        units: float,
+        latencies: list[float],
+        wall_time: float,
+        cpu_time: float,
+        peak_memory: int,
+        requests: int,
+    ):
+        """
+        Measurements of a benchmark
+        :param units: the units processed in all timed operations
+        :param latencies: the duration of each timed operation in seconds
+        :param wall_time: the duration of all timed operations in seconds
+        :param cpu_time: the CPU time of the process (all threads) during the timed operations
+        :param peak_memory: the peak of allocated memory during one operation in bytes
+        :param requests: the requests received by the mock during the timed operations
+        """
+        self.benchmark = benchmark
+        self.units = units
+        self.latencies = latencies
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.peak_memory = peak_memory
+        self.requests = requests
+
+    def summary(self) -> dict:
+        ops = len(self.latencies)
+        return {
+            "unit": self.benchmark.unit,
+            "ops": ops,
+            "throughput": round(self.units / self.wall_time, 2),
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 3),
+            "cpu_us_per_unit": round(self.cpu_time / self.units * 1e6, 3),
+            "peak_memory_kib": round(self.peak_memory / 1024, 1),
+            "requests_per_op": round(self.requests / ops, 2),
+        }
+
+
+def percentile(values: list[float], p: float) -> float:
+    """
+    The nearest-rank percentile
+    """
+    ordered = sorted(values)
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+def _start() -> tuple[float, float]:
+    gc.collect()
+    return time.perf_counter(), time.process_time()
+
+
+def _result(
+    benchmark: Benchmark,
+    mock: MockDirectus,
+    start: tuple[float, float],
+    units: float,
+    latencies: list[float],
+    peak_memory: int,
+) -> BenchmarkResult:
+    return BenchmarkResult(
+        benchmark,
+        units,
+        latencies,
+        wall_time=time.perf_counter() - start[0],
+        cpu_time=time.process_time() - start[1],
+        peak_memory=peak_memory,
+        requests=sum(mock.requests.values()),
+    )
+
+
+def _measure_memory(operation: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def _measure_memory_async(operation: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        await operation()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(
+    benchmark: Benchmark, mock: MockDirectus, repeat: int = 20, warmup: int = 2
+) -> BenchmarkResult:
+    """
+    Run a benchmark: warm up (filling the response cache of the mock), time
+    repeated operations, then trace the memory of one more operation. The memory
+    is traced separately, as tracemalloc slows down allocations considerably.
+    :param repeat: the number of timed operations
+    :param warmup: the number of operations before timing
+    """
+    if benchmark.is_async:
+        return asyncio.run(_run_async(benchmark, mock, repeat, warmup))
+
+    with benchmark.setup(mock) as operation:
+        for _ in range(warmup):
+            operation()
+
+        mock.reset()
+        units, latencies = 0, []
+        start = _start()
+        for _ in range(repeat):
+            operation_start = time.perf_counter()
+            units += operation()
+            latencies.append(time.perf_counter() - operation_start)
+        result = _result(benchmark, mock, start, units, latencies, 0)
+
+        result.peak_memory = _measure_memory(operation)
+
+    return result
+
+
+async def _run_async(
+    benchmark: Benchmark, mock: MockDirectus, repeat: int, warmup: int
+) -> BenchmarkResult:
+    async with benchmark.setup(mock) as operation:
+        for _ in range(warmup):
+            await operation()
+
+        mock.reset()
+        units, latencies = 0, []
+        start = _start()
+        for _ in range(repeat):
+            operation_start = time.perf_counter()
+            units += await operation()
+            latencies.append(time.perf_counter() - operation_start)
+        result = _result(benchmark, mock, start, units, latencies, 0)
+
+        result.peak_memory = await _measure_memory_async(operation)
+
+    return result
+
+
+def environment(**options: Any) -> dict:
+    """
+    Describe where the results were measured, results are only comparable on the
+    same machine and with the same options
+    """
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "codec": default_codec().name,
+        **options,
+    }
+
+
+def save_results(path: str, results: dict, environment: dict) -> None:
+    with open(path, "w") as f:
+        json.dump({"environment": environment, "results": results}, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(
+    results: dict, baseline: dict, tolerance: float = 0.15
+) -> list[tuple[str, str, float, float, float]]:
+    """
+    Compare results with a baseline
+    :param results: the summaries by benchmark name
+    :param baseline: the summaries of the baseline by benchmark name
+    :param tolerance: the relative change that is not yet a regression
+    :return: the regressions as (benchmark, metric, baseline value, value, relative change)
+    """
+    regressions = []
+
+    for name, summary in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            old, new = base.get(metric), summary.get(metric)
+            if not old or new is None:
+                continue
+
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append((name, metric, old, new, change))
+
+    return regressions
+
+
+def print_table(
+    results: dict, baseline: Optional[dict] = None, file=sys.stdout
+) -> None:
+    columns = (
+        ("benchmark", 26),
+        ("throughput", 18),
+        ("p50 ms", 10),
+        ("p95 ms", 10),
+        ("p99 ms", 10),
+        ("cpu us/unit", 12),
+        ("peak KiB", 10),
+        ("req/op", 8),
+    )
+    print("".join(title.ljust(width) for title, width in columns), file=file)
+
+    for name, summary in results.items():
+        values = (
+            name,
+            f"{summary['throughput']:.1f} {summary['unit']}/s",
+            summary["p50_ms"],
+            summary["p95_ms"],
+            summary["p99_ms"],
+            summary["cpu_us_per_unit"],
+            summary["peak_memory_kib"],
+            summary["requests_per_op"],
+        )
+        line = "".join(str(v).ljust(width) for v, (_, width) in zip(values, columns))
+
+        base = (baseline or {}).get(name)
+        if base and base.get("throughput"):
+            change = (summary["throughput"] - base["throughput"]) / base["throughput"]
+            line += f"{change:+.1%} throughput"
+        print(line.rstrip(), file=file)
@@ -0,0 +1,286 @@
+import asyncio
+import inspect
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable
+
+from pydirectus import AsyncDirectusClient, DirectusClient
+from pydirectus.codec import default_codec
+from pydirectus.records import record_class
+
+from .mock_directus import MockDirectus
+from .runner import Benchmark
+
+HOSTNAME = "http://directus.benchmark"
+COLLECTION = "articles"
+PAGE_SIZE = 100
+CONCURRENCY = 16
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(
+    name: str, description: str, unit: str = "items"
+) -> Callable[[Callable], Callable]:
+    """
+    Register a generator function yielding the operation as Benchmark, async
+    generator functions become async benchmarks
+    """
+
+    def register(setup: Callable) -> Callable:
+        if inspect.isasyncgenfunction(setup):
+            BENCHMARKS.append(
+                Benchmark(name, asynccontextmanager(setup), description, unit, True)
+            )
+        else:
+            BENCHMARKS.append(Benchmark(name, contextmanager(setup), description, unit))
+        return setup
+
+    return register
+
+
+def client(mock: MockDirectus, **options) -> DirectusClient:
+    options.setdefault("static_token", mock.static_token)
+    return DirectusClient(hostname=HOSTNAME, transport=mock.transport(), **options)
+
+
+def async_client(mock: MockDirectus, **options) -> AsyncDirectusClient:
+    options.setdefault("static_token", mock.static_token)
+    return AsyncDirectusClient(
+        hostname=HOSTNAME, transport=mock.async_transport(), **options
+    )
+
+
+@benchmark("read_items", f"one page of {PAGE_SIZE} items")
+def read_items(mock: MockDirectus):
+    with client(mock) as directus:
+        yield lambda: len(
+            directus.read_items(COLLECTION, {"limit": PAGE_SIZE, "offset": 100})
+        )
+
+
+@benchmark("read_item", "one item by ID")
+def read_item(mock: MockDirectus):
+    with client(mock) as directus:
+        yield lambda: len([directus.read_item(COLLECTION, "42")])
+
+
+def _decode(mock: MockDirectus, codec_name: str, record_type=None):
+    # raises ImportError if the codec is not installed, the benchmark is skipped
+    with client(mock, codec=default_codec(codec_name)) as directus:
+        yield lambda: len(
+            directus.read_items(COLLECTION, {"limit": -1}, record_type=record_type)
+        )
+
+
+@benchmark("decode_json", "the whole collection in one response, stdlib json")
+def decode_json(mock: MockDirectus):
+    yield from _decode(mock, "json")
+
+
+@benchmark("decode_orjson", "the whole collection in one response, orjson")
+def decode_orjson(mock: MockDirectus):
+    yield from _decode(mock, "orjson")
+
+
+@benchmark("decode_msgspec", "the whole collection in one response, msgspec")
+def decode_msgspec(mock: MockDirectus):
+    yield from _decode(mock, "msgspec")
+
+
+@benchmark("decode_records", "the whole collection decoded into Record classes")
+def decode_records(mock: MockDirectus):
+    fields = mock.collections[COLLECTION][0]
+    ArticleRecord = record_class({field: object for field in fields}, "Article")
+
+    yield from _decode(mock, default_codec().name, record_type=ArticleRecord)
+
+
+@benchmark("stream_items", "the whole collection parsed incrementally")
+def stream_items(mock: MockDirectus):
+    with client(mock) as directus:
+        yield lambda: sum(1 for _ in directus.stream_items(COLLECTION, {"limit": -1}))
+
+
+@benchmark("iter_items_offset", f"all items in pages of {PAGE_SIZE}, offset paging")
+def iter_items_offset(mock: MockDirectus):
+    with client(mock) as directus:
+        yield lambda: sum(
+            1 for _ in directus.iter_items(COLLECTION, page_size=PAGE_SIZE)
+        )
+
+
+@benchmark("iter_items_prefetch", "all items, fetching the next page while consuming")
+def iter_items_prefetch(mock: MockDirectus):
+    with client(mock) as directus:
+        yield lambda: sum(
+            1
+            for _ in directus.iter_items(COLLECTION, page_size=PAGE_SIZE, prefetch=True)
+        )
+
+
+@benchmark("iter_items_keyset", "all items, keyset paging on the primary key")
+def iter_items_keyset(mock: MockDirectus):
+    with client(mock) as directus:
+        yield lambda: sum(
+            1 for _ in directus.iter_items(COLLECTION, page_size=PAGE_SIZE, keyset="id")
+        )
+
+
+@benchmark("iter_items_parallel", "all items, 4 pages in flight")
+def iter_items_parallel(mock: MockDirectus):
+    with client(mock) as directus:
+        yield lambda: sum(
+            1
+            for _ in directus.iter_items_parallel(
+                COLLECTION, page_size=PAGE_SIZE, workers=4
+            )
+        )
+
+
+def _new_items(mock: MockDirectus) -> list[dict]:
+    return [
+        {key: value for key, value in item.items() if key != "id"}
+        for item in mock.collections[COLLECTION]
+    ]
+
+
+@benchmark("create_items", "the whole collection written in chunks of 100")
+def create_items(mock: MockDirectus):
+    items = _new_items(mock)
+
+    with client(mock) as directus:
+
+        def operation() -> int:
+            result = directus.create_items(COLLECTION, items, chunk_size=100)
+            result.raise_for_errors()
+            return len(result.data)
+
+        yield operation
+
+
+@benchmark("create_items_parallel", "the whole collection, 4 chunks in flight")
+def create_items_parallel(mock: MockDirectus):
+    items = _new_items(mock)
+
+    with client(mock) as directus:
+
+        def operation() -> int:
+            result = directus.create_items(COLLECTION, items, chunk_size=100, workers=4)
+            result.raise_for_errors()
+            return len(result.data)
+
+        yield operation
+
+
+@benchmark("download_file", "a file streamed to disk", unit="MiB")
+def download_file(mock: MockDirectus):
+    size = len(mock.file) / 1024 / 1024
+
+    with tempfile.TemporaryDirectory() as directory, client(mock) as directus:
+        path = os.path.join(directory, "file")
+
+        def operation() -> float:
+            directus.download_file("benchmark", path)
+            return size
+
+        yield operation
+
+
+def _upload(mock: MockDirectus, replace: bool):
+    size = len(mock.file) / 1024 / 1024
+
+    with tempfile.TemporaryDirectory() as directory, client(mock) as directus:
+        path = os.path.join(directory, "file.bin")
+        with open(path, "wb") as f:
+            f.write(mock.file)
+
+        def operation() -> float:
+            if replace:
+                directus.replace_file("benchmark", path)
+            else:
+                directus.upload_file(path, {"title": "benchmark"})
+            return size
+
+        yield operation
+
+
+@benchmark("upload_file", "a file streamed from disk as multipart POST", unit="MiB")
+def upload_file(mock: MockDirectus):
+    yield from _upload(mock, replace=False)
+
+
+@benchmark("replace_file", "a file streamed from disk as multipart PATCH", unit="MiB")
+def replace_file(mock: MockDirectus):
+    yield from _upload(mock, replace=True)
+
+
+@benchmark(
+    "auth_refresh_threads",
+    f"{CONCURRENCY} threads reading with an expired access token",
+    unit="requests",
+)
+def auth_refresh_threads(mock: MockDirectus):
+    with (
+        client(
+            mock, static_token=None, username="admin@example.com", password="benchmark"
+        ) as directus,
+        ThreadPoolExecutor(CONCURRENCY) as executor,
+    ):
+        auth = directus._rest_adapter._auth_handler
+
+        def operation() -> int:
+            # every operation starts with an expired token, one thread refreshes it
+            auth.token_expiration_date = 0
+            reads = executor.map(
+                lambda id: directus.read_item(COLLECTION, str(id)),
+                range(1, CONCURRENCY + 1),
+            )
+            return len(list(reads))
+
+        yield operation
+
+
+@benchmark("async_read_items", f"{CONCURRENCY} concurrent pages of {PAGE_SIZE} items")
+async def async_read_items(mock: MockDirectus):
+    async with async_client(mock) as directus:
+
+        async def operation() -> int:
+            pages = await asyncio.gather(
+                *(
+                    directus.read_items(
+                        COLLECTION, {"limit": PAGE_SIZE, "offset": page * PAGE_SIZE}
+                    )
+                    for page in range(CONCURRENCY)
+                )
+            )
+            return sum(len(page) for page in pages)
+
+        yield operation
+
+
+@benchmark(
+    "async_auth_refresh",
+    f"{CONCURRENCY} tasks reading with an expired access token",
+    unit="requests",
+)
+async def async_auth_refresh(mock: MockDirectus):
+    async with async_client(
+        mock, static_token=None, username="admin@example.com", password="benchmark"
+    ) as directus:
+        auth = directus._rest_adapter._auth_handler
+
+        async def operation() -> int:
+            # every operation starts with an expired token, one task refreshes it
+            auth.token_expiration_date = 0
+            items = await asyncio.gather(
+                *(
+                    directus.read_item(COLLECTION, str(id))
+                    for id in range(1, CONCURRENCY + 1)
+                )
+            )
+            return len(items)
+
+        yield operation
@@ -1 +1,2 @@
 from .directus import DirectusClient
+from .async_directus import AsyncDirectusClient
@@ -1,11 +1,72 @@
-from typing import Optional
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, AsyncGenerator, Callable, Generator, Optional
 
 import httpx
-from httpx import Auth, Request
+from httpx import Auth, Request, Response
 
 from .exceptions import DirectusAuthException
+from .token_store import TokenStore
 from .utils import current_time_in_ms
 
+logger = logging.getLogger(__name__)
+
+
+def _send_to_flow(
+    flow: Generator[Request, Response, None], response: Response
+) -> Optional[Request]:
+    try:
+        return flow.send(response)
+    except StopIteration:
+        return None
+
+
+class _AsyncTokenFlow:
+    def __init__(self, auth: "DirectusAuth"):
+        """
+        Drives the token flow of an async login or refresh. With a token store the
+        flow runs on a worker thread, as the lock of the store blocks (flock, SQLite
+        busy timeout) and the lock and its connection belong to the thread taking it.
+        """
+        self._flow = auth._token_flow()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="directus-tokens")
+            if auth.token_store is not None
+            else None
+        )
+
+    async def _call(self, function: Callable[..., Any], *args: Any) -> Any:
+        if self._executor is None:
+            return function(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+    async def start(self) -> Optional[Request]:
+        """
+        :return: the first token request, None if the token store provided the tokens
+        """
+        return await self._call(next, self._flow, None)
+
+    async def send(self, response: Response) -> Optional[Request]:
+        """
+        :param response: the read response of the previous token request
+        :return: the next token request, None when the flow has finished
+        """
+        return await self._call(_send_to_flow, self._flow, response)
+
+    async def aclose(self) -> None:
+        """
+        Release the lock of the token store, also if the flow did not finish
+        """
+        try:
+            await self._call(self._flow.close)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+
 
 class DirectusAuth(Auth):
     def __init__(
@@ -14,11 +75,26 @@ class DirectusAuth(Auth):
         static_token: Optional[str] = None,
         username: Optional[str] = None,
         password: Optional[str] = None,
+        refresh_skew: int = 30000,
+        background_refresh: bool = False,
+        token_store: Optional[TokenStore] = None,
     ):
+        """
+        Authentication for all requests of a client. Tokens are requested through the
+        client performing the request and at most one login or refresh runs at a time.
+        :param refresh_skew: refresh the access token this long before it expires (in ms)
+        :param background_refresh: refresh the access token on a timer thread,
+          requires a sync client bound with bind_client
+        :param token_store: share tokens with other processes, which then log in
+          and refresh only once for all of them
+        """
         self.hostname = hostname
         self.static_token = static_token
         self.username = username
         self.password = password
+        self.refresh_skew = refresh_skew
+        self.background_refresh = background_refresh
+        self.token_store = token_store
 
         if not ((self.username and self.password) or self.static_token):
             raise DirectusAuthException(
@@ -34,7 +110,52 @@ class DirectusAuth(Auth):
         # timestamp of when the access token will expire (in ms).
         self.token_expiration_date = 0
 
-    def _get_access_token(self, auth_type: str) -> None:
+        # serializes logins and refreshes of threads (sync) and tasks (async).
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+        # client used for background refreshes.
+        self._client: Optional[httpx.Client] = None
+        self._timer: Optional[threading.Timer] = None
+
+    def bind_client(self, client: httpx.Client) -> None:
+        """
+        Bind the sync client whose connection pool is used for background refreshes
+        """
+        self._client = client
+        self._schedule_refresh()
+
+    def close(self) -> None:
+        """
+        Stop the background refresh
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _needs_access_token(self) -> bool:
+        if self.static_token:
+            return False
+
+        return (
+            # if there is no access token yet
+            not self.access_token
+            # if the current access token has already expired
+            or current_time_in_ms() >= self.token_expiration_date
+        )
+
+    def _should_refresh(self) -> bool:
+        if self.static_token:
+            return False
+
+        # if the current access token is missing or about to expire
+        return current_time_in_ms() >= self.token_expiration_date - self.refresh_skew
+
+    def _build_token_request(self, auth_type: str) -> Request:
+        """
+        Build the login or refresh request. It is yielded from the auth flow, so it
+        is sent through the same (sync or async) client as the original request.
+
+        """
         auth_request_url = f"{self.hostname}/auth/{auth_type}"
 
         match auth_type:
@@ -43,36 +164,254 @@ class DirectusAuth(Auth):
             case "refresh":
                 data = {"refresh_token": self.refresh_token}
 
-        response = httpx.post(auth_request_url, json=data)
-        response_data = response.json()
+        return Request("POST", auth_request_url, json=data)
+
+    def _handle_token_response(self, response: Response) -> None:
+        try:
+            response_data = response.json()
+        except ValueError as e:
+            # e.g. the HTML error page of a proxy
+            raise DirectusAuthException(
+                f"Invalid token response, status_code={response.status_code}: {e}"
+            ) from e
 
-        if "errors" in response_data:
+        if isinstance(response_data, dict) and "errors" in response_data:
             raise DirectusAuthException(response_data["errors"])
 
-        self.access_token = response_data["data"]["access_token"]
-        self.refresh_token = response_data["data"]["refresh_token"]
-        self.token_expires = response_data["data"]["expires"]
+        try:
+            data = response_data["data"]
+            expires = data["expires"]
+            refresh_token = data["refresh_token"]
+            access_token = data["access_token"]
+        except (KeyError, TypeError) as e:
+            raise DirectusAuthException(
+                f"Invalid token response, status_code={response.status_code}: {e!r}"
+            ) from e
 
+        self.token_expires = expires
         self.token_expiration_date = current_time_in_ms() + self.token_expires
+        self.refresh_token = refresh_token
+        self.access_token = access_token
 
-    def _ensure_access_token(self) -> str:
-        if self.static_token:
-            return self.static_token
+        self._store_tokens()
+        self._schedule_refresh()
 
-        current_time = current_time_in_ms()
+    @property
+    def _store_key(self) -> str:
+        return f"{self.hostname}|{self.username}"
+
+    def _load_stored_tokens(self) -> bool:
+        """
+        Take over the tokens of the token store, if another process has replaced ours
+        and they are not about to expire.
+        :return: True if the stored tokens were taken over
+        """
+        tokens = self.token_store.load(self._store_key) if self.token_store else None
 
         if (
-            # if there is no access token yet
-            not self.access_token
-            # if the current access token has already expired
-            or current_time >= self.token_expiration_date
+            not tokens
+            or tokens["access_token"] == self.access_token
+            or current_time_in_ms() >= tokens["expiration_date"] - self.refresh_skew
         ):
-            auth_type = "login" if not self.access_token else "refresh"
-            self._get_access_token(auth_type)
+            return False
+
+        self.token_expires = tokens["expires"]
+        self.token_expiration_date = tokens["expiration_date"]
+        self.refresh_token = tokens["refresh_token"]
+        self.access_token = tokens["access_token"]
+
+        self._schedule_refresh()
+        return True
+
+    def _store_tokens(self) -> None:
+        if self.token_store is None:
+            return
+
+        self.token_store.save(
+            self._store_key,
+            {
+                "access_token": self.access_token,
+                "refresh_token": self.refresh_token,
+                "expires": self.token_expires,
+                "expiration_date": self.token_expiration_date,
+            },
+        )
+
+    def _token_flow(self) -> Generator[Request, Response, None]:
+        """
+        Yield the requests to obtain a new access token. The responses sent back have
+        to be read already. A failing refresh falls back to a new login.
+        With a token store, the tokens of another process are used if possible.
+
+        """
+        store_lock = self.token_store.lock() if self.token_store else nullcontext()
+
+        with store_lock:
+            if not self._load_stored_tokens():
+                yield from self._request_tokens()
+
+    def _request_tokens(self) -> Generator[Request, Response, None]:
+        if self.refresh_token:
+            response = yield self._build_token_request("refresh")
+            try:
+                self._handle_token_response(response)
+                return
+            except DirectusAuthException:
+                if not (self.username and self.password):
+                    raise
+
+        response = yield self._build_token_request("login")
+        self._handle_token_response(response)
+
+    def _sync_token_flow(self) -> Generator[Request, Response, None]:
+        flow = self._token_flow()
+        # the token store may provide the tokens without any request
+        request = next(flow, None)
+
+        while request is not None:
+            response = yield request
+            response.read()
+            try:
+                request = flow.send(response)
+            except StopIteration:
+                request = None
+
+    def refresh(self) -> None:
+        """
+        Obtain a new access token now, through the bound sync client
+        """
+        if self._client is None:
+            raise DirectusAuthException("No client has been bound to refresh with!")
+
+        with self._lock:
+            flow = self._token_flow()
+            request = next(flow, None)
+            while request is not None:
+                # the token request itself must not run through this auth flow
+                response = self._client.send(request, auth=None)
+                try:
+                    request = flow.send(response)
+                except StopIteration:
+                    request = None
+
+    async def async_refresh(self, client: httpx.AsyncClient) -> None:
+        """
+        Obtain a new access token now, through an async client
+        """
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+
+        async with self._async_lock:
+            flow = _AsyncTokenFlow(self)
+            try:
+                request = await flow.start()
+                while request is not None:
+                    response = await client.send(request, auth=None)
+                    await response.aread()
+                    request = await flow.send(response)
+            finally:
+                await flow.aclose()
+
+    @property
+    def bearer_token(self) -> Optional[str]:
+        """
+        The token sent with requests, e.g. to authenticate other connections
+        """
+        return self.static_token or self.access_token
+
+    def _schedule_refresh(self) -> None:
+        if not (self.background_refresh and self._client and self.access_token):
+            return
+
+        self.close()
+        delay = max(self.token_expires - self.refresh_skew, 1000) / 1000
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            # the next request refreshes inline instead
+            logger.warning("background token refresh failed: %r", e)
+
+    def _authorize(self, r: Request) -> Request:
+        r.headers["Authorization"] = f"Bearer {self.bearer_token}"
+        return r
+
+    def _rejected(self, response: Response, r: Request) -> bool:
+        # the token was rejected although it looked valid, e.g. revoked or expired early.
+        # if another request already replaced it, no new token is needed
+        return (
+            response.status_code == 401
+            and not self.static_token
+            and r.headers["Authorization"] == f"Bearer {self.access_token}"
+        )
+
+    def sync_auth_flow(self, r: Request) -> Generator[Request, Response, None]:
+        required = self._needs_access_token()
+
+        # without a valid token wait for the lock, otherwise refresh ahead of expiry
+        # only if no other thread is doing so already and keep using the current token
+        if (required or self._should_refresh()) and self._lock.acquire(
+            blocking=required
+        ):
+            try:
+                if self._should_refresh():
+                    yield from self._sync_token_flow()
+            except DirectusAuthException as e:
+                if required:
+                    raise
+                logger.warning("token refresh failed: %s", e)
+            finally:
+                self._lock.release()
+
+        response = yield self._authorize(r)
+
+        if self._rejected(response, r):
+            with self._lock:
+                if self._rejected(response, r):
+                    yield from self._sync_token_flow()
+
+            yield self._authorize(r)
+
+    async def async_auth_flow(self, r: Request) -> AsyncGenerator[Request, Response]:
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        lock = self._async_lock
+
+        required = self._needs_access_token()
+        rejected = False
+
+        while True:
+            # without a valid token wait for the lock, otherwise refresh ahead of expiry
+            # only if no other task is doing so already and keep using the current token
+            if required or rejected or (self._should_refresh() and not lock.locked()):
+                async with lock:
+                    try:
+                        if self._should_refresh() or (
+                            rejected and self._rejected(response, r)
+                        ):
+                            flow = _AsyncTokenFlow(self)
+                            try:
+                                request = await flow.start()
+                                while request is not None:
+                                    token_response = yield request
+                                    await token_response.aread()
+                                    request = await flow.send(token_response)
+                            finally:
+                                await flow.aclose()
+                    except DirectusAuthException as e:
+                        if required or rejected:
+                            raise
+                        logger.warning("token refresh failed: %s", e)
+
+            response = yield self._authorize(r)
 
-        return self.access_token
+            if rejected or not self._rejected(response, r):
+                return
 
-    def auth_flow(self, r: Request) -> Request:
-        bearer_token = self._ensure_access_token()
-        r.headers["Authorization"] = f"Bearer {bearer_token}"
-        yield r
+            # retry once with a new token
+            required = False
+            rejected = True
@@ -0,0 +1,182 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional
+
+from .codec import JSONCodec
+from .exceptions import DirectusException
+
+
+class ChunkError:
+    def __init__(self, index: int, rows: list, exception: Exception):
+        """
+        Failure of a single chunk of a batch request
+        :param index: position of the chunk in the batch
+        :param rows: the rows (or keys) of the chunk
+        :param exception: the exception raised while sending the chunk
+        """
+        self.index = index
+        self.rows = rows
+        self.exception = exception
+
+    def __repr__(self) -> str:
+        return f"ChunkError(index={self.index}, rows={len(self.rows)}, exception={self.exception!r})"
+
+
+class BatchResult:
+    def __init__(self, data: Optional[list] = None, errors: Optional[list] = None):
+        """
+        Result of a chunked batch request
+        :param data: the data returned by the successful chunks, in chunk order
+        :param errors: a ChunkError for every failed chunk
+        """
+        self.data = data or []
+        self.errors: list[ChunkError] = errors or []
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """
+        Raise a DirectusException if any chunk failed
+        """
+        if self.errors:
+            raise DirectusException(
+                [f"chunk {e.index}: {e.exception}" for e in self.errors]
+            )
+
+
+def chunk_rows(
+    rows: Iterable[Any],
+    chunk_size: int = 100,
+    max_chunk_bytes: Optional[int] = None,
+    dumps: Callable[[Any], bytes] = JSONCodec().dumps,
+) -> Iterator[list]:
+    """
+    Split rows into chunks by row count and (optionally) serialized payload size.
+    A single row larger than max_chunk_bytes becomes a chunk of its own.
+    :param rows: rows or keys to split
+    :param chunk_size: maximum number of rows per chunk
+    :param max_chunk_bytes: maximum size of the JSON encoded chunk in bytes
+    :param dumps: the JSON encoder of the request bodies, see JSONCodec
+
+    :return: iterator of chunks
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size has to be a positive integer!")
+
+    chunk = []
+    chunk_bytes = 2  # enclosing brackets
+
+    for row in rows:
+        # one byte for the separating comma
+        row_bytes = len(dumps(row)) + 1 if max_chunk_bytes else 0
+
+        if chunk and (
+            len(chunk) >= chunk_size
+            or (max_chunk_bytes and chunk_bytes + row_bytes > max_chunk_bytes)
+        ):
+            yield chunk
+            chunk = []
+            chunk_bytes = 2
+
+        chunk.append(row)
+        chunk_bytes += row_bytes
+
+    if chunk:
+        yield chunk
+
+
+def envelope_budget(
+    max_chunk_bytes: Optional[int],
+    envelope: dict,
+    dumps: Callable[[Any], bytes] = JSONCodec().dumps,
+) -> Optional[int]:
+    """
+    The max_chunk_bytes left for the keys of a payload like {"keys": [...], "data": {...}},
+    pass it to chunk_rows to split the keys
+    :param max_chunk_bytes: maximum size of the JSON encoded payload in bytes
+    :param envelope: the payload without keys
+    :param dumps: the JSON encoder of the request bodies, see JSONCodec
+
+    :return: the budget of the key list including its brackets, None without a limit
+    """
+    if max_chunk_bytes is None:
+        return None
+
+    envelope_bytes = len(dumps({"keys": [], **envelope}))
+    if envelope_bytes >= max_chunk_bytes:
+        raise ValueError(
+            f"The payload without keys takes {envelope_bytes} bytes, "
+            f"max_chunk_bytes is {max_chunk_bytes}!"
+        )
+
+    # the brackets of the empty key list are counted by chunk_rows
+    return max_chunk_bytes - envelope_bytes + 2
+
+
+def _collect(outcomes: list[tuple[list, Any, Optional[Exception]]]) -> BatchResult:
+    result = BatchResult()
+
+    for index, (chunk, data, exception) in enumerate(outcomes):
+        if exception is not None:
+            result.errors.append(ChunkError(index, chunk, exception))
+        elif isinstance(data, list):
+            result.data.extend(data)
+        elif data is not None:
+            result.data.append(data)
+
+    return result
+
+
+def run_chunks(
+    send_chunk: Callable[[list], Any],
+    chunks: Iterable[list],
+    workers: int = 1,
+) -> BatchResult:
+    """
+    Send chunks one after another, or concurrently in a thread pool
+    :param send_chunk: callable that sends one chunk and returns its data
+    :param chunks: the chunks to send
+    :param workers: the number of chunks sent concurrently
+
+    :return: BatchResult
+    """
+
+    def send(chunk: list) -> tuple[list, Any, Optional[Exception]]:
+        try:
+            return chunk, send_chunk(chunk), None
+        except Exception as e:
+            # a failed chunk must not discard the results of the others
+            return chunk, None, e
+
+    if workers <= 1:
+        return _collect([send(chunk) for chunk in chunks])
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return _collect(list(executor.map(send, chunks)))
+
+
+async def arun_chunks(
+    send_chunk: Callable[[list], Awaitable[Any]],
+    chunks: Iterable[list],
+    workers: int = 1,
+) -> BatchResult:
+    """
+    Async counterpart of run_chunks
+    :param send_chunk: coroutine function that sends one chunk and returns its data
+    :param chunks: the chunks to send
+    :param workers: the number of chunks sent concurrently
+
+    :return: BatchResult
+    """
+    semaphore = asyncio.Semaphore(max(workers, 1))
+
+    async def send(chunk: list) -> tuple[list, Any, Optional[Exception]]:
+        async with semaphore:
+            try:
+                return chunk, await send_chunk(chunk), None
+            except Exception as e:
+                return chunk, None, e
+
+    return _collect(await asyncio.gather(*(send(chunk) for chunk in chunks)))
@@ -0,0 +1,304 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+
+from .utils import request_key
+
+
+class CacheEntry:
+    def __init__(
+        self,
+        content: bytes,
+        status_code: int,
+        message: str,
+        collection: Optional[str],
+        expires_at: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """
+        Cached response of a read request
+        :param content: raw response body
+        :param status_code: Standard HTTP Status code
+        :param message: Human readable result
+        :param collection: collection the response belongs to, used for invalidation
+        :param expires_at: unix timestamp after which the entry has to be revalidated
+        :param etag: ETag validator sent by the server
+        :param last_modified: Last-Modified validator sent by the server
+        """
+        self.content = content
+        self.status_code = status_code
+        self.message = message
+        self.collection = collection
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def validators(self) -> Optional[dict]:
+        """
+        Headers for a conditional request, if the server supplied validators
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers or None
+
+
+class CacheBackend(ABC):
+    """
+    Storage of cache entries. Subclass it to plug in another store.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]: ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    @abstractmethod
+    def invalidate(self, collection: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class MemoryCache(CacheBackend):
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None):
+        """
+        Thread-safe in-memory LRU cache
+        :param max_entries: maximum number of cached responses
+        :param max_bytes: maximum total size of the cached response bodies
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key).size
+
+            self._entries[key] = entry
+            self._bytes += entry.size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def invalidate(self, collection: str) -> None:
+        with self._lock:
+            for key in [
+                key
+                for key, entry in self._entries.items()
+                if entry.collection == collection
+            ]:
+                self._bytes -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class SQLiteCache(CacheBackend):
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        LRU cache in a local SQLite database, which can be shared by several processes
+        :param path: path of the database file
+        :param max_entries: maximum number of cached responses
+        :param max_bytes: maximum total size of the cached response bodies
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                collection TEXT,
+                content BLOB NOT NULL,
+                status_code INTEGER NOT NULL,
+                message TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """)
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_collection ON cache (collection)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT content, status_code, message, collection, expires_at, etag, last_modified "
+                "FROM cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self._connection.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+
+        return CacheEntry(*row)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.collection,
+                    entry.content,
+                    entry.status_code,
+                    entry.message,
+                    entry.expires_at,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.size,
+                    time.time(),
+                ),
+            )
+            self._connection.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            if self.max_bytes is not None:
+                self._connection.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM "
+                    "(SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC) AS total FROM cache) "
+                    "WHERE total > ?)",
+                    (self.max_bytes,),
+                )
+
+    def invalidate(self, collection: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM cache WHERE collection = ?", (collection,)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM cache")
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 60,
+        collection_ttls: Optional[dict[str, float]] = None,
+    ):
+        """
+        Cache for GET requests of the RestAdapter. Entries of a collection are
+        invalidated by any write request to that collection through the same adapter.
+        Expired entries with an ETag or Last-Modified validator are revalidated
+        with a conditional request instead of being fetched again.
+        :param backend: storage of the entries, defaults to a MemoryCache
+        :param ttl: seconds a response is served from the cache without revalidation
+        :param collection_ttls: ttl per collection, a ttl of 0 disables caching for it
+        """
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttl = ttl
+        self.collection_ttls = collection_ttls or {}
+
+    def ttl_for(self, collection: Optional[str]) -> float:
+        return self.collection_ttls.get(collection, self.ttl)
+
+    @staticmethod
+    def key(url: str, params: Optional[dict]) -> str:
+        """
+        Canonical cache key of a GET request
+        :param url: the request URL
+        :param params: A dict of Endpoint Parameters, before serialization
+        :return: cache key
+        """
+        return request_key(url, params)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        return self.backend.get(key)
+
+    def store(
+        self, key: str, collection: Optional[str], response: httpx.Response
+    ) -> None:
+        """
+        Store a successful response
+        """
+        ttl = self.ttl_for(collection)
+        if ttl <= 0:
+            return
+
+        self.backend.set(
+            key,
+            CacheEntry(
+                content=response.content,
+                status_code=response.status_code,
+                message=response.reason_phrase,
+                collection=collection,
+                expires_at=time.time() + ttl,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            ),
+        )
+
+    def refresh(self, key: str, entry: CacheEntry) -> None:
+        """
+        Extend the lifetime of an entry that was revalidated by the server
+        """
+        entry.expires_at = time.time() + self.ttl_for(entry.collection)
+        self.backend.set(key, entry)
+
+    def invalidate(self, collection: str) -> None:
+        self.backend.invalidate(collection)
+
+    def clear(self) -> None:
+        self.backend.clear()
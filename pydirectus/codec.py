@@ -0,0 +1,103 @@
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+# decodes a response body, e.g. JSONCodec.loads or a typed decoder of records
+Decoder = Callable[[bytes], Any]
+
+
+class JSONCodec:
+    """
+    Encoding and decoding of JSON request and response bodies.
+    Subclass it to plug in another JSON library. Decoding errors are raised as ValueError.
+    """
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def dumps_str(self, obj: Any) -> str:
+        """
+        Encode to str, for query parameters and multipart form fields
+        """
+        return json.dumps(obj, separators=(",", ":"))
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self):
+        """
+        Codec based on orjson. Integers are limited to 64 bit.
+        """
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson: pip install orjson")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        # orjson.JSONDecodeError is a subclass of ValueError
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def dumps_str(self, obj: Any) -> str:
+        return self.dumps(obj).decode()
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        """
+        Codec based on msgspec
+        """
+        if msgspec is None:
+            raise ImportError("MsgspecCodec requires msgspec: pip install msgspec")
+
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def dumps_str(self, obj: Any) -> str:
+        return self._encoder.encode(obj).decode()
+
+
+def default_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Get a codec by name, or the fastest installed one (orjson, msgspec, json)
+    :param name: "orjson", "msgspec" or "json"
+    :return: JSONCodec
+    """
+    codecs = {"orjson": OrjsonCodec, "msgspec": MsgspecCodec, "json": JSONCodec}
+
+    if name is not None:
+        if name not in codecs:
+            raise ValueError(f"Unknown codec {name}, choose one of {list(codecs)}!")
+        return codecs[name]()
+
+    if orjson is not None:
+        return OrjsonCodec()
+    if msgspec is not None:
+        return MsgspecCodec()
+    return JSONCodec()
@@ -0,0 +1,214 @@
+from typing import Any, Optional
+
+from .codec import JSONCodec, default_codec
+from .exceptions import DirectusException
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Columnar exports require pyarrow: pip install pyarrow")
+
+
+def arrow_types(field: dict) -> Optional[tuple[Any, Any]]:
+    """
+    Map a field of the Directus schema (see read_fields) to Arrow types
+    :param field: the field as returned by /fields
+    :return: the type the JSON values are loaded as and the type they are cast to,
+      None if the type has to be inferred from the values
+    """
+    directus_type = field.get("type")
+    schema = field.get("schema") or {}
+
+    if directus_type in ("string", "text", "uuid", "hash", "time"):
+        return pa.string(), pa.string()
+    if directus_type == "integer":
+        return pa.int32(), pa.int32()
+    if directus_type == "bigInteger":
+        return pa.int64(), pa.int64()
+    if directus_type == "float":
+        return pa.float64(), pa.float64()
+    if directus_type == "boolean":
+        return pa.bool_(), pa.bool_()
+    if directus_type == "decimal":
+        # decimals are sent as strings to keep their precision
+        precision = schema.get("numeric_precision")
+        scale = schema.get("numeric_scale")
+        if precision and scale is not None and precision <= 38:
+            return pa.string(), pa.decimal128(precision, scale)
+        return pa.string(), pa.string()
+    if directus_type == "timestamp":
+        return pa.string(), pa.timestamp("ms", tz="UTC")
+    if directus_type == "dateTime":
+        return pa.string(), pa.timestamp("ms")
+    if directus_type == "date":
+        return pa.string(), pa.date32()
+    if directus_type == "csv":
+        return pa.list_(pa.string()), pa.list_(pa.string())
+
+    # json, alias (relations) and unknown types
+    return None
+
+
+class RecordBatchBuilder:
+    def __init__(
+        self, fields: Optional[list[dict]] = None, codec: Optional[JSONCodec] = None
+    ):
+        """
+        Turns pages of items into Arrow record batches with one stable schema.
+        The columns and their types are planned from the first page: fields of
+        the Directus schema get their mapped types, others are inferred, and
+        nested values (relations, json fields) are stored as JSON strings.
+        Values of later pages are converted with safe casts, so a value that does
+        not fit the planned type raises instead of being truncated.
+        :param fields: the Directus schema of the collection, see read_fields
+        :param codec: the codec JSON columns are encoded with
+        """
+        require_pyarrow()
+
+        self._fields = {field["field"]: field for field in fields or []}
+        self._codec = codec if codec is not None else default_codec()
+        # column name -> (type the values are loaded as, target type, encoding),
+        # see _encode for the encodings
+        self._plan: Optional[dict[str, tuple[Any, Any, Optional[str]]]] = None
+        self.schema: Optional["pa.Schema"] = None
+
+    def _encode(self, values: list, encoding: str) -> list:
+        """
+        Encode the values of a string column
+        :param encoding: "json" encodes every value as JSON, "text" only the
+          values that are not strings, e.g. an object in a column inferred as string
+        """
+        dumps = self._codec.dumps_str
+        if encoding == "json":
+            return [None if v is None else dumps(v) for v in values]
+        return [v if v is None or isinstance(v, str) else dumps(v) for v in values]
+
+    def _plan_column(self, name: str, values: list) -> tuple[Any, Any, Optional[str]]:
+        if name in self._fields:
+            types = arrow_types(self._fields[name])
+            if types is None:
+                # json, alias and unknown types can hold any value on later pages
+                return pa.string(), pa.string(), "json"
+            try:
+                _load(values, types[0]).cast(types[1])
+                return types[0], types[1], None
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                # e.g. a many-to-one key that was expanded to an object
+                return pa.string(), pa.string(), "json"
+
+        if any(isinstance(v, (dict, list)) for v in values):
+            return pa.string(), pa.string(), "json"
+
+        try:
+            inferred = pa.array(values).type
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.string(), pa.string(), "json"
+
+        # a column without any value in the first page, or a string column
+        if pa.types.is_null(inferred) or pa.types.is_string(inferred):
+            return pa.string(), pa.string(), "text"
+
+        return inferred, inferred, None
+
+    def empty_schema(self, names: Optional[list[str]] = None) -> "pa.Schema":
+        """
+        The schema of an export without rows, built from the Directus schema alone
+        :param names: the columns, defaults to all fields that are not aliases
+        """
+        if self.schema is not None:
+            return self.schema
+
+        if names is None:
+            names = [
+                name
+                for name, field in self._fields.items()
+                if field.get("type") != "alias"
+            ]
+
+        columns = []
+        for name in names:
+            types = arrow_types(self._fields[name]) if name in self._fields else None
+            columns.append(pa.field(name, types[1] if types else pa.string()))
+
+        return pa.schema(columns)
+
+    def build(self, rows: list[dict]) -> "pa.RecordBatch":
+        """
+        Build the record batch of a page
+        :param rows: the items of the page
+        """
+        if self._plan is None:
+            self._plan = {}
+            for name in rows[0] if rows else []:
+                values = [row.get(name) for row in rows]
+                self._plan[name] = self._plan_column(name, values)
+            self.schema = pa.schema(
+                [pa.field(name, target) for name, (_, target, _) in self._plan.items()]
+            )
+
+        arrays = []
+        try:
+            for name, (wire_type, target, encoding) in self._plan.items():
+                values = [row.get(name) for row in rows]
+                if encoding:
+                    values = self._encode(values, encoding)
+                array = _load(values, wire_type)
+                arrays.append(array if wire_type == target else array.cast(target))
+        except (
+            pa.ArrowInvalid,
+            pa.ArrowTypeError,
+            pa.ArrowNotImplementedError,
+        ) as e:
+            hint = (
+                "" if name in self._fields else ", it was inferred from the first page"
+            )
+            raise DirectusException(
+                f"Column {name} does not match its type {target}{hint}: {e}"
+            ) from e
+
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+def _load(values: list, wire_type: Any) -> "pa.Array":
+    """
+    Load JSON values as an Arrow array of wire_type
+    """
+    if pa.types.is_integer(wire_type):
+        # pa.array(values, type=...) truncates floats to integers silently,
+        # infer the type and cast safely instead
+        array = pa.array(values)
+        return array if array.type == wire_type else array.cast(wire_type, safe=True)
+
+    return pa.array(values, type=wire_type)
+
+
+def parquet_writer(path: Any, schema: "pa.Schema", **kwargs: Any) -> Any:
+    """
+    Open a Parquet file for writing record batches
+    :param path: the path of the file
+    :param schema: the schema of the batches
+    :param kwargs: options of pyarrow.parquet.ParquetWriter, e.g. compression
+    """
+    require_pyarrow()
+    import pyarrow.parquet as pq
+
+    return pq.ParquetWriter(path, schema, **kwargs)
+
+
+def arrow_table(batches: list, empty_schema: Optional["pa.Schema"] = None) -> Any:
+    """
+    Combine record batches into a table
+    :param batches: the record batches of an export
+    :param empty_schema: the schema of the table if there are no batches
+    """
+    require_pyarrow()
+
+    if not batches:
+        return pa.Table.from_batches([], schema=empty_schema or pa.schema([]))
+
+    return pa.Table.from_batches(batches)
@@ -1,10 +1,51 @@
+import asyncio
 import logging
-from typing import Optional
+import os
+from functools import partial
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Callable,
+    Iterator,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import httpx
 
 from .auth import DirectusAuth
-from .models import File, Item, Query
+from .batch import BatchResult, chunk_rows, envelope_budget, run_chunks
+from .cache import ResponseCache
+from .codec import Decoder, JSONCodec
+from .columnar import RecordBatchBuilder, arrow_table, parquet_writer
+from .files import range_headers, skip_bytes, upload_part
+from .graphql import GraphQLBatch
+from .hooks import RequestHooks
+from .loader import RelationLoader
+from .models import (
+    Activity,
+    Aggregate,
+    AggregateResult,
+    AssetQuery,
+    File,
+    Filter,
+    Item,
+    Query,
+    Revision,
+)
+from .pagination import iter_keyset_pages, iter_pages, iter_parallel_pages
+from .realtime import RealtimeConnection, RealtimeEvent, RealtimeThread, Subscription
+from .records import record_converter, response_decoder
 from .rest_adapter import RestAdapter
-from .utils import handle_directus_response
+from .retry import CircuitBreaker, RateLimiter, RetryPolicy
+from .streaming import ItemStream
+from .token_store import TokenStore
+from .utils import handle_directus_meta, handle_directus_response, parse_aggregates
+
+if TYPE_CHECKING:
+    import pyarrow
 
 
 class DirectusClient:
@@ -16,24 +57,76 @@ class DirectusClient:
         static_token: Optional[str] = None,
         ssl_verify: bool = False,
         logger: Optional[logging.Logger] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce_reads: bool = False,
+        refresh_skew: int = 30000,
+        background_refresh: bool = False,
+        token_store: Optional[TokenStore] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[Union[float, httpx.Timeout]] = None,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        codec: Optional[JSONCodec] = None,
+        hooks: Optional[Sequence[RequestHooks]] = None,
     ) -> None:
         _auth_handler = DirectusAuth(
             hostname=hostname,
             static_token=static_token,
             username=username,
             password=password,
+            refresh_skew=refresh_skew,
+            background_refresh=background_refresh,
+            token_store=token_store,
         )
         self._rest_adapter = RestAdapter(
             hostname=hostname,
             auth_handler=_auth_handler,
             ssl_verify=ssl_verify,
             logger=logger,
+            cache=cache,
+            coalesce_reads=coalesce_reads,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            limits=limits,
+            timeout=timeout,
+            http2=http2,
+            transport=transport,
+            codec=codec,
+            hooks=hooks,
         )
+        self._realtime: Optional[RealtimeThread] = None
+
+    def __enter__(self) -> "DirectusClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the underlying connection pool and release its sockets
+        """
+        if self._realtime is not None:
+            self._realtime.close()
+            self._realtime = None
+        self._rest_adapter.close()
+
+    def _decoder(
+        self, record_type: Optional[type], many: bool = True
+    ) -> Optional[Decoder]:
+        if record_type is None:
+            return None
+        return response_decoder(record_type, self._rest_adapter._codec.loads, many)
 
     def read_items(
         self,
         collection: str,
         query: Optional[Query] = None,
+        record_type: Optional[type] = None,
     ) -> list[Item]:
         """
         GET Items from Collection
@@ -48,16 +141,375 @@ class DirectusClient:
           - page: Specify the page number when paginating results.
           - deep: Set any of the other query parameters on a nested relational dataset.
           - alias: Rename fields and request the same nested data set multiple times using different filters
+        :param record_type: decode the rows into a Record class or msgspec Struct, see pydirectus.records
 
         :return: list[Item] - A list of items retrieved from the collection.
         """
         endpoint = f"/items/{collection}"
-        response = self._rest_adapter.get(endpoint, params=query)
+        response = self._rest_adapter.get(
+            endpoint, params=query, decoder=self._decoder(record_type)
+        )
+
+        data = handle_directus_response(response)
+
+        return [] if record_type and data is None else data
+
+    def iter_items(
+        self,
+        collection: str,
+        query: Optional[Query] = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+        keyset: Optional[str] = None,
+        record_type: Optional[type] = None,
+    ) -> Iterator[Item]:
+        """
+        GET Items from Collection page by page and yield them one at a time
+        :param collection: a string representing the collection name
+        :param query: a dictionary specifying the query parameters, see read_items.
+          A limit caps the total number of yielded items, an offset or page sets the start.
+        :param page_size: the number of items fetched per request
+        :param prefetch: fetch the next page while the current one is consumed
+        :param keyset: a unique field (e.g. the primary key) to paginate on instead of offsets.
+          Prefix it with "-" for descending order. Each page is selected with a
+          "_gt"/"_lt" filter on that field, so deep pages are as cheap as the first one.
+        :param record_type: decode the rows into a Record class or msgspec Struct, see pydirectus.records
+
+        :return: Iterator[Item] - An iterator over the items of the collection.
+        """
+        pages = self._iter_item_pages(
+            collection, query, page_size, prefetch, keyset, record_type
+        )
+
+        for page in pages:
+            yield from page
+
+    def _iter_item_pages(
+        self,
+        collection: str,
+        query: Optional[Query],
+        page_size: int,
+        prefetch: bool,
+        keyset: Optional[str],
+        record_type: Optional[type] = None,
+    ) -> Iterator[list[Item]]:
+        fetch_page = partial(self.read_items, collection, record_type=record_type)
+
+        if keyset:
+            if prefetch:
+                raise ValueError("Keyset pagination cannot prefetch the next page!")
+            return iter_keyset_pages(fetch_page, query, page_size=page_size, key=keyset)
+
+        return iter_pages(fetch_page, query, page_size=page_size, prefetch=prefetch)
+
+    def _read_items_counted(
+        self, collection: str, query: Query, record_type: Optional[type] = None
+    ) -> tuple[list[Item], Optional[int]]:
+        endpoint = f"/items/{collection}"
+        response = self._rest_adapter.get(
+            endpoint,
+            params={**query, "meta": "filter_count"},
+            decoder=self._decoder(record_type),
+        )
+
+        return (
+            handle_directus_response(response) or [],
+            handle_directus_meta(response).get("filter_count"),
+        )
+
+    def iter_items_parallel(
+        self,
+        collection: str,
+        query: Optional[Query] = None,
+        page_size: int = 100,
+        workers: int = 4,
+        ordered: bool = True,
+        record_type: Optional[type] = None,
+    ) -> Iterator[Item]:
+        """
+        GET Items from Collection with several page requests in flight at once.
+        The first page is requested with meta=filter_count to plan the remaining pages.
+        :param collection: a string representing the collection name
+        :param query: a dictionary specifying the query parameters, see read_items.
+          A limit caps the total number of yielded items, an offset or page sets the start.
+        :param page_size: the number of items fetched per request
+        :param workers: the number of threads fetching pages
+        :param ordered: yield the items in query order, otherwise page by page as they complete
+        :param record_type: decode the rows into a Record class or msgspec Struct, see pydirectus.records
+
+        :return: Iterator[Item] - An iterator over the items of the collection.
+        """
+        for page in iter_parallel_pages(
+            partial(self._read_items_counted, collection, record_type=record_type),
+            partial(self.read_items, collection, record_type=record_type),
+            query,
+            page_size=page_size,
+            workers=workers,
+            ordered=ordered,
+        ):
+            yield from page
+
+    def read_items_parallel(
+        self,
+        collection: str,
+        query: Optional[Query] = None,
+        page_size: int = 100,
+        workers: int = 4,
+        record_type: Optional[type] = None,
+    ) -> list[Item]:
+        """
+        GET all Items matching the query with several page requests in flight at once
+        :param collection: a string representing the collection name
+        :param query: a dictionary specifying the query parameters, see read_items
+        :param page_size: the number of items fetched per request
+        :param workers: the number of threads fetching pages
+        :param record_type: decode the rows into a Record class or msgspec Struct, see pydirectus.records
+
+        :return: list[Item] - A list of items in query order.
+        """
+        return list(
+            self.iter_items_parallel(
+                collection,
+                query,
+                page_size=page_size,
+                workers=workers,
+                record_type=record_type,
+            )
+        )
+
+    def stream_items(
+        self,
+        collection: str,
+        query: Optional[Query] = None,
+        chunk_size: int = 64 * 1024,
+        record_type: Optional[type] = None,
+    ) -> ItemStream:
+        """
+        GET Items from Collection in a single request and parse the response incrementally.
+        Only one item is held in memory at a time, even for limit=-1.
+        :param collection: a string representing the collection name
+        :param query: a dictionary specifying the query parameters, see read_items
+        :param chunk_size: the size of the response chunks read at once in bytes
+        :param record_type: decode the rows into a Record class or msgspec Struct, see pydirectus.records
+
+        :return: ItemStream - an iterator over the items, its meta is available afterwards.
+        """
+        endpoint = f"/items/{collection}"
+        params = dict(query) if query else None
+
+        return ItemStream(
+            self._iter_response_bytes(endpoint, params, chunk_size),
+            convert=record_converter(record_type) if record_type else None,
+        )
+
+    def _iter_response_bytes(
+        self, endpoint: str, params: Optional[dict], chunk_size: int
+    ) -> Iterator[bytes]:
+        with self._rest_adapter.stream("GET", endpoint, params=params) as response:
+            yield from response.iter_bytes(chunk_size)
+
+    def read_fields(self, collection: str) -> list[dict]:
+        """
+        GET the Fields of a Collection
+        :param collection: a string representing the collection name
+
+        :return: list of dict - The fields, including their type and database schema.
+        """
+        endpoint = f"/fields/{collection}"
+        response = self._rest_adapter.get(endpoint)
 
         return handle_directus_response(response)
 
+    def iter_record_batches(
+        self,
+        collection: str,
+        query: Optional[Query] = None,
+        page_size: int = 10000,
+        prefetch: bool = False,
+        keyset: Optional[str] = None,
+        infer_schema: bool = True,
+    ) -> Iterator["pyarrow.RecordBatch"]:
+        """
+        GET Items from Collection page by page as Arrow record batches (requires pyarrow)
+        :param collection: a string representing the collection name
+        :param query: a dictionary specifying the query parameters, see read_items
+        :param page_size: the number of items fetched per request and per batch
+        :param prefetch: fetch the next page while the current one is converted
+        :param keyset: a unique field to paginate on instead of offsets, see iter_items
+        :param infer_schema: map the column types from the fields of the collection,
+          otherwise they are inferred from the first page
+
+        :return: Iterator[pyarrow.RecordBatch] - batches sharing one schema.
+        """
+        fields = self.read_fields(collection) if infer_schema else None
+        builder = RecordBatchBuilder(fields, codec=self._rest_adapter._codec)
+
+        for page in self._iter_item_pages(
+            collection, query, page_size, prefetch, keyset
+        ):
+            if page:
+                yield builder.build(page)
+
+    def _empty_arrow_schema(
+        self, collection: str, infer_schema: bool
+    ) -> "pyarrow.Schema":
+        fields = self.read_fields(collection) if infer_schema else None
+
+        return RecordBatchBuilder(
+            fields, codec=self._rest_adapter._codec
+        ).empty_schema()
+
+    def read_items_arrow(
+        self,
+        collection: str,
+        query: Optional[Query] = None,
+        page_size: int = 10000,
+        prefetch: bool = False,
+        keyset: Optional[str] = None,
+        infer_schema: bool = True,
+    ) -> "pyarrow.Table":
+        """
+        GET all Items matching the query as an Arrow table (requires pyarrow).
+        Use table.to_pandas() or column.to_numpy() to convert it further.
+        :param collection: a string representing the collection name
+        :param query: a dictionary specifying the query parameters, see read_items
+        :param page_size: the number of items fetched per request
+        :param prefetch: fetch the next page while the current one is converted
+        :param keyset: a unique field to paginate on instead of offsets, see iter_items
+        :param infer_schema: map the column types from the fields of the collection
+
+        :return: pyarrow.Table
+        """
+        batches = list(
+            self.iter_record_batches(
+                collection, query, page_size, prefetch, keyset, infer_schema
+            )
+        )
+        if not batches:
+            return arrow_table([], self._empty_arrow_schema(collection, infer_schema))
+
+        return arrow_table(batches)
+
+    def write_parquet(
+        self,
+        collection: str,
+        path: str | os.PathLike,
+        query: Optional[Query] = None,
+        page_size: int = 10000,
+        prefetch: bool = True,
+        keyset: Optional[str] = None,
+        infer_schema: bool = True,
+        compression: str = "zstd",
+    ) -> Path:
+        """
+        GET Items from Collection and stream them into a Parquet file (requires pyarrow).
+        Only one page is held in memory at a time.
+        :param collection: a string representing the collection name
+        :param path: the path to write the file to
+        :param query: a dictionary specifying the query parameters, see read_items
+        :param page_size: the number of items fetched per request, one row group each
+        :param prefetch: fetch the next page while the current one is written
+        :param keyset: a unique field to paginate on instead of offsets, see iter_items
+        :param infer_schema: map the column types from the fields of the collection
+        :param compression: the Parquet compression codec
+
+        :return: Path - The path of the written file.
+        """
+        writer = None
+        try:
+            for batch in self.iter_record_batches(
+                collection, query, page_size, prefetch, keyset, infer_schema
+            ):
+                if writer is None:
+                    writer = parquet_writer(path, batch.schema, compression=compression)
+                writer.write_batch(batch)
+
+            if writer is None:
+                writer = parquet_writer(
+                    path,
+                    self._empty_arrow_schema(collection, infer_schema),
+                    compression=compression,
+                )
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return Path(path)
+
+    def aggregate(
+        self,
+        collection: str,
+        aggregate: Aggregate,
+        group_by: Optional[list[str]] = None,
+        filter: Optional[Filter] = None,
+        query: Optional[Query] = None,
+    ) -> list[AggregateResult]:
+        """
+        Aggregate Items of a Collection in the database instead of reading them
+        :param collection: a string representing the collection name
+        :param aggregate: fields per aggregate function, e.g. {"count": "*", "avg": ["price"]}.
+          Functions: count, countDistinct, countAll, sum, sumDistinct, avg, avgDistinct, min, max
+        :param group_by: fields to group by, e.g. ["category"] or ["year(date_created)"]
+        :param filter: only aggregate the items matching the filter
+        :param query: further query parameters, e.g. sort or limit. Without a limit all groups are returned.
+
+        :return: list[AggregateResult] - one result per group, or a single one without group_by
+        """
+        params = {**(query or {}), "aggregate": aggregate}
+        if group_by:
+            params["groupBy"] = list(group_by)
+            params.setdefault("limit", -1)
+        if filter:
+            params["filter"] = (
+                {"_and": [params["filter"], filter]} if params.get("filter") else filter
+            )
+
+        endpoint = f"/items/{collection}"
+        response = self._rest_adapter.get(endpoint, params=params)
+
+        return parse_aggregates(handle_directus_response(response))
+
+    def batch(self) -> GraphQLBatch:
+        """
+        Send several reads as one GraphQL request, e.g.
+
+            with directus.batch() as batch:
+                articles = batch.read_items("articles", {"fields": ["id", "title"]})
+                author = batch.read_item("authors", 1, {"fields": ["name"]})
+            articles.result()
+
+        :return: GraphQLBatch, its reads return futures that are resolved when the block exits
+        """
+        return GraphQLBatch(self)
+
+    def loader(
+        self,
+        primary_keys: Optional[dict[str, str]] = None,
+        fields: Optional[dict[str, list[str]]] = None,
+        max_batch_size: int = 100,
+    ) -> RelationLoader:
+        """
+        Create a loader that batches reads by primary key, e.g. to resolve the relations
+        of a page of items in a few requests instead of one per item
+        :param primary_keys: the primary key field per collection, "id" by default
+        :param fields: the fields read per collection, all by default
+        :param max_batch_size: the maximum number of keys per request
+
+        :return: RelationLoader, memoizing the loaded items until it is cleared
+        """
+        return RelationLoader(
+            self,
+            primary_keys=primary_keys,
+            fields=fields,
+            max_batch_size=max_batch_size,
+        )
+
     def read_item(
-        self, collection: str, id: str, query: Optional[Query] = None
+        self,
+        collection: str,
+        id: str,
+        query: Optional[Query] = None,
+        record_type: Optional[type] = None,
     ) -> Item:
         """
         GET Item from Collection by ID
@@ -65,12 +517,15 @@ class DirectusClient:
         :param id: a string representing the item ID
         :param query:
           - fields: A list of fields that are returned.
+        :param record_type: decode the item into a Record class or msgspec Struct, see pydirectus.records
 
         :return: item as dict
         """
 
         endpoint = f"/items/{collection}/{id}"
-        response = self._rest_adapter.get(endpoint, params=query)
+        response = self._rest_adapter.get(
+            endpoint, params=query, decoder=self._decoder(record_type, many=False)
+        )
 
         return handle_directus_response(response)
 
@@ -113,9 +568,111 @@ class DirectusClient:
         endpoint = f"/items/{collection}/{id}"
         self._rest_adapter.delete(endpoint)
 
+    def create_items(
+        self,
+        collection: str,
+        items: list[dict],
+        chunk_size: int = 100,
+        max_chunk_bytes: Optional[int] = None,
+        workers: int = 1,
+    ) -> BatchResult:
+        """
+        POST Items to Collection in chunks
+        :param collection: a string representing the collection name
+        :param items: list of item data as dict
+        :param chunk_size: maximum number of items per request
+        :param max_chunk_bytes: maximum size of the JSON payload per request in bytes
+        :param workers: the number of chunks sent concurrently
+
+        :return: BatchResult - created items of all successful chunks and the failed chunks
+        """
+        endpoint = f"/items/{collection}"
+
+        def send_chunk(chunk: list) -> list[Item]:
+            response = self._rest_adapter.post(endpoint, data=chunk)
+            return handle_directus_response(response)
+
+        chunks = chunk_rows(
+            items, chunk_size, max_chunk_bytes, self._rest_adapter._codec.dumps
+        )
+        return run_chunks(send_chunk, chunks, workers=workers)
+
+    def update_items(
+        self,
+        collection: str,
+        data: dict | list[dict],
+        keys: Optional[list[str]] = None,
+        chunk_size: int = 100,
+        max_chunk_bytes: Optional[int] = None,
+        workers: int = 1,
+    ) -> BatchResult:
+        """
+        PATCH Items in Collection in chunks
+        :param collection: a string representing the collection name
+        :param data: either one dict of item data applied to all keys,
+          or a list of per-item payloads, each containing the primary key
+        :param keys: list of item IDs, required if data is a single dict
+        :param chunk_size: maximum number of items per request
+        :param max_chunk_bytes: maximum size of the JSON payload per request in bytes
+        :param workers: the number of chunks sent concurrently
+
+        :return: BatchResult - updated items of all successful chunks and the failed chunks
+        """
+        endpoint = f"/items/{collection}"
+
+        if isinstance(data, dict):
+            if keys is None:
+                raise ValueError("keys are required to update items with one payload!")
+
+            def send_chunk(chunk: list) -> list[Item]:
+                payload = {"keys": chunk, "data": data}
+                response = self._rest_adapter.patch(endpoint, data=payload)
+                return handle_directus_response(response)
+
+            dumps = self._rest_adapter._codec.dumps
+            budget = envelope_budget(max_chunk_bytes, {"data": data}, dumps)
+            chunks = chunk_rows(keys, chunk_size, budget, dumps)
+        else:
+
+            def send_chunk(chunk: list) -> list[Item]:
+                response = self._rest_adapter.patch(endpoint, data=chunk)
+                return handle_directus_response(response)
+
+            chunks = chunk_rows(
+                data, chunk_size, max_chunk_bytes, self._rest_adapter._codec.dumps
+            )
+
+        return run_chunks(send_chunk, chunks, workers=workers)
+
+    def delete_items(
+        self,
+        collection: str,
+        keys: list[str],
+        chunk_size: int = 100,
+        workers: int = 1,
+    ) -> BatchResult:
+        """
+        DELETE Items in Collection in chunks
+        :param collection: a string representing the collection name
+        :param keys: list of item IDs
+        :param chunk_size: maximum number of items per request
+        :param workers: the number of chunks sent concurrently
+
+        :return: BatchResult - the failed chunks, if any
+        """
+        endpoint = f"/items/{collection}"
+
+        def send_chunk(chunk: list) -> None:
+            response = self._rest_adapter.delete(endpoint, data=chunk)
+            return handle_directus_response(response)
+
+        chunks = chunk_rows(keys, chunk_size)
+        return run_chunks(send_chunk, chunks, workers=workers)
+
     def read_files(
         self,
         query: Optional[Query] = None,
+        record_type: Optional[type] = None,
     ) -> list[File]:
         """
         GET Files
@@ -129,25 +686,63 @@ class DirectusClient:
           - page: Specify the page number when paginating results.
           - deep: Set any of the other query parameters on a nested relational dataset.
           - alias: Rename fields and request the same nested data set multiple times using different filters
+        :param record_type: decode the rows into a Record class or msgspec Struct, see pydirectus.records
 
         :return: list of dict
         """
         endpoint = "/files"
-        response = self._rest_adapter.get(endpoint, params=query)
+        response = self._rest_adapter.get(
+            endpoint, params=query, decoder=self._decoder(record_type)
+        )
 
-        return handle_directus_response(response)
+        data = handle_directus_response(response)
 
-    def read_file(self, id: str, query: Optional[Query] = None) -> File:
+        return [] if record_type and data is None else data
+
+    def iter_files(
+        self,
+        query: Optional[Query] = None,
+        page_size: int = 100,
+        prefetch: bool = False,
+        record_type: Optional[type] = None,
+    ) -> Iterator[File]:
+        """
+        GET Files page by page and yield them one at a time
+        :param query: a dictionary specifying the query parameters, see read_files.
+          A limit caps the total number of yielded files, an offset or page sets the start.
+        :param page_size: the number of files fetched per request
+        :param prefetch: fetch the next page while the current one is consumed
+        :param record_type: decode the rows into a Record class or msgspec Struct, see pydirectus.records
+
+        :return: Iterator[File] - An iterator over the files.
+        """
+        for page in iter_pages(
+            partial(self.read_files, record_type=record_type),
+            query,
+            page_size=page_size,
+            prefetch=prefetch,
+        ):
+            yield from page
+
+    def read_file(
+        self,
+        id: str,
+        query: Optional[Query] = None,
+        record_type: Optional[type] = None,
+    ) -> File:
         """
         GET File by ID
         :param id: a string representing the file ID
         :param query:
           - fields: A list of fields that are returned.
+        :param record_type: decode the item into a Record class or msgspec Struct, see pydirectus.records
 
         :return: file as dict
         """
         endpoint = f"/files/{id}"
-        response = self._rest_adapter.get(endpoint, params=query)
+        response = self._rest_adapter.get(
+            endpoint, params=query, decoder=self._decoder(record_type, many=False)
+        )
 
         return handle_directus_response(response)
 
@@ -163,6 +758,122 @@ class DirectusClient:
 
         return handle_directus_response(response)
 
+    def upload_file(
+        self,
+        file: str | os.PathLike | BinaryIO,
+        data: Optional[dict] = None,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> File:
+        """
+        POST File as multipart upload. The file is streamed, not read into memory.
+        :param file: path or binary file object to upload
+        :param data: file data as dict, e.g. title or folder
+        :param filename: name of the uploaded file, defaults to the name of the path
+        :param content_type: mimetype of the file, guessed from the filename by default
+
+        :return: created file as dict, if successful
+        """
+        endpoint = "/files"
+
+        with upload_part(file, filename, content_type) as files:
+            response = self._rest_adapter.post(endpoint, data=data, files=files)
+
+        return handle_directus_response(response)
+
+    def replace_file(
+        self,
+        id: str,
+        file: str | os.PathLike | BinaryIO,
+        data: Optional[dict] = None,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> File:
+        """
+        PATCH File with new file contents. The file is streamed, not read into memory.
+        :param id: a string representing the file ID
+        :param file: path or binary file object to upload
+        :param data: file data as dict, e.g. title or folder
+        :param filename: name of the uploaded file, defaults to the name of the path
+        :param content_type: mimetype of the file, guessed from the filename by default
+
+        :return: updated file as dict, if successful
+        """
+        endpoint = f"/files/{id}"
+
+        with upload_part(file, filename, content_type) as files:
+            response = self._rest_adapter.patch(endpoint, data=data, files=files)
+
+        return handle_directus_response(response)
+
+    def iter_asset_bytes(
+        self,
+        id: str,
+        query: Optional[AssetQuery] = None,
+        chunk_size: int = 64 * 1024,
+        start: int = 0,
+    ) -> Iterator[bytes]:
+        """
+        GET the contents of a File from /assets in chunks
+        :param id: a string representing the file ID
+        :param query: a dictionary specifying transformations, e.g. width, height, fit, format
+        :param chunk_size: the size of the yielded chunks in bytes
+        :param start: byte offset to start from, requested with a Range header
+
+        :return: Iterator[bytes] - An iterator over the bytes of the file.
+        """
+        endpoint = f"/assets/{id}"
+        params = dict(query) if query else None
+
+        with self._rest_adapter.stream(
+            "GET", endpoint, params=params, headers=range_headers(start)
+        ) as response:
+            # a server ignoring the Range header sends the whole file
+            skip = start if response.status_code != 206 else 0
+
+            yield from skip_bytes(response.iter_bytes(chunk_size), skip)
+
+    def download_file(
+        self,
+        id: str,
+        path: str | os.PathLike,
+        query: Optional[AssetQuery] = None,
+        chunk_size: int = 64 * 1024,
+        resume: bool = False,
+    ) -> Path:
+        """
+        GET the contents of a File from /assets and stream them to disk
+        :param id: a string representing the file ID
+        :param path: the path to write the file to
+        :param query: a dictionary specifying transformations, e.g. width, height, fit, format
+        :param chunk_size: the size of the chunks written to disk in bytes
+        :param resume: continue a partial download at the end of an existing file
+
+        :return: path of the downloaded file
+        """
+        endpoint = f"/assets/{id}"
+        params = dict(query) if query else None
+        path = Path(path)
+        start = path.stat().st_size if resume and path.exists() else 0
+
+        with self._rest_adapter.stream(
+            "GET",
+            endpoint,
+            params=params,
+            headers=range_headers(start),
+            # the existing file is already complete
+            allowed_statuses=(416,),
+        ) as response:
+            if response.status_code == 416:
+                return path
+
+            mode = "ab" if response.status_code == 206 else "wb"
+            with open(path, mode) as f:
+                for chunk in response.iter_bytes(chunk_size):
+                    f.write(chunk)
+
+        return path
+
     def update_file(self, id: str, data: dict) -> File:
         """
         PATCH File
@@ -185,3 +896,120 @@ class DirectusClient:
         """
         endpoint = f"/files/{id}"
         self._rest_adapter.delete(endpoint)
+
+    def read_activities(self, query: Optional[Query] = None) -> list[Activity]:
+        """
+        GET Activities, the log of all actions performed in Directus
+        :param query: a dictionary specifying the query parameters, see read_items
+
+        :return: list[Activity] - A list of activities.
+        """
+        endpoint = "/activity"
+        response = self._rest_adapter.get(endpoint, params=query)
+
+        return handle_directus_response(response)
+
+    def iter_activities(
+        self, query: Optional[Query] = None, page_size: int = 100
+    ) -> Iterator[Activity]:
+        """
+        GET Activities page by page in ascending order of their ID
+        :param query: a dictionary specifying the query parameters, see read_items.
+          Filter on the ID (e.g. {"id": {"_gt": last_seen_id}}) to tail the log.
+        :param page_size: the number of activities fetched per request
+
+        :return: Iterator[Activity] - An iterator over the activities.
+        """
+        for page in iter_keyset_pages(
+            self.read_activities, query, page_size=page_size, key="id"
+        ):
+            yield from page
+
+    def read_activity(self, id: int, query: Optional[Query] = None) -> Activity:
+        """
+        GET Activity by ID
+        :param id: the activity ID
+        :param query:
+          - fields: A list of fields that are returned.
+
+        :return: activity as dict
+        """
+        endpoint = f"/activity/{id}"
+        response = self._rest_adapter.get(endpoint, params=query)
+
+        return handle_directus_response(response)
+
+    def read_revisions(self, query: Optional[Query] = None) -> list[Revision]:
+        """
+        GET Revisions, the item states saved for create and update activities
+        :param query: a dictionary specifying the query parameters, see read_items
+
+        :return: list[Revision] - A list of revisions.
+        """
+        endpoint = "/revisions"
+        response = self._rest_adapter.get(endpoint, params=query)
+
+        return handle_directus_response(response)
+
+    def read_revision(self, id: int, query: Optional[Query] = None) -> Revision:
+        """
+        GET Revision by ID
+        :param id: the revision ID
+        :param query:
+          - fields: A list of fields that are returned.
+
+        :return: revision as dict
+        """
+        endpoint = f"/revisions/{id}"
+        response = self._rest_adapter.get(endpoint, params=query)
+
+        return handle_directus_response(response)
+
+    def _realtime_token(self) -> Optional[str]:
+        auth = self._rest_adapter._auth_handler
+        if not isinstance(auth, DirectusAuth):
+            return None
+        if auth._should_refresh():
+            auth.refresh()
+        return auth.bearer_token
+
+    def subscribe(
+        self,
+        collection: str,
+        callback: Callable[[RealtimeEvent], None],
+        query: Optional[Query] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> Subscription:
+        """
+        Subscribe to the changes of a collection over the realtime WebSocket API
+        (requires the realtime extra). All subscriptions share one connection on a
+        background thread, which reconnects and resubscribes after connection losses.
+        :param collection: the collection name
+        :param callback: called on the background thread with every RealtimeEvent,
+          e.g. lambda event: event.apply_to(engine.store)
+        :param query: fields and filter of the items sent with the events
+        :param on_error: called if the subscription fails, e.g. on authentication errors
+
+        :return: the Subscription, pass it to unsubscribe
+        """
+        if self._realtime is None:
+
+            async def token() -> Optional[str]:
+                return await asyncio.to_thread(self._realtime_token)
+
+            self._realtime = RealtimeThread(
+                lambda: RealtimeConnection(
+                    self._rest_adapter._url,
+                    token=token,
+                    logger=self._rest_adapter._logger,
+                )
+            )
+
+        return self._realtime.subscribe(collection, callback, query, on_error)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        End a subscription made with subscribe
+        """
+        if self._realtime is not None:
+            self._realtime.unsubscribe(subscription)
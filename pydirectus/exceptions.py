@@ -4,3 +4,7 @@ class DirectusException(Exception):
 
 class DirectusAuthException(Exception):
     pass
+
+
+class DirectusCircuitOpenException(DirectusException):
+    pass
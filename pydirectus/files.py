@@ -0,0 +1,80 @@
+import mimetypes
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Iterator, Optional
+
+
+@contextmanager
+def upload_part(
+    file: str | os.PathLike | BinaryIO,
+    filename: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> Iterator[dict]:
+    """
+    Build the multipart file part for an upload. Paths are opened here and closed
+    after the request; httpx reads the file in chunks while sending it.
+    :param file: path or binary file object to upload
+    :param filename: name of the uploaded file, defaults to the name of the path
+    :param content_type: mimetype of the file, guessed from the filename by default
+
+    :return: iterator yielding the files dict for httpx
+    """
+    if isinstance(file, (str, os.PathLike)):
+        path = Path(file)
+        with open(path, "rb") as f:
+            yield _file_dict(f, filename or path.name, content_type)
+    else:
+        name = filename or Path(getattr(file, "name", None) or "upload").name
+        yield _file_dict(file, name, content_type)
+
+
+def _file_dict(file: BinaryIO, filename: str, content_type: Optional[str]) -> dict:
+    content_type = (
+        content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    )
+    return {"file": (filename, file, content_type)}
+
+
+def range_headers(start: int) -> Optional[dict]:
+    """
+    Build the headers to request the bytes of a file from start onwards.
+
+    """
+    return {"Range": f"bytes={start}-"} if start else None
+
+
+def _skip_chunk(chunk: bytes, skip: int) -> tuple[bytes, int]:
+    """
+    Drop up to skip bytes from the start of a chunk
+    :return: the rest of the chunk and the number of bytes still to skip
+    """
+    if len(chunk) <= skip:
+        return b"", skip - len(chunk)
+    return chunk[skip:], 0
+
+
+def skip_bytes(chunks: Iterator[bytes], skip: int) -> Iterator[bytes]:
+    """
+    Drop the first skip bytes of a chunked stream, for servers ignoring a Range header.
+
+    """
+    for chunk in chunks:
+        if skip:
+            chunk, skip = _skip_chunk(chunk, skip)
+            if not chunk:
+                continue
+        yield chunk
+
+
+async def askip_bytes(chunks: AsyncIterator[bytes], skip: int) -> AsyncIterator[bytes]:
+    """
+    Async counterpart of skip_bytes
+
+    """
+    async for chunk in chunks:
+        if skip:
+            chunk, skip = _skip_chunk(chunk, skip)
+            if not chunk:
+                continue
+        yield chunk
@@ -0,0 +1,430 @@
+import asyncio
+import json
+import re
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+
+from .exceptions import DirectusException
+from .models import Item, Query
+from .records import record_converter, to_records
+
+if TYPE_CHECKING:
+    from .async_directus import AsyncDirectusClient
+    from .directus import DirectusClient
+    from .rest_adapter import Result
+
+_NAME = re.compile(r"^[_A-Za-z][_0-9A-Za-z]*$")
+# query parameters and their GraphQL arguments, deep queries use them with a "_" prefix
+_ARGUMENTS = ("filter", "search", "sort", "limit", "offset", "page")
+
+
+def _name(name: str) -> str:
+    if not _NAME.match(name):
+        raise ValueError(f"{name!r} is not a valid GraphQL name")
+    return name
+
+
+def graphql_value(value: Any) -> str:
+    """
+    Write a value as GraphQL input literal, e.g. a filter
+    """
+    if isinstance(value, dict):
+        fields = ", ".join(f"{_name(k)}: {graphql_value(v)}" for k, v in value.items())
+        return "{" + fields + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(graphql_value(v) for v in value) + "]"
+    # JSON strings, numbers, booleans and null are valid GraphQL literals
+    return json.dumps(value)
+
+
+def _arguments(query: dict, prefix: str = "") -> str:
+    arguments = [
+        f"{name}: {graphql_value(query[prefix + name])}"
+        for name in _ARGUMENTS
+        if query.get(prefix + name) is not None
+    ]
+    return f"({', '.join(arguments)})" if arguments else ""
+
+
+def _selection(fields: list[str], deep: Optional[dict]) -> str:
+    """
+    Build the selection set of dotted field paths, with deep queries as arguments
+    of the relational fields
+    """
+    tree: dict = {}
+    for field in fields:
+        if "*" in field:
+            raise ValueError(
+                f"GraphQL requires explicit fields, got {field!r} in the fields"
+            )
+        node = tree
+        for part in field.split("."):
+            node = node.setdefault(_name(part), {})
+
+    def write(node: dict, deep: dict) -> str:
+        selections = []
+        for field, children in node.items():
+            nested = deep.get(field) or {}
+            if not children:
+                selections.append(field)
+            else:
+                arguments = _arguments(nested, prefix="_")
+                selections.append(f"{field}{arguments} {write(children, nested)}")
+        return "{ " + " ".join(selections) + " }"
+
+    return write(tree, deep or {})
+
+
+def _check_query(query: dict) -> None:
+    unsupported = set(query) - {*_ARGUMENTS, "fields", "deep"}
+    if unsupported:
+        raise ValueError(f"{sorted(unsupported)} cannot be sent in a GraphQL batch")
+    if not query.get("fields"):
+        raise ValueError("GraphQL requires explicit fields")
+
+
+class _BatchCall:
+    def __init__(
+        self,
+        alias: str,
+        selection: str,
+        future: Any,
+        convert: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.alias = alias
+        self.selection = selection
+        self.future = future
+        self.convert = convert
+
+
+class _BaseGraphQLBatch(ABC):
+    """
+    Shared recording and compilation of the sync and async batches
+    """
+
+    def __init__(self):
+        # the recorded reads that have not been sent yet
+        self._calls: list[_BatchCall] = []
+        self._count = 0
+        self._closed = False
+        # results may be waited for on other threads, which sends the batch
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _future(self) -> Any:
+        """
+        Create the future of a recorded read
+        """
+
+    def _record(
+        self, selection: str, convert: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        with self._lock:
+            if self._closed:
+                raise DirectusException("The batch has already been sent!")
+
+            call = _BatchCall(f"q{self._count}", selection, self._future(), convert)
+            self._count += 1
+            self._calls.append(call)
+        return call.future
+
+    def _take_calls(self) -> list[_BatchCall]:
+        with self._lock:
+            calls, self._calls = self._calls, []
+        return calls
+
+    def _items_selection(self, collection: str, query: Optional[Query]) -> str:
+        query = dict(query or {})
+        _check_query(query)
+        return (
+            f"{_name(collection)}{_arguments(query)} "
+            f"{_selection(query['fields'], query.get('deep'))}"
+        )
+
+    def _item_selection(
+        self, collection: str, id: Union[str, int], query: Optional[Query]
+    ) -> str:
+        query = dict(query or {})
+        _check_query(query)
+        if set(query) & set(_ARGUMENTS):
+            raise ValueError("read_item only accepts fields and deep")
+        return (
+            f"{_name(collection)}_by_id(id: {graphql_value(str(id))}) "
+            f"{_selection(query['fields'], query.get('deep'))}"
+        )
+
+    def document(self, calls: Optional[list[_BatchCall]] = None) -> str:
+        """
+        The GraphQL document of the recorded reads, one aliased field per read
+        :param calls: the reads, defaults to those not sent yet
+        """
+        calls = self._calls if calls is None else calls
+        return (
+            "query { "
+            + " ".join(f"{call.alias}: {call.selection}" for call in calls)
+            + " }"
+        )
+
+    def _resolve(self, calls: list[_BatchCall], result: "Result") -> None:
+        """
+        Hand every call its part of the response
+        """
+        body = result.data if isinstance(result.data, dict) else {}
+        data = body.get("data") or {}
+
+        errors: dict[Optional[str], list] = {}
+        for error in body.get("errors") or []:
+            path = error.get("path") or [None]
+            errors.setdefault(path[0], []).append(error)
+
+        if not result.success and not data:
+            self._fail(calls, DirectusException(body.get("errors") or result.message))
+            return
+
+        for call in calls:
+            if call.alias in errors:
+                call.future.set_exception(DirectusException(errors[call.alias]))
+            elif call.alias not in data:
+                call.future.set_exception(
+                    DirectusException(errors.get(None) or "Missing GraphQL result!")
+                )
+            else:
+                try:
+                    value = data[call.alias]
+                    if call.convert is not None and value is not None:
+                        value = call.convert(value)
+                except DirectusException as e:
+                    call.future.set_exception(e)
+                else:
+                    call.future.set_result(value)
+
+    def _fail(self, calls: list[_BatchCall], exception: BaseException) -> None:
+        for call in calls:
+            if not call.future.done():
+                call.future.set_exception(exception)
+
+
+def _converter(record_type: Optional[type], many: bool) -> Optional[Callable]:
+    if record_type is None:
+        return None
+    if many:
+        return lambda rows: to_records(rows, record_type)
+    return record_converter(record_type)
+
+
+class _BatchFuture(Future):
+    """
+    Future of a read in a GraphQLBatch, waiting for its result sends the batch
+    """
+
+    def __init__(self, batch: "GraphQLBatch"):
+        super().__init__()
+        self._batch = batch
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        if not self.done():
+            self._batch.send()
+        return super().result(timeout)
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        if not self.done():
+            self._batch.send()
+        return super().exception(timeout)
+
+
+class GraphQLBatch(_BaseGraphQLBatch):
+    def __init__(self, client: "DirectusClient"):
+        """
+        Records reads and sends them as one GraphQL request when the with block exits.
+        Every read returns a concurrent.futures.Future holding its own result.
+        Waiting for a result within the with block sends the reads recorded so far,
+        later reads are sent together when the block exits.
+        Note that GraphQL returns primary keys (type ID) as strings.
+        :param client: the DirectusClient to send with
+        """
+        super().__init__()
+        self._client = client
+
+    def __enter__(self) -> "GraphQLBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._closed = True
+        if exc_type is not None:
+            self._fail(
+                self._take_calls(),
+                DirectusException("The batch was not sent due to an error!"),
+            )
+            return
+        self.send()
+
+    def _future(self) -> Future:
+        return _BatchFuture(self)
+
+    def read_items(
+        self,
+        collection: str,
+        query: Optional[Query] = None,
+        record_type: Optional[type] = None,
+    ) -> "Future[list[Item]]":
+        """
+        Record a read of Items, see DirectusClient.read_items
+        :param query: fields (required, no wildcards), filter, search, sort, limit, offset, page and deep
+        """
+        return self._record(
+            self._items_selection(collection, query), _converter(record_type, True)
+        )
+
+    def read_item(
+        self,
+        collection: str,
+        id: Union[str, int],
+        query: Optional[Query] = None,
+        record_type: Optional[type] = None,
+    ) -> "Future[Item]":
+        """
+        Record a read of an Item by ID, see DirectusClient.read_item
+        :param query: fields (required, no wildcards) and deep
+        """
+        return self._record(
+            self._item_selection(collection, id, query), _converter(record_type, False)
+        )
+
+    def send(self) -> None:
+        """
+        Send the reads recorded since the last send, called when the with block
+        exits or a result is waited for
+        """
+        calls = self._take_calls()
+        if not calls:
+            return
+
+        try:
+            result = self._client._rest_adapter.post(
+                "/graphql", data={"query": self.document(calls)}
+            )
+        except BaseException as e:
+            # errors are delivered as the results of the reads
+            self._fail(calls, e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        self._resolve(calls, result)
+
+
+class _AsyncBatchFuture(asyncio.Future):
+    """
+    Future of a read in an AsyncGraphQLBatch. Awaiting it (also through
+    asyncio.gather or asyncio.wait, which add a done callback) sends the batch.
+    """
+
+    def __init__(self, batch: "AsyncGraphQLBatch"):
+        super().__init__()
+        self._batch = batch
+
+    def add_done_callback(self, fn: Callable, *, context: Any = None) -> None:
+        super().add_done_callback(fn, context=context)
+        if not self.done():
+            self._batch._send_soon()
+
+
+class AsyncGraphQLBatch(_BaseGraphQLBatch):
+    def __init__(self, client: "AsyncDirectusClient"):
+        """
+        Records reads and sends them as one GraphQL request when the async with block
+        exits. Every read returns an asyncio.Future holding its own result.
+        Awaiting a result within the async with block sends the reads recorded so
+        far, later reads are sent together when the block exits.
+        Note that GraphQL returns primary keys (type ID) as strings.
+        :param client: the AsyncDirectusClient to send with
+        """
+        super().__init__()
+        self._client = client
+        self._send_scheduled = False
+        self._sends: set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> "AsyncGraphQLBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self._closed = True
+        if exc_type is not None:
+            calls = self._take_calls()
+            self._fail(
+                calls, DirectusException("The batch was not sent due to an error!")
+            )
+            # the futures are not awaited after an error
+            for call in calls:
+                call.future.exception()
+            return
+        await self.send()
+        if self._sends:
+            await asyncio.wait(self._sends)
+
+    def _future(self) -> asyncio.Future:
+        return _AsyncBatchFuture(self)
+
+    def _send_soon(self) -> None:
+        """
+        Send the recorded reads in a task, a result is awaited
+        """
+        if not self._send_scheduled and self._calls:
+            self._send_scheduled = True
+            task = asyncio.ensure_future(self.send())
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    def read_items(
+        self,
+        collection: str,
+        query: Optional[Query] = None,
+        record_type: Optional[type] = None,
+    ) -> "asyncio.Future[list[Item]]":
+        """
+        Record a read of Items, see AsyncDirectusClient.read_items
+        :param query: fields (required, no wildcards), filter, search, sort, limit, offset, page and deep
+        """
+        return self._record(
+            self._items_selection(collection, query), _converter(record_type, True)
+        )
+
+    def read_item(
+        self,
+        collection: str,
+        id: Union[str, int],
+        query: Optional[Query] = None,
+        record_type: Optional[type] = None,
+    ) -> "asyncio.Future[Item]":
+        """
+        Record a read of an Item by ID, see AsyncDirectusClient.read_item
+        :param query: fields (required, no wildcards) and deep
+        """
+        return self._record(
+            self._item_selection(collection, id, query), _converter(record_type, False)
+        )
+
+    async def send(self) -> None:
+        """
+        Send the reads recorded since the last send, called when the async with
+        block exits or a result is awaited
+        """
+        self._send_scheduled = False
+        calls = self._take_calls()
+        if not calls:
+            return
+
+        try:
+            result = await self._client._rest_adapter.post(
+                "/graphql", data={"query": self.document(calls)}
+            )
+        except BaseException as e:
+            # errors are delivered as the results of the reads
+            self._fail(calls, e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        self._resolve(calls, result)
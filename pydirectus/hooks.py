@@ -0,0 +1,243 @@
+import logging
+import time
+from typing import Any, Optional, Sequence
+
+import httpx
+
+from .utils import collection_from_endpoint, endpoint_template
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import Status, StatusCode
+except ImportError:  # pragma: no cover - optional dependency
+    trace = None
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+
+class RequestInfo:
+    """
+    Metrics of a single call of the RestAdapter, including all of its retries,
+    handed to the RequestHooks when the request starts and ends
+    """
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "stream",
+        "start",
+        "duration",
+        "elapsed",
+        "status_code",
+        "bytes_out",
+        "bytes_in",
+        "decode_time",
+        "retries",
+        "cache",
+        "error",
+        "context",
+    )
+
+    def __init__(self, method: str, endpoint: str, stream: bool = False):
+        self.method = method
+        self.endpoint = endpoint
+        self.stream = stream
+        self.start = time.perf_counter()
+        # total time in seconds, including rate limiting, retries and decoding
+        self.duration: Optional[float] = None
+        # time of the last attempt from sending the request until the body was read
+        self.elapsed: Optional[float] = None
+        # None if no response was received
+        self.status_code: Optional[int] = None
+        # request body and (compressed) response body sizes in bytes
+        self.bytes_out = 0
+        self.bytes_in = 0
+        # time spent decoding the JSON body in seconds
+        self.decode_time = 0.0
+        self.retries = 0
+        # "hit" for fresh cache entries, "revalidated" for 304 Not Modified
+        self.cache: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        # state of the hooks, e.g. the span of a request
+        self.context: dict = {}
+
+    @property
+    def endpoint_template(self) -> str:
+        """
+        The endpoint without IDs and collection names, e.g. /items/{collection}/{id}
+        """
+        return endpoint_template(self.endpoint)
+
+    @property
+    def collection(self) -> Optional[str]:
+        return collection_from_endpoint(self.endpoint)
+
+    def record_response(self, response: httpx.Response) -> None:
+        """
+        Take the status, sizes and timing of a response
+        """
+        self.status_code = response.status_code
+        self.bytes_out = int(response.request.headers.get("Content-Length") or 0)
+        self.bytes_in = response.num_bytes_downloaded
+        if not self.bytes_in and not self.stream:
+            # e.g. responses of a MockTransport, which are not downloaded
+            try:
+                self.bytes_in = len(response.content)
+            except httpx.ResponseNotRead:
+                pass
+        try:
+            self.elapsed = response.elapsed.total_seconds()
+        except RuntimeError:
+            # a streamed response that has not been closed yet
+            pass
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestInfo(method={self.method!r}, endpoint={self.endpoint_template!r}, "
+            f"status_code={self.status_code}, duration={self.duration}, "
+            f"retries={self.retries}, cache={self.cache!r})"
+        )
+
+
+class RequestHooks:
+    """
+    Callbacks around the requests of a RestAdapter. Subclass it and override the
+    callbacks, exceptions raised by them are logged and do not fail the request.
+    """
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        pass
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        pass
+
+
+def call_hooks(hooks: Sequence[RequestHooks], name: str, info: RequestInfo) -> None:
+    for hook in hooks:
+        try:
+            getattr(hook, name)(info)
+        except Exception:
+            logger.exception("request hook %r failed in %s", hook, name)
+
+
+class OpenTelemetryHooks(RequestHooks):
+    def __init__(self, tracer: Any = None):
+        """
+        Record a client span per request (requires opentelemetry-api)
+        :param tracer: the tracer, defaults to the tracer of the global provider
+        """
+        if trace is None:
+            raise ImportError(
+                "OpenTelemetryHooks require opentelemetry-api: pip install opentelemetry-api"
+            )
+
+        self.tracer = tracer or trace.get_tracer("pydirectus")
+
+    def on_request_start(self, info: RequestInfo) -> None:
+        info.context["span"] = self.tracer.start_span(
+            f"{info.method} {info.endpoint_template}",
+            kind=trace.SpanKind.CLIENT,
+            attributes={
+                "http.request.method": info.method,
+                "url.template": info.endpoint_template,
+            },
+        )
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        span = info.context.pop("span", None)
+        if span is None:
+            return
+
+        attributes = {
+            "directus.retries": info.retries,
+            "directus.decode_time": info.decode_time,
+            "http.request.body.size": info.bytes_out,
+            "http.response.body.size": info.bytes_in,
+        }
+        if info.collection:
+            attributes["directus.collection"] = info.collection
+        if info.status_code is not None:
+            attributes["http.response.status_code"] = info.status_code
+        if info.cache:
+            attributes["directus.cache"] = info.cache
+        span.set_attributes(attributes)
+
+        if info.error is not None:
+            span.record_exception(info.error)
+            span.set_status(Status(StatusCode.ERROR, str(info.error)))
+        elif info.status_code is not None and info.status_code >= 400:
+            span.set_status(Status(StatusCode.ERROR))
+        span.end()
+
+
+class PrometheusHooks(RequestHooks):
+    def __init__(self, registry: Any = None, namespace: str = "directus"):
+        """
+        Export request metrics as Prometheus histograms and counters (requires prometheus-client)
+        :param registry: the CollectorRegistry, defaults to the global registry
+        :param namespace: prefix of the metric names
+        """
+        if prometheus_client is None:
+            raise ImportError(
+                "PrometheusHooks require prometheus-client: pip install prometheus-client"
+            )
+
+        options = {"namespace": namespace}
+        if registry is not None:
+            options["registry"] = registry
+        labels = ("method", "endpoint", "status")
+
+        self.duration = prometheus_client.Histogram(
+            "request_duration_seconds",
+            "Duration of Directus requests, including retries",
+            labels,
+            **options,
+        )
+        self.decode = prometheus_client.Histogram(
+            "response_decode_seconds",
+            "Time spent decoding Directus responses",
+            labels,
+            buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+            **options,
+        )
+        self.response_size = prometheus_client.Histogram(
+            "response_size_bytes",
+            "Size of Directus response bodies as received",
+            labels,
+            buckets=tuple(4**exponent for exponent in range(3, 15)),
+            **options,
+        )
+        self.request_size = prometheus_client.Counter(
+            "request_bytes",
+            "Bytes sent in Directus request bodies",
+            labels,
+            **options,
+        )
+        self.retries = prometheus_client.Counter(
+            "request_retries",
+            "Retries of Directus requests",
+            labels,
+            **options,
+        )
+
+    def on_request_end(self, info: RequestInfo) -> None:
+        status = (
+            "cache"
+            if info.cache == "hit"
+            else str(info.status_code) if info.status_code is not None else "error"
+        )
+        labels = (info.method, info.endpoint_template, status)
+
+        self.duration.labels(*labels).observe(info.duration or 0)
+        if info.cache != "hit" and not info.stream:
+            self.decode.labels(*labels).observe(info.decode_time)
+        if info.status_code is not None:
+            self.response_size.labels(*labels).observe(info.bytes_in)
+            self.request_size.labels(*labels).inc(info.bytes_out)
+        if info.retries:
+            self.retries.labels(*labels).inc(info.retries)
@@ -0,0 +1,363 @@
+import asyncio
+import json
+import threading
+from typing import TYPE_CHECKING, Any, Hashable, Iterable, Iterator, Optional
+from urllib.parse import quote
+
+from .models import Item
+from .utils import endpoint_for_collection, handle_directus_response
+
+if TYPE_CHECKING:
+    from .async_directus import AsyncDirectusClient
+    from .directus import DirectusClient
+
+# stay well below the URL limits of proxies and servers (often 8 KiB)
+DEFAULT_MAX_URL_LENGTH = 4000
+
+
+def chunk_keys(
+    keys: list, max_batch_size: int, max_length: int = DEFAULT_MAX_URL_LENGTH
+) -> Iterator[list]:
+    """
+    Split keys into chunks for _in filters, limited in count and in URL-encoded length
+    :param keys: the keys to fetch
+    :param max_batch_size: the maximum number of keys per chunk
+    :param max_length: the maximum URL-encoded length of the keys per chunk
+    """
+    chunk: list = []
+    length = 0
+
+    for key in keys:
+        # the encoded key and its separating comma (%2C)
+        key_length = len(quote(json.dumps(key), safe="")) + 3
+        if chunk and (len(chunk) >= max_batch_size or length + key_length > max_length):
+            yield chunk
+            chunk, length = [], 0
+        chunk.append(key)
+        length += key_length
+
+    if chunk:
+        yield chunk
+
+
+def _relation_keys(value: Any) -> list:
+    """
+    The keys of a relational field that are not expanded yet
+    """
+    if isinstance(value, list):
+        return [v for v in value if v is not None and not isinstance(v, dict)]
+    if value is None or isinstance(value, dict):
+        return []
+    return [value]
+
+
+class _BaseRelationLoader:
+    """
+    Shared batching and memoization of the sync and async loaders
+    """
+
+    def __init__(
+        self,
+        primary_keys: Optional[dict[str, str]] = None,
+        fields: Optional[dict[str, list[str]]] = None,
+        max_batch_size: int = 100,
+        max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+    ):
+        self.primary_keys = primary_keys or {}
+        self.fields = fields or {}
+        self.max_batch_size = max_batch_size
+        self.max_url_length = max_url_length
+
+        # (collection, key) -> item, None if it does not exist (or is not readable)
+        self._loaded: dict[tuple[str, str], Optional[Item]] = {}
+        # collection -> keys waiting for the next batch
+        self._queue: dict[str, dict[str, Hashable]] = {}
+        # (collection, key) -> the pending dispatch fetching it
+        self._inflight: dict[tuple[str, str], Any] = {}
+
+    def _primary_key(self, collection: str) -> str:
+        return self.primary_keys.get(collection, "id")
+
+    def _enqueue(self, collection: str, keys: Iterable[Hashable]) -> None:
+        for key in keys:
+            ref = (collection, str(key))
+            if (
+                key is not None
+                and ref not in self._loaded
+                and ref not in self._inflight
+            ):
+                self._queue.setdefault(collection, {})[str(key)] = key
+
+    def _take_batches(self) -> list[tuple[str, str, dict]]:
+        """
+        Empty the queue
+        :return: the (collection, endpoint, params) of the requests to send
+        """
+        queue, self._queue = self._queue, {}
+        batches = []
+
+        for collection, keys in queue.items():
+            primary_key = self._primary_key(collection)
+            endpoint = endpoint_for_collection(collection)
+
+            fields = self.fields.get(collection)
+            if fields and primary_key not in fields and "*" not in fields:
+                fields = [*fields, primary_key]
+
+            for chunk in chunk_keys(
+                list(keys.values()), self.max_batch_size, self.max_url_length
+            ):
+                params = {"filter": {primary_key: {"_in": chunk}}, "limit": -1}
+                if fields:
+                    params["fields"] = fields
+                batches.append((collection, endpoint, params))
+
+        return batches
+
+    def _store(self, collection: str, params: dict, items: Optional[list]) -> None:
+        primary_key = self._primary_key(collection)
+        for key in params["filter"][primary_key]["_in"]:
+            self._loaded.setdefault((collection, str(key)), None)
+        for item in items or []:
+            self._loaded[(collection, str(item[primary_key]))] = item
+
+    def _get(self, collection: str, key: Hashable) -> Optional[Item]:
+        return None if key is None else self._loaded.get((collection, str(key)))
+
+    def _resolved(self, items: list[Item], relations: dict[str, str]) -> list[Item]:
+        """
+        Copies of the items with the loaded related items in place of their keys
+        """
+        resolved = []
+        for item in items:
+            item = dict(item)
+            for field, collection in relations.items():
+                value = item.get(field)
+                if isinstance(value, list):
+                    item[field] = [
+                        v if isinstance(v, dict) else self._get(collection, v)
+                        for v in value
+                    ]
+                elif value is not None and not isinstance(value, dict):
+                    item[field] = self._get(collection, value)
+            resolved.append(item)
+
+        return resolved
+
+    def clear(self) -> None:
+        """
+        Forget the loaded items, e.g. at the end of a request scope
+        """
+        self._loaded.clear()
+
+
+class RelationLoader(_BaseRelationLoader):
+    def __init__(
+        self,
+        client: "DirectusClient",
+        primary_keys: Optional[dict[str, str]] = None,
+        fields: Optional[dict[str, list[str]]] = None,
+        max_batch_size: int = 100,
+        max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+    ):
+        """
+        DataLoader-style batching of reads by primary key, to avoid one request per
+        relation (N+1). Keys are collected per collection and fetched together with
+        _in filters, loaded items are memoized until clear().
+        :param client: the DirectusClient to read with
+        :param primary_keys: the primary key field per collection, "id" by default
+        :param fields: the fields read per collection, all by default
+        :param max_batch_size: the maximum number of keys per request
+        :param max_url_length: the maximum URL-encoded length of the keys per request
+        """
+        super().__init__(primary_keys, fields, max_batch_size, max_url_length)
+        self._client = client
+        self._lock = threading.RLock()
+
+    def __enter__(self) -> "RelationLoader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.clear()
+
+    def prime(self, collection: str, keys: Iterable[Hashable]) -> None:
+        """
+        Queue keys without reading them yet, they are fetched with the next load or dispatch
+        :param collection: the collection name, e.g. "directus_files" or "articles"
+        :param keys: primary keys
+        """
+        with self._lock:
+            self._enqueue(collection, keys)
+
+    def dispatch(self) -> None:
+        """
+        Read all queued keys, one request per collection and chunk of keys
+        """
+        with self._lock:
+            for collection, endpoint, params in self._take_batches():
+                response = self._client._rest_adapter.get(endpoint, params=params)
+                self._store(collection, params, handle_directus_response(response))
+
+    def load(self, collection: str, key: Hashable) -> Optional[Item]:
+        """
+        Get an item by primary key, reading it together with all queued keys
+        :return: the item, None if it does not exist or is not readable
+        """
+        return self.load_many(collection, [key])[0]
+
+    def load_many(
+        self, collection: str, keys: Iterable[Hashable]
+    ) -> list[Optional[Item]]:
+        """
+        Get items by primary key, reading the missing ones together with all queued keys
+        :return: the items in the order of the keys, None for missing items
+        """
+        keys = list(keys)
+        with self._lock:
+            self._enqueue(collection, keys)
+            self.dispatch()
+            return [self._get(collection, key) for key in keys]
+
+    def resolve(self, items: list[Item], relations: dict[str, str]) -> list[Item]:
+        """
+        Replace the keys in relational fields of items with the related items,
+        reading all of them in a few batched requests
+        :param items: e.g. a page of files
+        :param relations: the related collection per field,
+          e.g. {"folder": "directus_folders", "uploaded_by": "directus_users"}
+        :return: copies of the items, unknown keys are replaced with None
+        """
+        with self._lock:
+            for field, collection in relations.items():
+                self._enqueue(
+                    collection,
+                    (key for item in items for key in _relation_keys(item.get(field))),
+                )
+            self.dispatch()
+            return self._resolved(items, relations)
+
+
+class AsyncRelationLoader(_BaseRelationLoader):
+    def __init__(
+        self,
+        client: "AsyncDirectusClient",
+        primary_keys: Optional[dict[str, str]] = None,
+        fields: Optional[dict[str, list[str]]] = None,
+        max_batch_size: int = 100,
+        max_url_length: int = DEFAULT_MAX_URL_LENGTH,
+    ):
+        """
+        DataLoader-style batching of reads by primary key for asyncio. All loads
+        requested within one tick of the event loop are fetched together with _in
+        filters, loaded items are memoized until clear().
+        :param client: the AsyncDirectusClient to read with
+        :param primary_keys: the primary key field per collection, "id" by default
+        :param fields: the fields read per collection, all by default
+        :param max_batch_size: the maximum number of keys per request
+        :param max_url_length: the maximum URL-encoded length of the keys per request
+        """
+        super().__init__(primary_keys, fields, max_batch_size, max_url_length)
+        self._client = client
+        self._dispatch: Optional[asyncio.Future] = None
+
+    async def __aenter__(self) -> "AsyncRelationLoader":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.clear()
+
+    def prime(self, collection: str, keys: Iterable[Hashable]) -> None:
+        """
+        Queue keys without reading them yet, they are fetched with the next load or dispatch
+        :param collection: the collection name, e.g. "directus_files" or "articles"
+        :param keys: primary keys
+        """
+        self._enqueue(collection, keys)
+
+    def _schedule(self) -> asyncio.Future:
+        """
+        The dispatch of the current tick, started once the running tasks yield
+        """
+        if self._dispatch is None:
+            loop = asyncio.get_running_loop()
+            self._dispatch = loop.create_future()
+            loop.call_soon(lambda: asyncio.ensure_future(self._run(self._dispatch)))
+        return self._dispatch
+
+    async def _fetch(self, collection: str, endpoint: str, params: dict) -> None:
+        response = await self._client._rest_adapter.get(endpoint, params=params)
+        self._store(collection, params, handle_directus_response(response))
+
+    async def _run(self, done: asyncio.Future) -> None:
+        self._dispatch = None
+        batches = self._take_batches()
+        refs = [
+            (collection, str(key))
+            for collection, _, params in batches
+            for key in next(iter(params["filter"].values()))["_in"]
+        ]
+        self._inflight.update((ref, done) for ref in refs)
+
+        try:
+            await asyncio.gather(*(self._fetch(*batch) for batch in batches))
+        except BaseException as e:
+            done.set_exception(e)
+        else:
+            done.set_result(None)
+        finally:
+            for ref in refs:
+                self._inflight.pop(ref, None)
+
+    async def _wait(self, refs: Iterable[tuple[str, str]]) -> None:
+        """
+        Wait for the dispatches fetching refs, and for the one of this tick
+        """
+        pending = {self._inflight[ref] for ref in refs if ref in self._inflight}
+        if self._queue:
+            pending.add(self._schedule())
+
+        for dispatch in pending:
+            await asyncio.shield(dispatch)
+
+    async def dispatch(self) -> None:
+        """
+        Read all queued keys now
+        """
+        await self._wait([])
+
+    async def load(self, collection: str, key: Hashable) -> Optional[Item]:
+        """
+        Get an item by primary key, batched with the other loads of this tick
+        :return: the item, None if it does not exist or is not readable
+        """
+        return (await self.load_many(collection, [key]))[0]
+
+    async def load_many(
+        self, collection: str, keys: Iterable[Hashable]
+    ) -> list[Optional[Item]]:
+        """
+        Get items by primary key, batched with the other loads of this tick
+        :return: the items in the order of the keys, None for missing items
+        """
+        keys = list(keys)
+        self._enqueue(collection, keys)
+        await self._wait((collection, str(key)) for key in keys)
+        return [self._get(collection, key) for key in keys]
+
+    async def resolve(self, items: list[Item], relations: dict[str, str]) -> list[Item]:
+        """
+        Replace the keys in relational fields of items with the related items,
+        reading all of them in a few batched requests
+        :param items: e.g. a page of files
+        :param relations: the related collection per field,
+          e.g. {"folder": "directus_folders", "uploaded_by": "directus_users"}
+        :return: copies of the items, unknown keys are replaced with None
+        """
+        refs = set()
+        for field, collection in relations.items():
+            keys = [key for item in items for key in _relation_keys(item.get(field))]
+            self._enqueue(collection, keys)
+            refs.update((collection, str(key)) for key in keys)
+
+        await self._wait(refs)
+        return self._resolved(items, relations)
@@ -0,0 +1,449 @@
+import re
+from datetime import date, datetime, timedelta, timezone
+from functools import cmp_to_key
+from typing import Any, Callable, Iterable, Optional
+
+from .models import Filter, Item, Query
+from .pagination import page_offset
+
+Predicate = Callable[[Any], bool]
+
+_NOW = re.compile(r"^\$NOW(?:\(\s*([+-]?\d+)\s*(\w+?)s?\s*\))?$")
+_FUNCTION = re.compile(r"^(\w+)\((\w+)\)$")
+_UNITS = {
+    "second": timedelta(seconds=1),
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+
+def _parse_datetime(value: Any) -> Any:
+    """
+    Parse ISO 8601 strings, so dates compare chronologically with $NOW
+    """
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    return value
+
+
+def _resolve_variable(value: Any) -> Any:
+    if not isinstance(value, str) or not value.startswith("$"):
+        return value
+
+    match = _NOW.match(value)
+    if match:
+        now = datetime.now(timezone.utc)
+        amount, unit = match.groups()
+        if amount is None:
+            return now
+        if unit not in _UNITS:
+            raise ValueError(f"Unsupported $NOW adjustment {value!r}!")
+        return now + int(amount) * _UNITS[unit]
+
+    raise ValueError(f"Dynamic variable {value!r} cannot be evaluated locally!")
+
+
+def _coerce(expected: Any, value: Any) -> Any:
+    """
+    Cast a filter value to the type of the item value, like the server casts
+    filter values to the type of the field
+    """
+    if isinstance(expected, datetime):
+        return _parse_datetime(value)
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(expected, bool):
+        return value in ("true", "1", 1) if isinstance(value, (str, int)) else value
+    if isinstance(expected, (int, float)) and isinstance(value, str):
+        try:
+            return type(expected)(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return value
+    if isinstance(expected, str) and isinstance(value, (int, float)):
+        return str(value)
+    return value
+
+
+def _comparable(filter_value: Any) -> Callable[[Any], tuple[Any, Any]]:
+    filter_value = _resolve_variable(filter_value)
+
+    def pair(value: Any) -> tuple[Any, Any]:
+        if isinstance(filter_value, datetime):
+            return _parse_datetime(value), filter_value
+        return value, _coerce(value, filter_value)
+
+    return pair
+
+
+def _as_list(value: Any) -> list:
+    if isinstance(value, str):
+        return value.split(",")
+    return list(value or [])
+
+
+def _compare(op: Callable[[Any, Any], bool], filter_value: Any) -> Predicate:
+    pair = _comparable(filter_value)
+
+    def predicate(value: Any) -> bool:
+        if value is None:
+            return False
+        try:
+            return op(*pair(value))
+        except TypeError:
+            return False
+
+    return predicate
+
+
+def _strings(
+    op: Callable[[str, str], bool], filter_value: Any, lower: bool = False
+) -> Predicate:
+    needle = str(filter_value).lower() if lower else str(filter_value)
+
+    def predicate(value: Any) -> bool:
+        if value is None:
+            return False
+        if isinstance(value, list):
+            # csv and json array fields
+            return any(predicate(v) for v in value)
+        haystack = str(value).lower() if lower else str(value)
+        return op(haystack, needle)
+
+    return predicate
+
+
+def _negate(predicate: Predicate) -> Predicate:
+    # like SQL, negated comparisons never match null
+    return lambda value: value is not None and not predicate(value)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _operator(operator: str, filter_value: Any) -> Predicate:
+    if operator == "_eq":
+        if filter_value is None:
+            return lambda value: value is None
+        return _compare(lambda a, b: a == b, filter_value)
+    if operator == "_neq":
+        if filter_value is None:
+            return lambda value: value is not None
+        return _negate(_compare(lambda a, b: a == b, filter_value))
+    if operator == "_lt":
+        return _compare(lambda a, b: a < b, filter_value)
+    if operator == "_lte":
+        return _compare(lambda a, b: a <= b, filter_value)
+    if operator == "_gt":
+        return _compare(lambda a, b: a > b, filter_value)
+    if operator == "_gte":
+        return _compare(lambda a, b: a >= b, filter_value)
+    if operator in ("_in", "_nin"):
+        checks = [_compare(lambda a, b: a == b, v) for v in _as_list(filter_value)]
+        predicate = lambda value: any(check(value) for check in checks)  # noqa: E731
+        return predicate if operator == "_in" else _negate(predicate)
+    if operator in ("_between", "_nbetween"):
+        low, high = _as_list(filter_value)
+        above = _compare(lambda a, b: a >= b, low)
+        below = _compare(lambda a, b: a <= b, high)
+        predicate = lambda value: above(value) and below(value)  # noqa: E731
+        return predicate if operator == "_between" else _negate(predicate)
+    if operator in ("_null", "_nnull"):
+        expected = (operator == "_null") == _coerce(True, filter_value)
+        return lambda value: (value is None) == expected
+    if operator in ("_empty", "_nempty"):
+        expected = (operator == "_empty") == _coerce(True, filter_value)
+        return lambda value: _is_empty(value) == expected
+    if operator == "_regex":
+        pattern = re.compile(str(filter_value).strip("/"))
+        return lambda value: value is not None and bool(pattern.search(str(value)))
+
+    string_operators = {
+        "contains": lambda haystack, needle: needle in haystack,
+        "starts_with": str.startswith,
+        "ends_with": str.endswith,
+    }
+    match = re.match(r"^_(n?)(i?)(contains|starts_with|ends_with)$", operator)
+    if match:
+        negated, insensitive, name = match.groups()
+        predicate = _strings(string_operators[name], filter_value, bool(insensitive))
+        return _negate(predicate) if negated else predicate
+
+    raise ValueError(f"Filter operator {operator} cannot be evaluated locally!")
+
+
+def _field_value(item: Any, field: str) -> Any:
+    if not isinstance(item, dict):
+        return None
+
+    match = _FUNCTION.match(field)
+    if not match:
+        return item.get(field)
+
+    function, name = match.groups()
+    value = item.get(name)
+    if value is None:
+        return None
+    if function == "count":
+        return len(value) if isinstance(value, (list, dict)) else None
+
+    value = _parse_datetime(value)
+    if not isinstance(value, datetime):
+        return None
+    if function == "weekday":
+        # Sunday is 0, like the server
+        return (value.weekday() + 1) % 7
+    if function == "week":
+        return value.isocalendar()[1]
+    if function in ("year", "month", "day", "hour", "minute", "second"):
+        return getattr(value, function)
+
+    raise ValueError(f"Function {function} cannot be evaluated locally!")
+
+
+def _field_predicate(condition: dict) -> Predicate:
+    """
+    Compile the condition on a single field: operators and nested relational filters
+    """
+    checks = []
+
+    for key, filter_value in condition.items():
+        if key in ("_some", "_none"):
+            nested = compile_filter(filter_value)
+            if key == "_some":
+                checks.append(lambda value, f=nested: any(map(f, _related(value))))
+            else:
+                checks.append(lambda value, f=nested: not any(map(f, _related(value))))
+        elif key.startswith("_") and key not in ("_and", "_or"):
+            checks.append(_operator(key, filter_value))
+        else:
+            # filter on a field of a related item
+            nested = compile_filter({key: filter_value})
+            checks.append(lambda value, f=nested: any(map(f, _related(value))))
+
+    return lambda value: all(check(value) for check in checks)
+
+
+def _related(value: Any) -> list:
+    """
+    Related items: one for many-to-one relations, a list for one-to-many ones
+    """
+    if isinstance(value, list):
+        return value
+    return [value] if isinstance(value, dict) else []
+
+
+def compile_filter(filter: Optional[Filter]) -> Predicate:
+    """
+    Compile a Directus filter into a predicate for items, e.g. to filter cached or
+    mirrored data. Relational filters require the related items in the data.
+    :param filter: the filter, see pydirectus.models.Filter
+    :return: callable that returns whether an item matches
+    """
+    if not filter:
+        return lambda item: True
+
+    checks = []
+    for key, condition in filter.items():
+        if key == "_and":
+            parts = [compile_filter(f) for f in condition]
+            checks.append(lambda item, p=parts: all(check(item) for check in p))
+        elif key == "_or":
+            parts = [compile_filter(f) for f in condition]
+            checks.append(lambda item, p=parts: any(check(item) for check in p))
+        elif isinstance(condition, dict):
+            predicate = _field_predicate(condition)
+            checks.append(lambda item, k=key, p=predicate: p(_field_value(item, k)))
+        else:
+            raise ValueError(f"Invalid filter for field {key}: {condition!r}")
+
+    if len(checks) == 1:
+        return checks[0]
+    return lambda item: all(check(item) for check in checks)
+
+
+def _path_value(item: Any, path: str) -> Any:
+    for field in path.split("."):
+        item = _field_value(item, field)
+    return item
+
+
+def _compare_values(a: Any, b: Any, nulls_first: bool = False) -> int:
+    if a is None or b is None:
+        result = (a is not None) - (b is not None)
+        return result if nulls_first else -result
+    try:
+        return (a > b) - (a < b)
+    except TypeError:
+        return (str(a) > str(b)) - (str(a) < str(b))
+
+
+def compile_sort(
+    sort: Optional[Iterable[str]], nulls_first: bool = False
+) -> Callable[[list], list]:
+    """
+    Compile a Directus sort into a function sorting a list of items
+    :param sort: fields, prefixed with "-" for descending order
+    :param nulls_first: whether nulls sort before other values in ascending order,
+      descending order reverses it. The default sorts nulls last like PostgreSQL,
+      SQLite and MySQL sort nulls first.
+    """
+    keys = [(s.lstrip("-"), s.startswith("-")) for s in sort or []]
+    if not keys:
+        return list
+
+    def compare(a: Any, b: Any) -> int:
+        for path, descending in keys:
+            result = _compare_values(
+                _path_value(a, path), _path_value(b, path), nulls_first
+            )
+            if result:
+                return -result if descending else result
+        return 0
+
+    return lambda items: sorted(items, key=cmp_to_key(compare))
+
+
+def _field_tree(fields: Iterable[str]) -> dict:
+    tree: dict = {}
+    for field in fields:
+        node = tree
+        *parents, leaf = field.split(".")
+        for parent in parents:
+            node = node.setdefault(parent, {})
+            if node is True:
+                break
+        else:
+            node.setdefault(leaf, True)
+    return tree
+
+
+def _project(value: Any, tree: dict) -> Any:
+    if isinstance(value, list):
+        return [_project(v, tree) for v in value]
+    if not isinstance(value, dict):
+        return value
+
+    result = {}
+    for key, v in value.items():
+        subtree = tree.get(key, True if "*" in tree else None)
+        if subtree is not None:
+            result[key] = v if subtree is True else _project(v, subtree)
+    return result
+
+
+def compile_fields(fields: Optional[Iterable[str]]) -> Callable[[Item], Item]:
+    """
+    Compile a Directus fields list into a projection of items
+    :param fields: fields like "title", "*" or "author.name"
+    """
+    fields = list(fields or [])
+    if not fields or fields == ["*"]:
+        return lambda item: item
+
+    tree = _field_tree(fields)
+    return lambda item: _project(item, tree)
+
+
+def _search_predicate(search: str) -> Predicate:
+    needle = search.lower()
+
+    def predicate(item: Any) -> bool:
+        for value in item.values():
+            if isinstance(value, str) and needle in value.lower():
+                return True
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                if str(value) == search:
+                    return True
+        return False
+
+    return predicate
+
+
+class LocalQuery:
+    def __init__(
+        self,
+        query: Optional[Query] = None,
+        default_limit: Optional[int] = 100,
+        nulls_first: bool = False,
+    ):
+        """
+        A Directus query compiled once for evaluation on items in memory, e.g. on
+        cached or mirrored data. Supports filter, search, sort, limit, offset, page
+        and fields. A page replaces the offset and requires a positive limit, like on
+        the server.
+        :param query: the query, see pydirectus.models.Query
+        :param default_limit: the limit applied without one in the query, like the
+          server's QUERY_LIMIT_DEFAULT. None returns all items.
+        :param nulls_first: whether nulls sort first in ascending order, match it to
+          the database of the server. Nulls sort last by default like PostgreSQL,
+          pass True for SQLite and MySQL.
+        """
+        query = dict(query or {})
+        unsupported = set(query) - {
+            "filter",
+            "search",
+            "sort",
+            "limit",
+            "offset",
+            "page",
+            "fields",
+        }
+        if unsupported:
+            raise ValueError(f"{sorted(unsupported)} cannot be evaluated locally!")
+
+        self.query = query
+        self._filter = compile_filter(query.get("filter"))
+        self._search = (
+            _search_predicate(query["search"]) if query.get("search") else None
+        )
+        self._sort = compile_sort(query.get("sort"), nulls_first)
+        self._fields = compile_fields(query.get("fields"))
+
+        limit = query.get("limit", default_limit)
+        self._limit = None if limit is None or limit < 0 else limit
+        self._offset = page_offset(limit, query.get("offset"), query.get("page"))
+
+    def matches(self, item: Item) -> bool:
+        """
+        Whether an item matches the filter and search of the query
+        """
+        return self._filter(item) and (self._search is None or self._search(item))
+
+    def run(self, items: Iterable[Item]) -> list[Item]:
+        """
+        Evaluate the query
+        :param items: the items of the collection
+        :return: the matching items, sorted, paginated and projected
+        """
+        matching = self._sort([item for item in items if self.matches(item)])
+
+        end = None if self._limit is None else self._offset + self._limit
+        return [self._fields(item) for item in matching[self._offset : end]]
+
+
+def run_query(
+    items: Iterable[Item],
+    query: Optional[Query] = None,
+    default_limit: Optional[int] = 100,
+    nulls_first: bool = False,
+) -> list[Item]:
+    """
+    Evaluate a query on items in memory, see LocalQuery
+    """
+    return LocalQuery(query, default_limit, nulls_first).run(items)
@@ -0,0 +1,436 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import partial
+from typing import TYPE_CHECKING, ContextManager, Iterable, Iterator, Optional, Union
+
+from .batch import chunk_rows
+from .local_query import LocalQuery
+from .models import Item, Query
+from .pagination import iter_keyset_pages
+
+if TYPE_CHECKING:
+    from .directus import DirectusClient
+
+CHANGE_ACTIONS = ("create", "update", "delete")
+
+
+class MirrorStore(ABC):
+    """
+    Local storage of mirrored collections and their activity watermarks.
+    Subclass it to plug in another database.
+    """
+
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """
+        Group the writes of a sync step, they are applied together or not at all.
+        The SyncEngine keeps transactions short, no requests are sent within them.
+        """
+
+    @abstractmethod
+    def get_watermark(self, collection: str) -> Optional[int]: ...
+
+    @abstractmethod
+    def set_watermark(self, collection: str, activity_id: int) -> None: ...
+
+    @abstractmethod
+    def get_load_cursor(self, collection: str) -> Optional[dict]:
+        """
+        The progress of an unfinished initial load, see set_load_cursor
+        """
+
+    @abstractmethod
+    def set_load_cursor(self, collection: str, cursor: Optional[dict]) -> None:
+        """
+        Save the progress of an initial load, None removes it
+        :param cursor: a JSON-serializable dict
+        """
+
+    @abstractmethod
+    def upsert(self, collection: str, items: Iterable[tuple[str, Item]]) -> None: ...
+
+    @abstractmethod
+    def delete(self, collection: str, keys: Iterable[str]) -> None: ...
+
+    @abstractmethod
+    def clear(self, collection: str) -> None:
+        """
+        Remove the items, the watermark and the load cursor of a collection
+        """
+
+
+class SQLiteMirror(MirrorStore):
+    def __init__(self, path: Union[str, os.PathLike] = ":memory:"):
+        """
+        Mirror in a SQLite database, one table per collection with the items stored as JSON
+        :param path: path of the database file
+        """
+        self.path = str(path)
+
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS _watermarks "
+            "(collection TEXT PRIMARY KEY, activity_id INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS _load_cursors "
+            "(collection TEXT PRIMARY KEY, cursor TEXT NOT NULL)"
+        )
+
+    @staticmethod
+    def _table(collection: str) -> str:
+        return '"items_' + collection.replace('"', '""') + '"'
+
+    def _ensure_table(self, collection: str) -> str:
+        table = self._table(collection)
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        return table
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                yield
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def get_watermark(self, collection: str) -> Optional[int]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT activity_id FROM _watermarks WHERE collection = ?",
+                (collection,),
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def set_watermark(self, collection: str, activity_id: int) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO _watermarks VALUES (?, ?)",
+                (collection, activity_id),
+            )
+
+    def get_load_cursor(self, collection: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT cursor FROM _load_cursors WHERE collection = ?",
+                (collection,),
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def set_load_cursor(self, collection: str, cursor: Optional[dict]) -> None:
+        with self._lock:
+            if cursor is None:
+                self._connection.execute(
+                    "DELETE FROM _load_cursors WHERE collection = ?", (collection,)
+                )
+            else:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO _load_cursors VALUES (?, ?)",
+                    (collection, json.dumps(cursor)),
+                )
+
+    def upsert(self, collection: str, items: Iterable[tuple[str, Item]]) -> None:
+        with self._lock:
+            table = self._ensure_table(collection)
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO {table} VALUES (?, ?)",
+                ((key, json.dumps(item)) for key, item in items),
+            )
+
+    def delete(self, collection: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            table = self._ensure_table(collection)
+            self._connection.executemany(
+                f"DELETE FROM {table} WHERE key = ?", ((key,) for key in keys)
+            )
+
+    def clear(self, collection: str) -> None:
+        with self._lock:
+            self._connection.execute(f"DELETE FROM {self._ensure_table(collection)}")
+            self._connection.execute(
+                "DELETE FROM _watermarks WHERE collection = ?", (collection,)
+            )
+            self._connection.execute(
+                "DELETE FROM _load_cursors WHERE collection = ?", (collection,)
+            )
+
+    def get(self, collection: str, key: str) -> Optional[Item]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT data FROM {self._ensure_table(collection)} WHERE key = ?",
+                (str(key),),
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def items(self, collection: str) -> list[Item]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT data FROM {self._ensure_table(collection)}"
+            ).fetchall()
+
+        return [json.loads(row[0]) for row in rows]
+
+    def query(
+        self,
+        collection: str,
+        query: Optional[Query] = None,
+        default_limit: Optional[int] = None,
+        nulls_first: bool = False,
+    ) -> list[Item]:
+        """
+        Evaluate a Directus query on the mirrored items, see LocalQuery
+        :param collection: the collection name
+        :param query: the query (filter, search, sort, limit, offset, page, fields)
+        :param default_limit: the limit applied without one in the query, all items by default
+        :param nulls_first: whether nulls sort first in ascending order, last by default
+        """
+        return LocalQuery(query, default_limit, nulls_first).run(self.items(collection))
+
+    def count(self, collection: str) -> int:
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT COUNT(*) FROM {self._ensure_table(collection)}"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class SyncStats:
+    def __init__(self, collection: str, initial: bool = False):
+        """
+        Outcome of syncing a collection
+        :param collection: the collection name
+        :param initial: whether the collection was bulk loaded
+        """
+        self.collection = collection
+        self.initial = initial
+        self.activities = 0
+        self.upserted = 0
+        self.deleted = 0
+        self.watermark: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"SyncStats(collection={self.collection!r}, initial={self.initial}, "
+            f"activities={self.activities}, upserted={self.upserted}, "
+            f"deleted={self.deleted}, watermark={self.watermark})"
+        )
+
+
+class SyncEngine:
+    def __init__(
+        self,
+        client: "DirectusClient",
+        collections: Union[Iterable[str], dict[str, Optional[Query]]],
+        store: Union[MirrorStore, str, os.PathLike],
+        primary_keys: Optional[dict[str, str]] = None,
+        page_size: int = 1000,
+        batch_size: int = 100,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Keeps a local mirror of collections up to date. The first sync bulk loads
+        a collection, later syncs tail the activity log from the last seen activity
+        and re-read only the changed items. Reading the activity log requires
+        the corresponding permissions (usually an admin token).
+        :param client: the DirectusClient to read with
+        :param collections: collection names, or a dict of collection names and a query
+          (filter, fields) that selects the mirrored items
+        :param store: a MirrorStore, or the path of a SQLiteMirror
+        :param primary_keys: the primary key field per collection, "id" by default
+        :param page_size: the number of items fetched per request during bulk loads
+        :param batch_size: the number of changed items fetched per request with an _in filter
+        """
+        self.client = client
+        self.collections = (
+            dict(collections)
+            if isinstance(collections, dict)
+            else {collection: None for collection in collections}
+        )
+        self.store = store if isinstance(store, MirrorStore) else SQLiteMirror(store)
+        self.primary_keys = primary_keys or {}
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self._logger = logger or logging.getLogger(__name__)
+
+    def _primary_key(self, collection: str) -> str:
+        return self.primary_keys.get(collection, "id")
+
+    def _query(self, collection: str) -> Query:
+        """
+        The query of a collection, with the primary key always selected
+        """
+        query = dict(self.collections.get(collection) or {})
+        primary_key = self._primary_key(collection)
+
+        fields = query.get("fields")
+        if fields and primary_key not in fields and "*" not in fields:
+            query["fields"] = [*fields, primary_key]
+
+        return query
+
+    def _latest_activity_id(self) -> int:
+        latest = self.client.read_activities(
+            {"fields": ["id"], "sort": ["-id"], "limit": 1}
+        )
+        return latest[0]["id"] if latest else 0
+
+    def sync(self) -> list[SyncStats]:
+        """
+        Sync all collections
+        :return: a SyncStats per collection
+        """
+        return [self.sync_collection(collection) for collection in self.collections]
+
+    def sync_collection(self, collection: str) -> SyncStats:
+        """
+        Bulk load a collection on the first call, apply its changes afterwards
+        :param collection: the collection name
+        """
+        if self.store.get_watermark(collection) is None:
+            return self.initial_load(collection)
+
+        return self.apply_changes(collection)
+
+    def initial_load(self, collection: str) -> SyncStats:
+        """
+        Replace the mirror of a collection with a full read. The pages are stored
+        one transaction each together with the load cursor, an interrupted load
+        resumes after the last stored page on the next sync.
+        :param collection: the collection name
+        """
+        stats = SyncStats(collection, initial=True)
+        primary_key = self._primary_key(collection)
+        query = self._query(collection)
+
+        cursor = self.store.get_load_cursor(collection)
+        if cursor is None:
+            # changes made during the load are replayed by the next sync
+            cursor = {"watermark": self._latest_activity_id(), "last_key": None}
+            with self.store.transaction():
+                self.store.clear(collection)
+                self.store.set_load_cursor(collection, cursor)
+        elif cursor["last_key"] is not None:
+            key_filter = {primary_key: {"_gt": cursor["last_key"]}}
+            query["filter"] = (
+                {"_and": [query["filter"], key_filter]}
+                if query.get("filter")
+                else key_filter
+            )
+        stats.watermark = cursor["watermark"]
+
+        pages = iter_keyset_pages(
+            partial(self.client.read_items, collection),
+            query,
+            page_size=self.page_size,
+            key=primary_key,
+        )
+        # the pages are fetched outside of the transactions
+        for page in pages:
+            cursor["last_key"] = page[-1][primary_key]
+            with self.store.transaction():
+                self.store.upsert(
+                    collection, ((str(item[primary_key]), item) for item in page)
+                )
+                self.store.set_load_cursor(collection, cursor)
+            stats.upserted += len(page)
+
+        with self.store.transaction():
+            self.store.set_watermark(collection, stats.watermark)
+            self.store.set_load_cursor(collection, None)
+
+        self._logger.info("%s", stats)
+        return stats
+
+    def _changed_keys(self, collection: str, watermark: int) -> tuple[dict, int, int]:
+        """
+        Tail the activity log of a collection
+        :return: the last action per item key, the number of activities and the new watermark
+        """
+        actions = {}
+        count = 0
+
+        for activity in self.client.iter_activities(
+            {
+                "fields": ["id", "action", "item"],
+                "filter": {
+                    "_and": [
+                        {"collection": {"_eq": collection}},
+                        {"id": {"_gt": watermark}},
+                    ]
+                },
+            },
+            page_size=self.page_size,
+        ):
+            watermark = activity["id"]
+            count += 1
+            if activity["action"] in CHANGE_ACTIONS:
+                actions[str(activity["item"])] = activity["action"]
+
+        return actions, count, watermark
+
+    def apply_changes(self, collection: str) -> SyncStats:
+        """
+        Apply the changes logged since the last sync to the mirror of a collection
+        :param collection: the collection name
+        """
+        stats = SyncStats(collection)
+        primary_key = self._primary_key(collection)
+        query = self._query(collection)
+
+        actions, stats.activities, stats.watermark = self._changed_keys(
+            collection, self.store.get_watermark(collection)
+        )
+        deleted = [key for key, action in actions.items() if action == "delete"]
+        changed = [key for key, action in actions.items() if action != "delete"]
+
+        # the batches are fetched outside of the transactions. If the sync is
+        # interrupted, the watermark is not advanced and the next sync re-reads them
+        for keys in chunk_rows(changed, chunk_size=self.batch_size):
+            key_filter = {primary_key: {"_in": keys}}
+            items = self.client.read_items(
+                collection,
+                {
+                    **query,
+                    "filter": (
+                        {"_and": [query["filter"], key_filter]}
+                        if query.get("filter")
+                        else key_filter
+                    ),
+                    "limit": -1,
+                },
+            )
+            found = {str(item[primary_key]): item for item in items}
+
+            with self.store.transaction():
+                self.store.upsert(collection, found.items())
+            stats.upserted += len(found)
+
+            # deleted since, or no longer matching the filter of the mirror
+            deleted.extend(key for key in keys if key not in found)
+
+        with self.store.transaction():
+            self.store.delete(collection, deleted)
+            stats.deleted = len(deleted)
+            self.store.set_watermark(collection, stats.watermark)
+
+        self._logger.info("%s", stats)
+        return stats
@@ -4,3 +4,6 @@ from .item import Item
 from .file import File
 from .folder import Folder
 from .activity import Activity
+from .asset import AssetQuery
+from .revision import Revision
+from .aggregate import Aggregate, AggregateResult
@@ -0,0 +1,30 @@
+from typing import TypedDict
+
+# Implementation based on https://github.com/directus/directus/blob/main/packages/types/src/query.ts
+
+
+class Aggregate(TypedDict, total=False):
+    # Fields per aggregate function, "*" counts rows
+    count: str | list[str]
+    countDistinct: str | list[str]
+    countAll: str | list[str]
+    sum: str | list[str]
+    sumDistinct: str | list[str]
+    avg: str | list[str]
+    avgDistinct: str | list[str]
+    min: str | list[str]
+    max: str | list[str]
+
+
+class AggregateResult(TypedDict, total=False):
+    # Per function the aggregated value per field, e.g. {"sum": {"price": 120.5}}.
+    # count "*" and countAll are plain numbers. Grouped results also contain the group fields.
+    count: int | dict[str, int]
+    countDistinct: dict[str, int]
+    countAll: int
+    sum: dict[str, int | float | None]
+    sumDistinct: dict[str, int | float | None]
+    avg: dict[str, int | float | None]
+    avgDistinct: dict[str, int | float | None]
+    min: dict
+    max: dict
@@ -0,0 +1,24 @@
+from typing import Literal, TypedDict
+
+# Implementation based on https://docs.directus.io/reference/files.html#requesting-a-thumbnail
+
+
+class AssetQuery(TypedDict, total=False):
+    # Key of a storage asset preset.
+    key: str
+    # Width of the thumbnail in pixels.
+    width: int
+    # Height of the thumbnail in pixels.
+    height: int
+    # How the image should fit into the provided dimensions.
+    fit: Literal["cover", "contain", "inside", "outside"]
+    # Quality of the thumbnail (1 to 100).
+    quality: int
+    # Disable image up-scaling.
+    withoutEnlargement: bool
+    # Output format of the thumbnail.
+    format: Literal["auto", "jpg", "png", "webp", "tiff", "avif"]
+    # Additional sharp transformations, e.g. [["rotate", 90], ["blur", 10]].
+    transforms: list[list]
+    # Force the browser to download the file (Content-Disposition: attachment).
+    download: bool
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import TypedDict
 
+from .aggregate import Aggregate
 from .filter import Filter
 
 
@@ -18,6 +19,8 @@ class Query(TypedDict):
     page: int | None
     deep: NestedDeepQuery | None
     alias: dict | None
+    aggregate: Aggregate | None
+    groupBy: list[str] | None
 
 
 class DeepQuery(TypedDict):
@@ -28,8 +31,8 @@ class DeepQuery(TypedDict):
     _offset: int | None
     _page: int | None
     _search: int | None
-    # _group: list[str] | None
-    # _aggregate: any | None
+    _aggregate: Aggregate | None
+    _groupBy: list[str] | None
 
 
 # Python 3.12: type NestedDeepQuery = dict[str, DeepQuery | "NestedDeepQuery"]
@@ -0,0 +1,18 @@
+from typing import TypedDict
+
+
+class Revision(TypedDict):
+    # Unique identifier for the revision.
+    id: int
+    # Unique identifier for the activity record. Many-to-one to activity.
+    activity: int | dict
+    # Collection of the updated item.
+    collection: str
+    # Primary key of updated item.
+    item: str
+    # Copy of item state at time of update.
+    data: dict | None
+    # Changes between the previous and the current revision.
+    delta: dict | None
+    # If the current item was updated relationally, this is the id of the parent revision record
+    parent: int | None
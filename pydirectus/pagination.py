@@ -0,0 +1,430 @@
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import takewhile
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Mapping, Optional
+
+from .models import Query
+
+
+def page_offset(
+    limit: Optional[int], offset: Optional[int] = None, page: Optional[int] = None
+) -> int:
+    """
+    Resolve the offset of a query like Directus does, a page replaces the offset
+    :param limit: the limit of the query, a page requires a positive limit
+    :param offset: the offset of the query
+    :param page: the page of the query, starting at 1
+
+    :return: the offset
+    """
+    if page is None:
+        return offset or 0
+    if page < 1:
+        raise ValueError(f"page has to be a positive integer, got {page!r}!")
+    if limit is None or limit < 1:
+        raise ValueError(f"page requires a positive limit, got {limit!r}!")
+    return (page - 1) * limit
+
+
+def page_queries(query: Optional[Query], page_size: int) -> Iterator[Query]:
+    """
+    Split a query into consecutive page queries using limit and offset.
+    The limit of the given query caps the total number of items, an offset or page
+    of the given query sets the starting point. A page replaces the offset and
+    requires a positive limit.
+    :param query: the query to paginate
+    :param page_size: the number of items per page
+
+    :return: iterator of page queries
+    """
+    if page_size < 1:
+        raise ValueError("page_size has to be a positive integer!")
+
+    query = dict(query or {})
+    limit = query.pop("limit", None)
+    offset = page_offset(limit, query.pop("offset", None), query.pop("page", None))
+    remaining = limit if limit is not None and limit >= 0 else None
+
+    while remaining is None or remaining > 0:
+        page_limit = page_size if remaining is None else min(page_size, remaining)
+        yield {**query, "limit": page_limit, "offset": offset}
+
+        offset += page_limit
+        if remaining is not None:
+            remaining -= page_limit
+
+
+def keyset_base_query(query: Optional[Query], key: str) -> tuple[Query, Optional[int]]:
+    """
+    Prepare a query for keyset pagination on a unique field
+    :param query: the query to paginate, it must not contain an offset or page
+    :param key: the unique field to paginate on, prefixed with "-" for descending order
+
+    :return: the base query and the total limit (None for no limit)
+    """
+    query = dict(query or {})
+
+    if query.get("offset") or query.get("page"):
+        raise ValueError("Keyset pagination cannot be combined with offset or page!")
+    if query.get("sort") and list(query["sort"]) != [key]:
+        raise ValueError(f"Keyset pagination sorts on {key!r}, got {query['sort']!r}!")
+
+    field = key.lstrip("-")
+    fields = query.get("fields")
+    if fields and field not in fields and "*" not in fields:
+        query["fields"] = [*fields, field]
+
+    limit = query.pop("limit", None)
+    query.pop("offset", None)
+    query.pop("page", None)
+    query["sort"] = [key]
+
+    return query, limit if limit is not None and limit >= 0 else None
+
+
+def keyset_page_query(
+    base_query: Query, key: str, last_value: Any, page_limit: int
+) -> Query:
+    """
+    Build the query for the page after the item with key value last_value
+    :param base_query: query prepared by keyset_base_query
+    :param key: the unique field to paginate on, prefixed with "-" for descending order
+    :param last_value: value of the key of the last seen item, None for the first page
+    :param page_limit: the number of items of the page
+
+    :return: page query
+    """
+    page_query = {**base_query, "limit": page_limit}
+
+    if last_value is not None:
+        operator = "_lt" if key.startswith("-") else "_gt"
+        cursor_filter = {key.lstrip("-"): {operator: last_value}}
+        user_filter = base_query.get("filter")
+
+        page_query["filter"] = (
+            {"_and": [user_filter, cursor_filter]} if user_filter else cursor_filter
+        )
+
+    return page_query
+
+
+def _key_value(item: Any, field: str) -> Any:
+    # pages hold dicts, or records when they are decoded with a record_type
+    return item[field] if isinstance(item, Mapping) else getattr(item, field)
+
+
+def iter_keyset_pages(
+    fetch_page: Callable[[Query], list],
+    query: Optional[Query] = None,
+    page_size: int = 100,
+    key: str = "id",
+) -> Iterator[list]:
+    """
+    Lazily fetch the pages of a query with keyset pagination. Every page is
+    selected with a filter on the key instead of an offset, so the cost of a page
+    does not grow with the depth of the scan.
+    :param fetch_page: callable that returns the items for a page query
+    :param query: the query to paginate
+    :param page_size: the number of items per page
+    :param key: the unique field to paginate on, prefixed with "-" for descending order
+
+    :return: iterator of pages
+    """
+    if page_size < 1:
+        raise ValueError("page_size has to be a positive integer!")
+
+    base_query, remaining = keyset_base_query(query, key)
+    field = key.lstrip("-")
+    last_value = None
+
+    while remaining is None or remaining > 0:
+        page_limit = page_size if remaining is None else min(page_size, remaining)
+        page = fetch_page(keyset_page_query(base_query, key, last_value, page_limit))
+
+        if page:
+            yield page
+        if len(page) < page_limit:
+            return
+
+        last_value = _key_value(page[-1], field)
+        if remaining is not None:
+            remaining -= page_limit
+
+
+def iter_pages(
+    fetch_page: Callable[[Query], list],
+    query: Optional[Query] = None,
+    page_size: int = 100,
+    prefetch: bool = False,
+) -> Iterator[list]:
+    """
+    Lazily fetch the pages of a query until a page comes back incomplete
+    :param fetch_page: callable that returns the items for a page query
+    :param query: the query to paginate
+    :param page_size: the number of items per page
+    :param prefetch: fetch the next page in a background thread while the current one is consumed
+
+    :return: iterator of pages
+    """
+    queries = page_queries(query, page_size)
+
+    if not prefetch:
+        for page_query in queries:
+            page = fetch_page(page_query)
+            if page:
+                yield page
+            if len(page) < page_query["limit"]:
+                return
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page_query = next(queries, None)
+        future = executor.submit(fetch_page, page_query) if page_query else None
+
+        try:
+            while future is not None:
+                page = future.result()
+
+                future = None
+                if len(page) >= page_query["limit"]:
+                    page_query = next(queries, None)
+                    if page_query:
+                        future = executor.submit(fetch_page, page_query)
+
+                if page:
+                    yield page
+        finally:
+            if future is not None:
+                future.cancel()
+
+
+async def aiter_pages(
+    fetch_page: Callable[[Query], Awaitable[list]],
+    query: Optional[Query] = None,
+    page_size: int = 100,
+    prefetch: bool = False,
+) -> AsyncIterator[list]:
+    """
+    Async counterpart of iter_pages
+    :param fetch_page: coroutine function that returns the items for a page query
+    :param query: the query to paginate
+    :param page_size: the number of items per page
+    :param prefetch: fetch the next page in a background task while the current one is consumed
+
+    :return: async iterator of pages
+    """
+    queries = page_queries(query, page_size)
+    page_query = next(queries, None)
+    task = asyncio.ensure_future(fetch_page(page_query)) if page_query else None
+
+    try:
+        while task is not None:
+            page = await task
+
+            task = None
+            next_query = None
+            if len(page) >= page_query["limit"]:
+                next_query = next(queries, None)
+                if next_query and prefetch:
+                    task = asyncio.ensure_future(fetch_page(next_query))
+
+            if page:
+                yield page
+
+            if next_query and not prefetch:
+                task = asyncio.ensure_future(fetch_page(next_query))
+            page_query = next_query
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+async def aiter_keyset_pages(
+    fetch_page: Callable[[Query], Awaitable[list]],
+    query: Optional[Query] = None,
+    page_size: int = 100,
+    key: str = "id",
+) -> AsyncIterator[list]:
+    """
+    Async counterpart of iter_keyset_pages
+    :param fetch_page: coroutine function that returns the items for a page query
+    :param query: the query to paginate
+    :param page_size: the number of items per page
+    :param key: the unique field to paginate on, prefixed with "-" for descending order
+
+    :return: async iterator of pages
+    """
+    if page_size < 1:
+        raise ValueError("page_size has to be a positive integer!")
+
+    base_query, remaining = keyset_base_query(query, key)
+    field = key.lstrip("-")
+    last_value = None
+
+    while remaining is None or remaining > 0:
+        page_limit = page_size if remaining is None else min(page_size, remaining)
+        page = await fetch_page(
+            keyset_page_query(base_query, key, last_value, page_limit)
+        )
+
+        if page:
+            yield page
+        if len(page) < page_limit:
+            return
+
+        last_value = _key_value(page[-1], field)
+        if remaining is not None:
+            remaining -= page_limit
+
+
+def iter_parallel_pages(
+    fetch_counted_page: Callable[[Query], tuple[list, Optional[int]]],
+    fetch_page: Callable[[Query], list],
+    query: Optional[Query] = None,
+    page_size: int = 100,
+    workers: int = 4,
+    ordered: bool = True,
+) -> Iterator[list]:
+    """
+    Fetch the pages of a query concurrently in a thread pool. The first page is
+    requested together with the filter count, which determines the remaining pages.
+    At most 2 * workers pages are in flight or buffered at any time.
+    :param fetch_counted_page: callable that returns the items and the filter count for a page query
+    :param fetch_page: callable that returns the items for a page query
+    :param query: the query to paginate
+    :param page_size: the number of items per page
+    :param workers: the number of threads fetching pages
+    :param ordered: yield the pages in order, otherwise as soon as they complete
+
+    :return: iterator of pages
+    """
+    if workers < 1:
+        raise ValueError("workers has to be a positive integer!")
+
+    queries = page_queries(query, page_size)
+    first_query = next(queries)
+    first_page, filter_count = fetch_counted_page(first_query)
+
+    if first_page:
+        yield first_page
+    if len(first_page) < first_query["limit"]:
+        return
+    if filter_count is None:
+        # no count available, continue sequentially
+        for page_query in queries:
+            page = fetch_page(page_query)
+            if page:
+                yield page
+            if len(page) < page_query["limit"]:
+                return
+        return
+
+    remaining = takewhile(
+        lambda page_query: page_query["offset"] < filter_count, queries
+    )
+    window = 2 * workers
+    pending = deque() if ordered else set()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for page_query in remaining:
+                future = executor.submit(fetch_page, page_query)
+                if ordered:
+                    pending.append(future)
+                    if len(pending) >= window:
+                        yield pending.popleft().result()
+                else:
+                    pending.add(future)
+                    if len(pending) >= window:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+
+            while pending:
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+        finally:
+            # the consumer stopped early or a page failed: do not fetch the
+            # queued pages, the executor only waits for the running ones
+            for future in pending:
+                future.cancel()
+
+
+async def aiter_parallel_pages(
+    fetch_counted_page: Callable[[Query], Awaitable[tuple[list, Optional[int]]]],
+    fetch_page: Callable[[Query], Awaitable[list]],
+    query: Optional[Query] = None,
+    page_size: int = 100,
+    workers: int = 4,
+    ordered: bool = True,
+) -> AsyncIterator[list]:
+    """
+    Async counterpart of iter_parallel_pages, with workers concurrent tasks
+    :param fetch_counted_page: coroutine function that returns the items and the filter count for a page query
+    :param fetch_page: coroutine function that returns the items for a page query
+    :param query: the query to paginate
+    :param page_size: the number of items per page
+    :param workers: the number of pages fetched concurrently
+    :param ordered: yield the pages in order, otherwise as soon as they complete
+
+    :return: async iterator of pages
+    """
+    if workers < 1:
+        raise ValueError("workers has to be a positive integer!")
+
+    queries = page_queries(query, page_size)
+    first_query = next(queries)
+    first_page, filter_count = await fetch_counted_page(first_query)
+
+    if first_page:
+        yield first_page
+    if len(first_page) < first_query["limit"]:
+        return
+    if filter_count is None:
+        # no count available, continue sequentially
+        for page_query in queries:
+            page = await fetch_page(page_query)
+            if page:
+                yield page
+            if len(page) < page_query["limit"]:
+                return
+        return
+
+    remaining = takewhile(
+        lambda page_query: page_query["offset"] < filter_count, queries
+    )
+    pending = deque() if ordered else set()
+
+    try:
+        for page_query in remaining:
+            task = asyncio.ensure_future(fetch_page(page_query))
+            if ordered:
+                pending.append(task)
+                if len(pending) >= workers:
+                    yield await pending.popleft()
+            else:
+                pending.add(task)
+                if len(pending) >= workers:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield task.result()
+
+        while pending:
+            if ordered:
+                yield await pending.popleft()
+            else:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,326 @@
+import copy
+import json
+import re
+from collections.abc import Mapping
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+import httpx
+
+from .models import Aggregate, DeepQuery, Filter, Query
+from .models.filter import FieldFilterOperator, FieldValidationOperator
+
+FILTER_OPERATORS = frozenset(FieldFilterOperator.__annotations__) | frozenset(
+    FieldValidationOperator.__annotations__
+)
+# quantifiers of one-to-many relational filters
+RELATIONAL_OPERATORS = frozenset(("_some", "_none"))
+QUERY_KEYS = frozenset(Query.__annotations__)
+DEEP_QUERY_KEYS = frozenset(DeepQuery.__annotations__)
+AGGREGATE_FUNCTIONS = frozenset(Aggregate.__annotations__)
+
+_FUNCTION = re.compile(r"^\w+\((\w+)\)$")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def serialize_params(params: Mapping, dumps: Callable[[Any], str] = _dumps) -> dict:
+    """
+    Encode nested params (filter, deep, alias, ...) as JSON strings, like Directus expects
+    them in the query string. The params are not modified.
+    :param params: A dict of Endpoint Parameters
+    :param dumps: the JSON encoder
+    :return: a new dict of params
+    """
+    return {
+        key: (
+            dumps(value)
+            if isinstance(value, dict)
+            or (
+                isinstance(value, list)
+                and any(isinstance(v, (dict, list)) for v in value)
+            )
+            else value
+        )
+        for key, value in params.items()
+    }
+
+
+class CompiledQuery(Mapping):
+    """
+    Immutable, hashable query whose query string is encoded once. Pass it wherever
+    a Query is accepted: requests reuse the encoded params, and it serves as a
+    stable cache key. Reading it like a dict returns copies of the values.
+    """
+
+    __slots__ = ("_query", "key", "params", "query_string", "_hash")
+
+    def __init__(self, query: Mapping):
+        query = {key: value for key, value in query.items() if value is not None}
+        # round trip to canonicalize the values and detach them from the caller
+        canonical = _dumps(query)
+
+        object.__setattr__(self, "_query", json.loads(canonical))
+        object.__setattr__(self, "key", canonical)
+        object.__setattr__(
+            self, "params", httpx.QueryParams(serialize_params(self._query))
+        )
+        object.__setattr__(self, "query_string", str(self.params))
+        object.__setattr__(self, "_hash", hash(canonical))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("CompiledQuery is immutable")
+
+    def __getitem__(self, key: str) -> Any:
+        return copy.deepcopy(self._query[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._query)
+
+    def __len__(self) -> int:
+        return len(self._query)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompiledQuery):
+            return self.key == other.key
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CompiledQuery({self.query_string!r})"
+
+    def to_query(self) -> Query:
+        """
+        A mutable copy of the query, e.g. to derive another query from it
+        """
+        return copy.deepcopy(self._query)
+
+
+def _field_name(field: str) -> str:
+    """
+    The field a filter or sort refers to, without functions like year(date_created)
+    """
+    match = _FUNCTION.match(field)
+    return match.group(1) if match else field
+
+
+def validate_filter(filter: Filter, fields: Optional[Iterable[str]] = None) -> None:
+    """
+    Check the operators of a filter, and optionally its fields
+    :param filter: the filter, see pydirectus.models.Filter
+    :param fields: the fields of the collection, e.g. from read_fields. Fields of
+      related collections are not checked.
+    :raises ValueError: on unknown operators or fields
+    """
+    allowed = set(fields) if fields is not None else None
+
+    if not isinstance(filter, dict):
+        raise ValueError(f"A filter has to be a dict, got {filter!r}")
+
+    for key, condition in filter.items():
+        if key in ("_and", "_or"):
+            if not isinstance(condition, list):
+                raise ValueError(f"{key} expects a list of filters, got {condition!r}")
+            for part in condition:
+                validate_filter(part, fields)
+            continue
+
+        if key.startswith("_"):
+            raise ValueError(f"Unknown logical operator {key}")
+        if allowed is not None and _field_name(key) not in allowed:
+            raise ValueError(f"Unknown field {key}")
+        if not isinstance(condition, dict):
+            raise ValueError(f"Invalid filter for field {key}: {condition!r}")
+
+        for operator, value in condition.items():
+            if operator in RELATIONAL_OPERATORS:
+                validate_filter(value)
+            elif operator.startswith("_"):
+                if operator not in FILTER_OPERATORS:
+                    raise ValueError(f"Unknown filter operator {operator}")
+            else:
+                # a field of the related collection
+                validate_filter({operator: value})
+
+
+def validate_aggregate(aggregate: Aggregate) -> None:
+    """
+    Check the functions of an aggregate
+    :raises ValueError: on unknown aggregate functions
+    """
+    if not isinstance(aggregate, dict):
+        raise ValueError(f"An aggregate has to be a dict, got {aggregate!r}")
+
+    for function in aggregate:
+        if function not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unknown aggregate function {function}")
+
+
+class QueryBuilder:
+    def __init__(
+        self, query: Optional[Query] = None, fields: Optional[Iterable[str]] = None
+    ):
+        """
+        Fluent builder of Directus queries, validating operators (and fields) while
+        the query is built
+        :param query: a query to start from, it is copied
+        :param fields: the fields of the collection, e.g. [f["field"] for f in read_fields(...)].
+          If given, fields, sort and filter may only refer to these.
+        """
+        self._allowed = set(fields) if fields is not None else None
+        self._query: dict = {}
+
+        for key, value in (query or {}).items():
+            if key not in QUERY_KEYS:
+                raise ValueError(f"Unknown query parameter {key}")
+            if value is not None:
+                method = getattr(self, "group_by" if key == "groupBy" else key)
+                method(*value if key in ("fields", "sort", "groupBy") else (value,))
+
+    def _check_field(self, field: str) -> None:
+        name = _field_name(field.lstrip("-").split(".")[0])
+        if self._allowed is not None and name != "*" and name not in self._allowed:
+            raise ValueError(f"Unknown field {field}")
+
+    def fields(self, *fields: str) -> "QueryBuilder":
+        """
+        Select fields, e.g. "title", "*" or "author.name"
+        """
+        for field in fields:
+            self._check_field(field)
+        self._query["fields"] = [*self._query.get("fields", []), *fields]
+        return self
+
+    def filter(self, filter: Filter) -> "QueryBuilder":
+        """
+        Add a filter, combined with the previous ones by _and
+        """
+        validate_filter(filter, self._allowed)
+        filter = copy.deepcopy(filter)
+
+        current = self._query.get("filter")
+        if current is None:
+            self._query["filter"] = filter
+        elif list(current) == ["_and"]:
+            current["_and"].append(filter)
+        else:
+            self._query["filter"] = {"_and": [current, filter]}
+        return self
+
+    def where(self, field: str, operator: str, value: Any = True) -> "QueryBuilder":
+        """
+        Add a condition on a field, e.g. where("status", "_eq", "published")
+        :param field: the field, or a path to a related field like "author.name"
+        :param operator: a filter operator like "_eq" or "_in"
+        :param value: the value compared with
+        """
+        condition: dict = {operator: value}
+        for part in reversed(field.split(".")):
+            condition = {part: condition}
+        return self.filter(condition)
+
+    def search(self, search: str) -> "QueryBuilder":
+        self._query["search"] = search
+        return self
+
+    def sort(self, *fields: str) -> "QueryBuilder":
+        """
+        Sort by fields, prefixed with "-" for descending order
+        """
+        for field in fields:
+            self._check_field(field)
+        self._query["sort"] = [*self._query.get("sort", []), *fields]
+        return self
+
+    def limit(self, limit: int) -> "QueryBuilder":
+        self._query["limit"] = int(limit)
+        return self
+
+    def offset(self, offset: int) -> "QueryBuilder":
+        self._query["offset"] = int(offset)
+        return self
+
+    def page(self, page: int) -> "QueryBuilder":
+        self._query["page"] = int(page)
+        return self
+
+    def deep(
+        self, deep: Union[dict, "QueryBuilder"], field: Optional[str] = None
+    ) -> "QueryBuilder":
+        """
+        Query related items, e.g. deep({"_limit": 5}, "translations").
+        :param deep: a DeepQuery (or a QueryBuilder, converted to one), or a
+          nested dict of DeepQuery per relational field if field is None
+        :param field: the relational field the DeepQuery applies to
+        """
+        if isinstance(deep, QueryBuilder):
+            deep = {f"_{key}": value for key, value in deep.build().items()}
+        deep = copy.deepcopy(deep)
+
+        if field is not None:
+            self._check_field(field)
+            deep = {field: deep}
+
+        self._validate_deep(deep)
+        self._query["deep"] = {**self._query.get("deep", {}), **deep}
+        return self
+
+    def _validate_deep(self, deep: dict) -> None:
+        for key, value in deep.items():
+            if key.startswith("_"):
+                if key not in DEEP_QUERY_KEYS:
+                    raise ValueError(f"Unknown deep query parameter {key}")
+                if key == "_filter":
+                    validate_filter(value)
+                elif key == "_aggregate":
+                    validate_aggregate(value)
+            elif isinstance(value, dict):
+                self._validate_deep(value)
+            else:
+                raise ValueError(f"Invalid deep query for field {key}: {value!r}")
+
+    def alias(self, alias: dict) -> "QueryBuilder":
+        """
+        Alias fields, e.g. to read a relation twice with different deep queries
+        """
+        self._query["alias"] = {**self._query.get("alias", {}), **alias}
+        return self
+
+    def aggregate(self, aggregate: Aggregate) -> "QueryBuilder":
+        """
+        Aggregate instead of returning items, e.g. aggregate({"count": "*", "avg": ["price"]})
+        """
+        validate_aggregate(aggregate)
+        for function, fields in aggregate.items():
+            for field in [fields] if isinstance(fields, str) else fields:
+                if field != "*":
+                    self._check_field(field)
+        self._query["aggregate"] = {
+            **self._query.get("aggregate", {}),
+            **copy.deepcopy(aggregate),
+        }
+        return self
+
+    def group_by(self, *fields: str) -> "QueryBuilder":
+        """
+        Group aggregates by fields, e.g. "category" or "year(date_created)"
+        """
+        for field in fields:
+            self._check_field(field)
+        self._query["groupBy"] = [*self._query.get("groupBy", []), *fields]
+        return self
+
+    def build(self) -> Query:
+        """
+        The query as a dict
+        """
+        return copy.deepcopy(self._query)
+
+    def compile(self) -> CompiledQuery:
+        """
+        The query as a CompiledQuery, encoded once for all requests using it
+        """
+        return CompiledQuery(self._query)
@@ -0,0 +1,449 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Optional
+
+import httpx
+
+from .exceptions import DirectusAuthException, DirectusException
+from .models import Query
+
+if TYPE_CHECKING:
+    from .cache import ResponseCache
+    from .mirror import MirrorStore
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - optional dependency
+    websockets = None
+
+TokenProvider = Callable[[], Awaitable[Optional[str]]]
+
+_CLOSED = object()
+
+# errors after which the connection is replaced: lost connections and failed
+# token refreshes (DirectusException, httpx.HTTPError) are expected to recover
+_TRANSIENT_ERRORS = (OSError, asyncio.TimeoutError, httpx.HTTPError, DirectusException)
+
+
+def require_websockets() -> None:
+    if websockets is None:
+        raise ImportError(
+            "Realtime subscriptions require websockets: pip install websockets"
+        )
+
+
+def websocket_url(hostname: str) -> str:
+    """
+    The URL of the realtime endpoint, e.g. wss://example.com/websocket for https://example.com
+    """
+    if hostname.startswith("https://"):
+        hostname = "wss://" + hostname[len("https://") :]
+    elif hostname.startswith("http://"):
+        hostname = "ws://" + hostname[len("http://") :]
+
+    return hostname.rstrip("/") + "/websocket"
+
+
+class RealtimeEvent:
+    def __init__(self, event: str, collection: str, uid: str, data: Any):
+        """
+        Event of a realtime subscription
+        :param event: init (the matching items on (re)subscribe), create, update or delete
+        :param collection: the subscribed collection
+        :param uid: identifies the subscription
+        :param data: the items, or the deleted primary keys for delete events
+        """
+        self.event = event
+        self.collection = collection
+        self.uid = uid
+        self.data = data if isinstance(data, list) else [data]
+
+    def __repr__(self) -> str:
+        return (
+            f"RealtimeEvent(event={self.event!r}, collection={self.collection!r}, "
+            f"uid={self.uid!r}, data={len(self.data)})"
+        )
+
+    def apply_to(self, store: "MirrorStore", primary_key: str = "id") -> None:
+        """
+        Update a local mirror in place: upsert created, updated and initial items,
+        delete deleted ones. The init event only contains the items returned by
+        the query of the subscription (note its limit), so nothing else is removed.
+        :param store: e.g. the store of a SyncEngine
+        :param primary_key: the primary key field of the collection
+        """
+        with store.transaction():
+            if self.event == "delete":
+                store.delete(self.collection, (str(key) for key in self.data))
+            else:
+                store.upsert(
+                    self.collection,
+                    ((str(item[primary_key]), item) for item in self.data),
+                )
+
+    def invalidate(self, cache: "ResponseCache") -> None:
+        """
+        Drop the cached responses of the collection after a change
+        """
+        if self.event != "init":
+            cache.invalidate(self.collection)
+
+
+class Subscription:
+    def __init__(
+        self,
+        connection: "RealtimeConnection",
+        collection: str,
+        query: Optional[Query],
+        uid: str,
+    ):
+        """
+        Async iterator over the RealtimeEvents of one subscription, see RealtimeConnection.subscribe
+        """
+        self.connection = connection
+        self.collection = collection
+        self.query = query
+        self.uid = uid
+        self._queue: asyncio.Queue = asyncio.Queue()
+        # the connection the subscription has been sent on
+        self._websocket: Any = None
+
+    def _message(self) -> dict:
+        message = {"type": "subscribe", "collection": self.collection, "uid": self.uid}
+        if self.query:
+            message["query"] = dict(self.query)
+        return message
+
+    def _put(self, item: Any) -> None:
+        self._queue.put_nowait(item)
+
+    def __aiter__(self) -> AsyncIterator[RealtimeEvent]:
+        return self
+
+    async def __anext__(self) -> RealtimeEvent:
+        item = await self._queue.get()
+        if item is _CLOSED:
+            # wake up other consumers as well
+            self._put(_CLOSED)
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    async def unsubscribe(self) -> None:
+        await self.connection.unsubscribe(self)
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.unsubscribe()
+
+
+class RealtimeConnection:
+    def __init__(
+        self,
+        hostname: str,
+        token: Optional[TokenProvider] = None,
+        heartbeat: float = 30.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        One WebSocket connection to the Directus realtime API, shared by all
+        subscriptions. It authenticates with the token of the client, answers
+        heartbeats, and reconnects with exponential backoff, resubscribing every
+        active subscription (which then receive a new init event).
+        :param hostname: the URL of Directus, e.g. https://example.com
+        :param token: coroutine function returning the access token, None for public access
+        :param heartbeat: seconds between WebSocket pings, a connection not answering
+          within the same time is replaced
+        :param reconnect_delay: the delay before the first reconnect, doubled per failure
+        :param max_reconnect_delay: the maximum delay between reconnects
+        """
+        require_websockets()
+
+        self.url = websocket_url(hostname)
+        self._token = token
+        self.heartbeat = heartbeat
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._logger = logger or logging.getLogger(__name__)
+
+        self._subscriptions: dict[str, Subscription] = {}
+        self._counter = 0
+        self._websocket: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def __aenter__(self) -> "RealtimeConnection":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def subscribe(
+        self, collection: str, query: Optional[Query] = None
+    ) -> Subscription:
+        """
+        Subscribe to the changes of a collection
+        :param collection: the collection name
+        :param query: fields and filter of the items sent with the events
+        :return: Subscription, iterate it with async for
+        """
+        if self._closed:
+            raise DirectusException("The realtime connection is closed!")
+
+        self._counter += 1
+        subscription = Subscription(self, collection, query, f"sub{self._counter}")
+        self._subscriptions[subscription.uid] = subscription
+
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        else:
+            await self._resubscribe()
+
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription) -> None:
+        if self._subscriptions.pop(subscription.uid, None) is None:
+            return
+
+        subscription._put(_CLOSED)
+        if self._websocket is not None:
+            try:
+                await self._send({"type": "unsubscribe", "uid": subscription.uid})
+            except websockets.ConnectionClosed:
+                pass
+
+    async def close(self) -> None:
+        """
+        Close the connection and end all subscriptions
+        """
+        self._closed = True
+        for subscription in self._subscriptions.values():
+            subscription._put(_CLOSED)
+        self._subscriptions.clear()
+
+        if self._websocket is not None:
+            await self._websocket.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _send(self, message: dict) -> None:
+        await self._websocket.send(json.dumps(message))
+
+    async def _resubscribe(self) -> None:
+        """
+        Send the subscriptions that are not active on the current connection
+        """
+        websocket = self._websocket
+        if websocket is None:
+            return
+
+        for subscription in list(self._subscriptions.values()):
+            if subscription._websocket is not websocket:
+                subscription._websocket = websocket
+                await websocket.send(json.dumps(subscription._message()))
+
+    async def _authenticate(self, websocket: Any) -> None:
+        token = await self._token() if self._token else None
+        if token is None:
+            return
+
+        await websocket.send(json.dumps({"type": "auth", "access_token": token}))
+        response = self._decode(await websocket.recv())
+        if response is None:
+            raise DirectusException("Malformed realtime authentication response!")
+        if response.get("type") == "auth" and response.get("status") != "ok":
+            raise DirectusAuthException(response.get("error"))
+
+    def _decode(self, message: Any) -> Optional[dict]:
+        """
+        Decode a message, None for malformed ones
+        """
+        try:
+            message = json.loads(message)
+        except ValueError:
+            message = None
+
+        if not isinstance(message, dict):
+            return None
+        return message
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+
+        while not self._closed:
+            try:
+                async with websockets.connect(
+                    self.url, ping_interval=self.heartbeat, ping_timeout=self.heartbeat
+                ) as websocket:
+                    await self._authenticate(websocket)
+
+                    self._websocket = websocket
+                    await self._resubscribe()
+                    delay = self.reconnect_delay
+
+                    async for message in websocket:
+                        decoded = self._decode(message)
+                        if decoded is None:
+                            self._logger.warning(
+                                "malformed realtime message: %r", message
+                            )
+                            continue
+                        await self._handle(decoded)
+            except DirectusAuthException as e:
+                # a rejected token does not get better by reconnecting
+                self._logger.error("realtime authentication failed: %s", e)
+                self._fail(e)
+                return
+            except (websockets.WebSocketException, *_TRANSIENT_ERRORS) as e:
+                self._logger.warning("realtime connection lost: %r", e)
+            except Exception as e:
+                # end the subscriptions instead of leaving their iterators waiting
+                self._logger.exception("realtime connection failed")
+                self._fail(e)
+                return
+            finally:
+                self._websocket = None
+
+            if self._closed:
+                return
+
+            # jitter, so that clients do not reconnect in lockstep after an outage
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, self.max_reconnect_delay)
+            self._logger.info("reconnecting to %s", self.url)
+
+    async def _handle(self, message: dict) -> None:
+        message_type = message.get("type")
+
+        if message_type == "ping":
+            await self._send({"type": "pong"})
+        elif message_type == "auth" and message.get("status") == "error":
+            error = message.get("error") or {}
+            if error.get("code") != "TOKEN_EXPIRED":
+                raise DirectusAuthException(error)
+            token = await self._token() if self._token else None
+            await self._send({"type": "auth", "access_token": token})
+        elif message_type in ("subscription", "subscribe"):
+            subscription = self._subscriptions.get(message.get("uid"))
+            if subscription is None:
+                return
+            if message.get("status") == "error":
+                self._subscriptions.pop(subscription.uid, None)
+                subscription._put(DirectusException(message.get("error")))
+            elif "event" in message:
+                subscription._put(
+                    RealtimeEvent(
+                        message["event"],
+                        subscription.collection,
+                        subscription.uid,
+                        message.get("data") or [],
+                    )
+                )
+
+    def _fail(self, exception: BaseException) -> None:
+        """
+        End the current subscriptions with an error, called by _run before it
+        returns. The connection is not closed, a later subscribe connects again.
+        """
+        self._task = None
+        for subscription in self._subscriptions.values():
+            subscription._put(exception)
+        self._subscriptions.clear()
+
+
+class RealtimeThread:
+    def __init__(self, connection_factory: Callable[[], RealtimeConnection]):
+        """
+        Runs a RealtimeConnection on an event loop in a background thread, for
+        callback-based subscriptions from sync code
+        :param connection_factory: creates the connection within the event loop
+        """
+        require_websockets()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="directus-realtime", daemon=True
+        )
+        self._thread.start()
+        self._connection = self._call(self._create(connection_factory))
+
+    @staticmethod
+    async def _create(
+        connection_factory: Callable[[], RealtimeConnection],
+    ) -> RealtimeConnection:
+        return connection_factory()
+
+    def _call(self, coroutine: Awaitable) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def subscribe(
+        self,
+        collection: str,
+        callback: Callable[[RealtimeEvent], None],
+        query: Optional[Query] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> Subscription:
+        """
+        Subscribe to the changes of a collection, callback is called on the
+        background thread for every event
+        :param collection: the collection name
+        :param callback: called with every RealtimeEvent
+        :param query: fields and filter of the items sent with the events
+        :param on_error: called if the subscription fails, e.g. on authentication errors
+        :return: the Subscription, pass it to unsubscribe
+        """
+        subscription = self._call(self._connection.subscribe(collection, query))
+
+        async def consume() -> None:
+            logger = self._connection._logger
+            try:
+                async for event in subscription:
+                    try:
+                        callback(event)
+                    except Exception:
+                        logger.exception("realtime callback failed for %r", event)
+            except Exception as e:
+                if on_error is None:
+                    logger.error("realtime subscription failed: %r", e)
+                    return
+                try:
+                    on_error(e)
+                except Exception:
+                    logger.exception("realtime on_error callback failed")
+
+        asyncio.run_coroutine_threadsafe(consume(), self._loop)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._call(self._connection.unsubscribe(subscription))
+
+    def close(self) -> None:
+        """
+        Close the connection and stop the thread
+        """
+        if not self._loop.is_running():
+            return
+
+        self._call(self._connection.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "RealtimeThread":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
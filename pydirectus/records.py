@@ -0,0 +1,253 @@
+import functools
+import types
+import typing
+from typing import Any, Callable, Iterable, Mapping, Optional, TypedDict, Union
+
+from .exceptions import DirectusException
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+
+class Record:
+    """
+    Base of the compact record classes built by record_class. Records store their
+    fields in __slots__ instead of a per-row dict.
+    """
+
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+    _validators: dict[str, Callable[[Any], bool]] = {}
+
+    def __init__(self, **values: Any):
+        for field in self._fields:
+            object.__setattr__(self, field, values.get(field))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Record":
+        """
+        Build a record from a decoded row, validating the fields of the schema.
+        Missing fields are None, fields that are not part of the schema are dropped.
+        """
+        record = cls.__new__(cls)
+        for field in cls._fields:
+            value = data.get(field)
+            validator = cls._validators.get(field)
+            if value is not None and validator is not None and not validator(value):
+                raise DirectusException(
+                    f"{cls.__name__}.{field}: unexpected value {value!r}"
+                )
+            object.__setattr__(record, field, value)
+
+        return record
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self._fields}
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self._fields)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{f}={getattr(self, f)!r}" for f in self._fields)
+        return f"{type(self).__name__}({values})"
+
+
+def _validator(tp: Any) -> Optional[Callable[[Any], bool]]:
+    """
+    Build a check for a decoded JSON value against a type hint
+    :return: the check, or None if every value is accepted
+    """
+    if tp is Any or isinstance(tp, (str, typing.ForwardRef)):
+        return None
+    if tp is type(None):
+        return lambda value: value is None
+    if tp is bool:
+        return lambda value: isinstance(value, bool)
+    if tp is int:
+        return lambda value: isinstance(value, int) and not isinstance(value, bool)
+    if tp is float:
+        return lambda value: isinstance(value, (int, float)) and not isinstance(
+            value, bool
+        )
+    if tp is str:
+        return lambda value: isinstance(value, str)
+    if typing.is_typeddict(tp):
+        return lambda value: isinstance(value, dict)
+
+    origin = typing.get_origin(tp)
+    if origin in (Union, types.UnionType):
+        checks = [_validator(arg) for arg in typing.get_args(tp)]
+        if any(check is None for check in checks):
+            return None
+        return lambda value: any(check(value) for check in checks)
+    if origin is list or tp is list:
+        args = typing.get_args(tp)
+        item_check = _validator(args[0]) if args else None
+        if item_check is None:
+            return lambda value: isinstance(value, list)
+        return lambda value: isinstance(value, list) and all(map(item_check, value))
+    if origin is dict or tp is dict:
+        return lambda value: isinstance(value, dict)
+
+    return None
+
+
+def _schema_hints(schema: Union[type, Mapping[str, Any]]) -> dict[str, Any]:
+    if isinstance(schema, Mapping):
+        return dict(schema)
+
+    try:
+        return typing.get_type_hints(schema)
+    except NameError:
+        # unresolvable forward references are not validated
+        return dict(schema.__annotations__)
+
+
+def record_class(
+    schema: Union[type, Mapping[str, Any]],
+    name: Optional[str] = None,
+    validate: bool = True,
+) -> type[Record]:
+    """
+    Build a __slots__ record class from a TypedDict model or a dict of field types
+    :param schema: e.g. pydirectus.models.File or {"id": int, "title": str | None}
+    :param name: class name, defaults to the name of the TypedDict
+    :param validate: check the values against the field types while decoding
+
+    :return: a Record subclass, pass it as record_type to the read methods
+    """
+    hints = _schema_hints(schema)
+    name = name or getattr(schema, "__name__", "Record")
+
+    validators = {}
+    if validate:
+        for field, tp in hints.items():
+            validator = _validator(tp)
+            if validator is not None:
+                validators[field] = validator
+
+    return type(
+        name,
+        (Record,),
+        {
+            "__slots__": tuple(hints),
+            "_fields": tuple(hints),
+            "_validators": validators,
+            "__annotations__": hints,
+        },
+    )
+
+
+def msgspec_struct(
+    schema: Union[type, Mapping[str, Any]], name: Optional[str] = None
+) -> type:
+    """
+    Build a msgspec Struct from a TypedDict model or a dict of field types.
+    All fields default to None, unknown fields are ignored.
+    :param schema: e.g. pydirectus.models.File or {"id": int, "title": str | None}
+    :param name: class name, defaults to the name of the TypedDict
+
+    :return: a msgspec.Struct subclass, pass it as record_type to the read methods
+    """
+    if msgspec is None:
+        raise ImportError("msgspec_struct requires msgspec: pip install msgspec")
+
+    hints = _schema_hints(schema)
+
+    return msgspec.defstruct(
+        name or getattr(schema, "__name__", "Record"),
+        [(field, tp, None) for field, tp in hints.items()],
+        # records are plain data without reference cycles
+        gc=False,
+    )
+
+
+def _is_struct(record_type: type) -> bool:
+    return msgspec is not None and issubclass(record_type, msgspec.Struct)
+
+
+def record_converter(record_type: type) -> Callable[[Any], Any]:
+    """
+    Get the function converting a single decoded row to record_type
+    :param record_type: a Record subclass or a msgspec Struct
+    """
+    if not _is_struct(record_type):
+        return record_type.from_dict
+
+    def convert(row: Any) -> Any:
+        try:
+            return msgspec.convert(row, record_type)
+        except msgspec.ValidationError as e:
+            raise DirectusException(f"{record_type.__name__}: {e}") from e
+
+    return convert
+
+
+def to_records(rows: Optional[Iterable[Any]], record_type: type) -> list:
+    """
+    Convert decoded rows to records
+    :param rows: the rows of a response
+    :param record_type: a Record subclass or a msgspec Struct
+    """
+    if rows is None:
+        return []
+
+    if _is_struct(record_type):
+        try:
+            return msgspec.convert(rows, list[record_type])
+        except msgspec.ValidationError as e:
+            raise DirectusException(f"{record_type.__name__}: {e}") from e
+
+    return list(map(record_type.from_dict, rows))
+
+
+@functools.lru_cache(maxsize=128)
+def response_decoder(
+    record_type: type, loads: Callable[[bytes], Any], many: bool = True
+) -> Callable[[bytes], Any]:
+    """
+    Get the function decoding a response body with its data as records, pass it as
+    decoder to the GET methods of the rest adapters. msgspec Structs are decoded
+    straight from the bytes without building dicts first, the rows of Record classes
+    are replaced one by one so each decoded dict is released right away.
+    :param record_type: a Record subclass or a msgspec Struct
+    :param loads: decodes the bytes into dicts for Record classes, e.g. JSONCodec.loads
+    :param many: the data is a list of rows instead of a single row
+    """
+    if _is_struct(record_type):
+        data_type = list[record_type] if many else record_type
+        decoder = msgspec.json.Decoder(
+            TypedDict(
+                f"{record_type.__name__}Response",
+                {"data": Optional[data_type], "meta": dict[str, Any]},
+                total=False,
+            )
+        )
+
+        def decode_structs(content: bytes) -> Any:
+            try:
+                return decoder.decode(content)
+            except msgspec.ValidationError as e:
+                raise DirectusException(f"{record_type.__name__}: {e}") from e
+
+        return decode_structs
+
+    from_dict = record_type.from_dict
+
+    def decode_records(content: bytes) -> Any:
+        body = loads(content)
+        data = body.get("data") if isinstance(body, dict) else None
+
+        if data is not None and many:
+            for i, row in enumerate(data):
+                data[i] = from_dict(row)
+        elif data is not None:
+            body["data"] = from_dict(data)
+
+        return body
+
+    return decode_records
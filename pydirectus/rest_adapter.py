@@ -1,10 +1,26 @@
+import asyncio
 import logging
-from json import JSONDecodeError, dumps
-from typing import Optional
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional, Sequence, Union
 
 import httpx
 
+from .auth import DirectusAuth
+from .cache import CacheEntry, ResponseCache
+from .codec import Decoder, JSONCodec, default_codec
 from .exceptions import DirectusException
+from .hooks import RequestHooks, RequestInfo, call_hooks
+from .query_builder import CompiledQuery, serialize_params
+from .retry import CircuitBreaker, RateLimiter, RetryPolicy
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .utils import collection_from_endpoint, request_key
+
+# keep idle connections around for concurrent callers instead of reconnecting
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=100, keepalive_expiry=30
+)
+DEFAULT_TIMEOUT = httpx.Timeout(30, connect=5)
 
 
 class Result:
@@ -28,38 +44,312 @@ class Result:
         self.data = data
 
 
-class RestAdapter:
+class _BaseRestAdapter:
+    """
+    Shared configuration and response handling of the sync and async adapters
+    """
+
+    # the Content-Type is set per request, as file uploads are sent as multipart
+    _headers = {
+        "Accept": "application/json, text/plain, */*",
+        "Accept-Encoding": "gzip, deflate, br",
+    }
+
     def __init__(
         self,
         hostname: str,
-        auth_handler: Optional[httpx.Auth] = None,
-        ssl_verify: bool = False,
         logger: Optional[logging.Logger] = None,
+        cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        codec: Optional[JSONCodec] = None,
+        hooks: Optional[Sequence[RequestHooks]] = None,
     ) -> None:
         self._url = hostname
+        self._logger = logger or logging.getLogger(__name__)
+        self._cache = cache
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._rate_limiter = rate_limiter
+        self._circuit_breaker = circuit_breaker
+        self._codec = codec if codec is not None else default_codec()
+        self._hooks = tuple(hooks or ())
 
-        self._client = httpx.Client(
-            auth=auth_handler,
-            verify=ssl_verify,
-            headers={
-                "Accept": "application/json, text/plain, */*",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Content-Type": "application/json;charset=UTF-8",
-            },
+    def _request_started(
+        self, http_method: str, endpoint: str, stream: bool = False
+    ) -> RequestInfo:
+        info = RequestInfo(http_method, endpoint, stream)
+        if self._hooks:
+            call_hooks(self._hooks, "on_request_start", info)
+        return info
+
+    def _request_finished(self, info: RequestInfo) -> None:
+        info.duration = time.perf_counter() - info.start
+        if self._hooks:
+            call_hooks(self._hooks, "on_request_end", info)
+
+    def _serialize_nested_params(
+        self, params: Union[dict, CompiledQuery]
+    ) -> Union[dict, httpx.QueryParams]:
+        """
+        Serialize nested params for correct query, without modifying them.
+        Compiled queries are already encoded.
+
+        """
+        if isinstance(params, CompiledQuery):
+            return params.params
+
+        return serialize_params(params, self._codec.dumps_str)
+
+    def _build_body(
+        self, data: Optional[dict], files: Optional[dict], headers: Optional[dict]
+    ) -> dict:
+        """
+        Build the body arguments of a request: JSON, or multipart if files are sent
+        :param data: A dict of data sent in the body (form fields if files are sent)
+        :param files: A dict of files to upload, see httpx
+        :param headers: additional request headers
+        :return: keyword arguments for httpx
+        """
+        if files:
+            # multipart form fields have to be strings, Directus parses nested values as JSON
+            form = {
+                key: value if isinstance(value, str) else self._codec.dumps_str(value)
+                for key, value in (data or {}).items()
+            }
+            return {"data": form, "files": files, "headers": headers}
+
+        if data is None:
+            return {"headers": headers}
+
+        return {
+            "content": self._codec.dumps(data),
+            "headers": {**(headers or {}), "Content-Type": "application/json"},
+        }
+
+    def _stream_error(self, response: httpx.Response) -> DirectusException:
+        """
+        Build the exception for a failed streamed response
+        :param response: a response whose body has already been read
+        :return: DirectusException
+        """
+        result = self._build_result(response)
+        errors = result.data.get("errors") if isinstance(result.data, dict) else None
+
+        return DirectusException(errors or f"{response.status_code} {result.message}")
+
+    def _before_send(self) -> float:
+        """
+        Check the circuit breaker and take a token from the rate limiter
+        :return: seconds to wait before sending the request
+        """
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.before_request()
+
+        return self._rate_limiter.reserve() if self._rate_limiter is not None else 0
+
+    def _after_send(self, response: Optional[httpx.Response]) -> None:
+        """
+        Feed the outcome of a request to the rate limiter and the circuit breaker
+        :param response: the response, None if the request failed without one
+        """
+        if self._rate_limiter is not None and response is not None:
+            self._rate_limiter.on_response(response.status_code)
+
+        if self._circuit_breaker is not None:
+            if response is None or response.status_code >= 500:
+                self._circuit_breaker.record_failure()
+            else:
+                self._circuit_breaker.record_success()
+
+    def _send_failed(self, exception: BaseException) -> None:
+        """
+        A request raised without a response and not due to the connection, e.g. the
+        login or refresh of the auth flow failed. Errors count as failures of the
+        circuit breaker, cancellations only release a half-open trial.
+        """
+        if self._circuit_breaker is None:
+            return
+
+        if isinstance(exception, Exception):
+            self._circuit_breaker.record_failure()
+        else:
+            self._circuit_breaker.release_trial()
+
+    def _cache_lookup(
+        self, http_method: str, endpoint: str, params: Optional[dict]
+    ) -> tuple[Optional[str], Optional[CacheEntry]]:
+        """
+        Look up a GET request in the response cache
+        :return: cache key (None if the request is not cacheable) and cached entry
+        """
+        if self._cache is None or http_method != "GET":
+            return None, None
+
+        cache_key = self._cache.key(f"{self._url}{endpoint}", params)
+        return cache_key, self._cache.get(cache_key)
+
+    def _result_from_cache(
+        self,
+        entry: CacheEntry,
+        info: Optional[RequestInfo] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> Result:
+        self._logger.debug("cache hit, status_code=%s", entry.status_code)
+
+        start = time.perf_counter()
+        data = (decoder or self._codec.loads)(entry.content)
+        if info is not None:
+            info.decode_time = time.perf_counter() - start
+
+        return Result(
+            success=True,
+            status_code=entry.status_code,
+            message=entry.message,
+            data=data,
         )
 
-        self._logger = logger or logging.getLogger(__name__)
+    def _update_cache(
+        self,
+        endpoint: str,
+        cache_key: Optional[str],
+        entry: Optional[CacheEntry],
+        response: httpx.Response,
+        decoder: Optional[Decoder] = None,
+    ) -> Optional[Result]:
+        """
+        Store, revalidate or invalidate cache entries after a request
+        :return: the cached Result, if the server confirmed it with 304 Not Modified
+        """
+        if self._cache is None:
+            return None
+
+        collection = collection_from_endpoint(endpoint)
+
+        if cache_key is None:
+            # any write may have changed the collection, even if it failed
+            if collection:
+                self._cache.invalidate(collection)
+            return None
+
+        if response.status_code == 304 and entry is not None:
+            self._cache.refresh(cache_key, entry)
+            return self._result_from_cache(entry, decoder=decoder)
 
-    def _serialize_nested_params(self, params: dict) -> dict:
+        if response.status_code == 200:
+            self._cache.store(cache_key, collection, response)
+
+        return None
+
+    def _build_result(
+        self,
+        response: httpx.Response,
+        info: Optional[RequestInfo] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> Result:
+        """
+        Turn a httpx response into a Result object
+        :param response: a response whose body has already been read
+        :param info: the metrics of the request, the decode time is added
+        :param decoder: decodes successful response bodies instead of the codec
+        :return: Result object
         """
-        Serialize nested params for correct query
+        # on delete return data is empty. handle this case here
+        if response.status_code == 204:
+            data_out = None
+        else:
+            # Deserialize JSON output to Python object, or return failed Result on exception
+            start = time.perf_counter()
+            try:
+                loads = decoder if decoder and response.is_success else None
+                data_out = (loads or self._codec.loads)(response.content)
+            except ValueError as e:
+                self._logger.warning(
+                    "success=False, status_code=%s, message=%s",
+                    response.status_code,
+                    e,
+                )
+
+                return Result(False, response.status_code, message=str(e))
+            finally:
+                if info is not None:
+                    info.decode_time = time.perf_counter() - start
+
+        self._logger.debug(
+            "success=%s, status_code=%s, message=%s",
+            response.is_success,
+            response.status_code,
+            response.reason_phrase,
+        )
+
+        return Result(
+            success=response.is_success,
+            status_code=response.status_code,
+            message=response.reason_phrase,
+            data=data_out,
+        )
+
 
+class RestAdapter(_BaseRestAdapter):
+    def __init__(
+        self,
+        hostname: str,
+        auth_handler: Optional[httpx.Auth] = None,
+        ssl_verify: bool = False,
+        logger: Optional[logging.Logger] = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce_reads: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[Union[float, httpx.Timeout]] = None,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        codec: Optional[JSONCodec] = None,
+        hooks: Optional[Sequence[RequestHooks]] = None,
+    ) -> None:
+        """
+        Low-level adapter for the Directus REST API on a httpx.Client
+        :param cache: optional cache for GET requests
+        :param coalesce_reads: let concurrent identical GET requests share one network request
+        :param retry_policy: when to retry failed requests, defaults to RetryPolicy()
+        :param rate_limiter: optional client-side rate limit
+        :param circuit_breaker: optional circuit breaker to fail fast while Directus is down
+        :param limits: connection pool limits (max_connections, max_keepalive_connections, keepalive_expiry)
+        :param timeout: connect/read/write/pool timeouts, httpx.Timeout(None) disables them
+        :param http2: multiplex requests over HTTP/2 connections, requires the http2 extra
+        :param transport: custom transport, e.g. httpx.MockTransport or a Unix socket transport.
+          Limits and http2 have to be configured on the transport itself.
+        :param codec: JSON codec, defaults to the fastest installed one (orjson, msgspec, json)
+        :param hooks: callbacks receiving the metrics of every request, see pydirectus.hooks
         """
-        for key, value in params.items():
-            if isinstance(value, dict):
-                params[key] = dumps(value)
+        super().__init__(
+            hostname,
+            logger=logger,
+            cache=cache,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            codec=codec,
+            hooks=hooks,
+        )
+
+        self._auth_handler = auth_handler
+        self._client = httpx.Client(
+            auth=auth_handler,
+            verify=ssl_verify,
+            headers=self._headers,
+            limits=limits if limits is not None else DEFAULT_LIMITS,
+            timeout=timeout if timeout is not None else DEFAULT_TIMEOUT,
+            http2=http2,
+            transport=transport,
+        )
+        self._singleflight = SingleFlight() if coalesce_reads else None
 
-        return params
+        if isinstance(auth_handler, DirectusAuth):
+            # background token refreshes reuse the connection pool
+            auth_handler.bind_client(self._client)
 
     def _do(
         self,
@@ -67,6 +357,8 @@ class RestAdapter:
         endpoint: str,
         params: Optional[dict] = None,
         data: Optional[dict] = None,
+        files: Optional[dict] = None,
+        decoder: Optional[Decoder] = None,
     ) -> Result:
         """
         Private method for GET, POST, PATCH, DELETE methods
@@ -74,93 +366,640 @@ class RestAdapter:
         :param endpoint: A str representing the endpoint after the base URL
         :param params: A dict of Endpoint Parameters
         :param data: A dict of data sent in the body
+        :param files: A dict of files sent as multipart body, data is sent as form fields
+        :param decoder: decodes successful response bodies instead of the codec
         :return: Result object
         """
+        if self._singleflight is not None and http_method == "GET":
+            # concurrent callers receive the same Result object
+            key = (request_key(f"{self._url}{endpoint}", params), decoder)
+            return self._singleflight.do(
+                key,
+                lambda: self._request(http_method, endpoint, params, decoder=decoder),
+            )
+
+        return self._request(http_method, endpoint, params, data, files, decoder)
+
+    def _request(
+        self,
+        http_method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> Result:
+        """
+        Send a single request and report it to the hooks, see _do
+        """
+        info = self._request_started(http_method, endpoint)
+        try:
+            return self._send(info, http_method, endpoint, params, data, files, decoder)
+        except BaseException as e:
+            info.error = e
+            raise
+        finally:
+            self._request_finished(info)
+
+    def _send(
+        self,
+        info: RequestInfo,
+        http_method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> Result:
+        """
+        Send a single request with retries, see _do
+        """
+        request_url = f"{self._url}{endpoint}"
+
+        cache_key, entry = self._cache_lookup(http_method, endpoint, params)
+        if entry is not None and entry.fresh:
+            info.cache = "hit"
+            return self._result_from_cache(entry, info, decoder)
+
+        serialized_params = self._serialize_nested_params(params) if params else None
+        self._retry_policy.budget.deposit()
+        retries = 0
+
+        while True:
+            delay = self._before_send()
+
+            try:
+                if delay:
+                    time.sleep(delay)
+
+                self._logger.debug(
+                    "method=%s, url=%s, params=%s", http_method, request_url, params
+                )
+
+                response = self._client.request(
+                    method=http_method,
+                    url=request_url,
+                    params=serialized_params,
+                    **self._build_body(
+                        data, files, entry.validators() if entry is not None else None
+                    ),
+                )
+            except httpx.RequestError as e:
+                self._after_send(None)
+                delay = self._retry_policy.retry_delay(http_method, retries)
+                if delay is None:
+                    self._logger.exception("%s", e)
+                    raise DirectusException(str(e)) from e
+                log_args = ("retrying in %.2fs, error=%s", delay, e)
+            except BaseException as e:
+                self._send_failed(e)
+                raise
+            else:
+                self._after_send(response)
+                info.record_response(response)
+                delay = self._retry_policy.retry_delay(http_method, retries, response)
+                if delay is None:
+                    break
+                log_args = (
+                    "retrying in %.2fs, status_code=%s",
+                    delay,
+                    response.status_code,
+                )
+
+            self._logger.warning(*log_args)
+            time.sleep(delay)
+            retries += 1
+            info.retries = retries
+
+        cached_result = self._update_cache(
+            endpoint, cache_key, entry, response, decoder
+        )
+        if cached_result is not None:
+            info.cache = "revalidated"
+            return cached_result
+
+        return self._build_result(response, info, decoder)
+
+    @contextmanager
+    def stream(
+        self,
+        http_method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        allowed_statuses: tuple[int, ...] = (),
+    ) -> Iterator[httpx.Response]:
+        """
+        Send a request and stream the response body instead of decoding it
+        :param http_method: Any str representing the HTTP Method ('GET', 'POST', etc.)
+        :param endpoint: A str representing the endpoint after the base URL
+        :param params: A dict of Endpoint Parameters
+        :param headers: A dict of additional request headers
+        :param allowed_statuses: error statuses that are handed to the caller instead of raising
+        :return: httpx response with an unread body
+        """
         request_url = f"{self._url}{endpoint}"
 
         serialized_params = self._serialize_nested_params(params) if params else None
+        info = self._request_started(http_method, endpoint, stream=True)
+        response = None
+        admitted = False
+        # whether the outcome was fed to the circuit breaker, errors while the caller
+        # reads the body must not count twice
+        sent = False
 
         try:
-            log_line = f"method={http_method}, url={request_url}, params={params}"
-            self._logger.debug(msg=log_line)
+            self._logger.debug(
+                "method=%s, url=%s, params=%s, stream=True",
+                http_method,
+                request_url,
+                params,
+            )
+
+            delay = self._before_send()
+            # from here on the request counts for the circuit breaker
+            admitted = True
+            if delay:
+                time.sleep(delay)
 
-            response = self._client.request(
+            with self._client.stream(
                 method=http_method,
                 url=request_url,
                 params=serialized_params,
-                json=data,
-            )
+                headers=headers,
+            ) as response:
+                self._after_send(response)
+                sent = True
+
+                if (
+                    not response.is_success
+                    and response.status_code not in allowed_statuses
+                ):
+                    response.read()
+                    raise self._stream_error(response)
+
+                yield response
         except httpx.RequestError as e:
-            self._logger.exception(msg=(str(e)))
+            if not sent:
+                self._after_send(None)
+            self._logger.exception("%s", e)
+            info.error = e
             raise DirectusException(str(e)) from e
+        except BaseException as e:
+            if admitted and not sent:
+                self._send_failed(e)
+            info.error = e
+            raise
+        finally:
+            # the response has been closed, so its size and timing are known
+            if response is not None:
+                info.record_response(response)
+            self._request_finished(info)
+
+    def close(self) -> None:
+        """
+        Close the underlying connection pool and stop the background token refresh
+        """
+        if isinstance(self._auth_handler, DirectusAuth):
+            self._auth_handler.close()
+        self._client.close()
+
+    def get(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> Result:
+        """
+        GET method for Directus
+        :param endpoint: A str representing the endpoint after the base URL
+        :param params: A dict of Endpoint Parameters
+        :param decoder: decodes the body of a successful response instead of the
+          codec, e.g. straight into records, see pydirectus.records.response_decoder
+        :return: Result object
+        """
+        return self._do(
+            http_method="GET", endpoint=endpoint, params=params, decoder=decoder
+        )
+
+    def post(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+    ) -> Result:
+        """
+        POST method for Directus
+        :param endpoint: A str representing the endpoint after the base URL
+        :param params: A dict of Endpoint Parameters
+        :param data: A dict of data sent in the body
+        :param files: A dict of files sent as multipart body, data is sent as form fields
+        :return: Result object
+        """
+        return self._do(
+            http_method="POST",
+            endpoint=endpoint,
+            params=params,
+            data=data,
+            files=files,
+        )
+
+    def patch(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+    ) -> Result:
+        """
+        PATCH method for Directus
+        :param endpoint: A str representing the endpoint after the base URL
+        :param params: A dict of Endpoint Parameters
+        :param data: A dict of data sent in the body
+        :param files: A dict of files sent as multipart body, data is sent as form fields
+        :return: Result object
+        """
+        return self._do(
+            http_method="PATCH",
+            endpoint=endpoint,
+            params=params,
+            data=data,
+            files=files,
+        )
+
+    def delete(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ) -> Result:
+        """
+        DELETE method for Directus
+        :param endpoint: A str representing the endpoint after the base URL
+        :param params: A dict of Endpoint Parameters
+        :param data: A dict of data sent in the body
+        :return: Result object
+        """
+        return self._do(
+            http_method="DELETE", endpoint=endpoint, params=params, data=data
+        )
+
+
+class AsyncRestAdapter(_BaseRestAdapter):
+    def __init__(
+        self,
+        hostname: str,
+        auth_handler: Optional[httpx.Auth] = None,
+        ssl_verify: bool = False,
+        logger: Optional[logging.Logger] = None,
+        max_concurrency: int = 100,
+        cache: Optional[ResponseCache] = None,
+        coalesce_reads: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[Union[float, httpx.Timeout]] = None,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        codec: Optional[JSONCodec] = None,
+        hooks: Optional[Sequence[RequestHooks]] = None,
+    ) -> None:
+        """
+        Async counterpart of the RestAdapter
+        :param max_concurrency: maximum number of requests that may be in flight at once
+        :param cache: optional cache for GET requests
+        :param coalesce_reads: let concurrent identical GET requests share one network request
+        :param retry_policy: when to retry failed requests, defaults to RetryPolicy()
+        :param rate_limiter: optional client-side rate limit
+        :param circuit_breaker: optional circuit breaker to fail fast while Directus is down
+        :param limits: connection pool limits (max_connections, max_keepalive_connections, keepalive_expiry)
+        :param timeout: connect/read/write/pool timeouts, httpx.Timeout(None) disables them
+        :param http2: multiplex requests over HTTP/2 connections, requires the http2 extra
+        :param transport: custom transport, e.g. httpx.MockTransport or a Unix socket transport.
+          Limits and http2 have to be configured on the transport itself.
+        :param codec: JSON codec, defaults to the fastest installed one (orjson, msgspec, json)
+        :param hooks: callbacks receiving the metrics of every request, see pydirectus.hooks
+        """
+        super().__init__(
+            hostname,
+            logger=logger,
+            cache=cache,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            codec=codec,
+            hooks=hooks,
+        )
+
+        self._auth_handler = auth_handler
+        self._client = httpx.AsyncClient(
+            auth=auth_handler,
+            verify=ssl_verify,
+            headers=self._headers,
+            # by default the pool fits all requests the semaphore lets through
+            limits=(
+                limits
+                if limits is not None
+                else httpx.Limits(
+                    max_connections=max_concurrency,
+                    max_keepalive_connections=max_concurrency,
+                )
+            ),
+            timeout=timeout if timeout is not None else DEFAULT_TIMEOUT,
+            http2=http2,
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._singleflight = AsyncSingleFlight() if coalesce_reads else None
+
+    async def _do(
+        self,
+        http_method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> Result:
+        """
+        Private method for GET, POST, PATCH, DELETE methods
+        :param http_method: Any str representing the HTTP Method ('GET', 'POST', etc.)
+        :param endpoint: A str representing the endpoint after the base URL
+        :param params: A dict of Endpoint Parameters
+        :param data: A dict of data sent in the body
+        :param files: A dict of files sent as multipart body, data is sent as form fields
+        :param decoder: decodes successful response bodies instead of the codec
+        :return: Result object
+        """
+        if self._singleflight is not None and http_method == "GET":
+            # concurrent callers receive the same Result object
+            key = (request_key(f"{self._url}{endpoint}", params), decoder)
+            return await self._singleflight.do(
+                key,
+                lambda: self._request(http_method, endpoint, params, decoder=decoder),
+            )
+
+        return await self._request(http_method, endpoint, params, data, files, decoder)
+
+    async def _request(
+        self,
+        http_method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> Result:
+        """
+        Send a single request and report it to the hooks, see _do
+        """
+        info = self._request_started(http_method, endpoint)
+        try:
+            return await self._send(
+                info, http_method, endpoint, params, data, files, decoder
+            )
+        except BaseException as e:
+            info.error = e
+            raise
+        finally:
+            self._request_finished(info)
+
+    async def _send(
+        self,
+        info: RequestInfo,
+        http_method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> Result:
+        """
+        Send a single request with retries, see _do
+        """
+        request_url = f"{self._url}{endpoint}"
+
+        cache_key, entry = self._cache_lookup(http_method, endpoint, params)
+        if entry is not None and entry.fresh:
+            info.cache = "hit"
+            return self._result_from_cache(entry, info, decoder)
+
+        serialized_params = self._serialize_nested_params(params) if params else None
+        self._retry_policy.budget.deposit()
+        retries = 0
+
+        while True:
+            delay = self._before_send()
 
-        # on delete return data is empty. handle this case here
-        if response.status_code == 204:
-            data_out = None
-        else:
-            # Deserialize JSON output to Python object, or return failed Result on exception
             try:
-                data_out = response.json()
-            except (ValueError, JSONDecodeError) as e:
-                log_line = (
-                    f"success=False, status_code={response.status_code}, message={e}"
+                if delay:
+                    await asyncio.sleep(delay)
+
+                self._logger.debug(
+                    "method=%s, url=%s, params=%s", http_method, request_url, params
                 )
-                self._logger.warning(msg=log_line)
 
-                return Result(False, response.status_code, message=str(e))
+                async with self._semaphore:
+                    response = await self._client.request(
+                        method=http_method,
+                        url=request_url,
+                        params=serialized_params,
+                        **self._build_body(
+                            data,
+                            files,
+                            entry.validators() if entry is not None else None,
+                        ),
+                    )
+            except httpx.RequestError as e:
+                self._after_send(None)
+                delay = self._retry_policy.retry_delay(http_method, retries)
+                if delay is None:
+                    self._logger.exception("%s", e)
+                    raise DirectusException(str(e)) from e
+                log_args = ("retrying in %.2fs, error=%s", delay, e)
+            except BaseException as e:
+                self._send_failed(e)
+                raise
+            else:
+                self._after_send(response)
+                info.record_response(response)
+                delay = self._retry_policy.retry_delay(http_method, retries, response)
+                if delay is None:
+                    break
+                log_args = (
+                    "retrying in %.2fs, status_code=%s",
+                    delay,
+                    response.status_code,
+                )
 
-        log_line = f"success={response.is_success}, status_code={response.status_code}, message={response.reason_phrase}"
-        self._logger.debug(msg=log_line)
+            self._logger.warning(*log_args)
+            await asyncio.sleep(delay)
+            retries += 1
+            info.retries = retries
 
-        return Result(
-            success=response.is_success,
-            status_code=response.status_code,
-            message=response.reason_phrase,
-            data=data_out,
+        cached_result = self._update_cache(
+            endpoint, cache_key, entry, response, decoder
         )
+        if cached_result is not None:
+            info.cache = "revalidated"
+            return cached_result
+
+        return self._build_result(response, info, decoder)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        http_method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        allowed_statuses: tuple[int, ...] = (),
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Send a request and stream the response body instead of decoding it
+        :param http_method: Any str representing the HTTP Method ('GET', 'POST', etc.)
+        :param endpoint: A str representing the endpoint after the base URL
+        :param params: A dict of Endpoint Parameters
+        :param headers: A dict of additional request headers
+        :param allowed_statuses: error statuses that are handed to the caller instead of raising
+        :return: httpx response with an unread body
+        """
+        request_url = f"{self._url}{endpoint}"
+
+        serialized_params = self._serialize_nested_params(params) if params else None
+        info = self._request_started(http_method, endpoint, stream=True)
+        response = None
+        admitted = False
+        # whether the outcome was fed to the circuit breaker, errors while the caller
+        # reads the body must not count twice
+        sent = False
+
+        try:
+            self._logger.debug(
+                "method=%s, url=%s, params=%s, stream=True",
+                http_method,
+                request_url,
+                params,
+            )
 
-    def get(self, endpoint: str, params: Optional[dict] = None) -> Result:
+            delay = self._before_send()
+            # from here on the request counts for the circuit breaker
+            admitted = True
+            if delay:
+                await asyncio.sleep(delay)
+
+            async with (
+                self._semaphore,
+                self._client.stream(
+                    method=http_method,
+                    url=request_url,
+                    params=serialized_params,
+                    headers=headers,
+                ) as response,
+            ):
+                self._after_send(response)
+                sent = True
+
+                if (
+                    not response.is_success
+                    and response.status_code not in allowed_statuses
+                ):
+                    await response.aread()
+                    raise self._stream_error(response)
+
+                yield response
+        except httpx.RequestError as e:
+            if not sent:
+                self._after_send(None)
+            self._logger.exception("%s", e)
+            info.error = e
+            raise DirectusException(str(e)) from e
+        except BaseException as e:
+            if admitted and not sent:
+                self._send_failed(e)
+            info.error = e
+            raise
+        finally:
+            # the response has been closed, so its size and timing are known
+            if response is not None:
+                info.record_response(response)
+            self._request_finished(info)
+
+    async def aclose(self) -> None:
+        """
+        Close the underlying connection pool
+        """
+        if isinstance(self._auth_handler, DirectusAuth):
+            self._auth_handler.close()
+        await self._client.aclose()
+
+    async def get(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        decoder: Optional[Decoder] = None,
+    ) -> Result:
         """
         GET method for Directus
         :param endpoint: A str representing the endpoint after the base URL
         :param params: A dict of Endpoint Parameters
+        :param decoder: decodes the body of a successful response instead of the
+          codec, e.g. straight into records, see pydirectus.records.response_decoder
         :return: Result object
         """
-        return self._do(http_method="GET", endpoint=endpoint, params=params)
+        return await self._do(
+            http_method="GET", endpoint=endpoint, params=params, decoder=decoder
+        )
 
-    def post(
+    async def post(
         self,
         endpoint: str,
         params: Optional[dict] = None,
         data: Optional[dict] = None,
+        files: Optional[dict] = None,
     ) -> Result:
         """
         POST method for Directus
         :param endpoint: A str representing the endpoint after the base URL
         :param params: A dict of Endpoint Parameters
         :param data: A dict of data sent in the body
+        :param files: A dict of files sent as multipart body, data is sent as form fields
         :return: Result object
         """
-        return self._do(http_method="POST", endpoint=endpoint, params=params, data=data)
+        return await self._do(
+            http_method="POST",
+            endpoint=endpoint,
+            params=params,
+            data=data,
+            files=files,
+        )
 
-    def patch(
+    async def patch(
         self,
         endpoint: str,
         params: Optional[dict] = None,
         data: Optional[dict] = None,
+        files: Optional[dict] = None,
     ) -> Result:
         """
         PATCH method for Directus
         :param endpoint: A str representing the endpoint after the base URL
         :param params: A dict of Endpoint Parameters
         :param data: A dict of data sent in the body
+        :param files: A dict of files sent as multipart body, data is sent as form fields
         :return: Result object
         """
-        return self._do(
-            http_method="PATCH", endpoint=endpoint, params=params, data=data
+        return await self._do(
+            http_method="PATCH",
+            endpoint=endpoint,
+            params=params,
+            data=data,
+            files=files,
         )
 
-    def delete(
+    async def delete(
         self,
         endpoint: str,
         params: Optional[dict] = None,
@@ -173,6 +1012,6 @@ class RestAdapter:
         :param data: A dict of data sent in the body
         :return: Result object
         """
-        return self._do(
+        return await self._do(
             http_method="DELETE", endpoint=endpoint, params=params, data=data
         )
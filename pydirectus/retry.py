@@ -0,0 +1,237 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+import httpx
+
+from .exceptions import DirectusCircuitOpenException
+
+
+class RetryBudget:
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10):
+        """
+        Limits retries to a share of the requests, so retries cannot multiply the
+        load on a struggling server. Every request deposits ratio tokens, every
+        retry withdraws one.
+        :param ratio: retries allowed per request
+        :param min_retries: tokens available from the start and the minimum retry capacity
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+
+        self._tokens = float(min_retries)
+        self._max_tokens = float(min_retries) + 100 * ratio
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self._max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        jitter: bool = True,
+        retry_statuses: Iterable[int] = (429, 502, 503, 504),
+        retry_methods: Iterable[str] = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+        respect_retry_after: bool = True,
+        budget: Optional[RetryBudget] = None,
+    ):
+        """
+        When and how long to wait before retrying a request
+        :param max_retries: maximum number of retries per request, 0 disables retries
+        :param backoff_factor: base of the exponential backoff in seconds
+        :param max_backoff: upper bound of a single wait in seconds
+        :param jitter: randomize the waits ("full jitter") to spread out retrying clients
+        :param retry_statuses: response statuses that are retried
+        :param retry_methods: HTTP methods that are retried, only idempotent ones by default
+        :param respect_retry_after: wait as long as the Retry-After header asks for
+        :param budget: limits the total share of retries, defaults to a RetryBudget
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(method.upper() for method in retry_methods)
+        self.respect_retry_after = respect_retry_after
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def retry_delay(
+        self,
+        http_method: str,
+        attempt: int,
+        response: Optional[httpx.Response] = None,
+    ) -> Optional[float]:
+        """
+        Decide whether a failed attempt is retried
+        :param http_method: the HTTP method of the request
+        :param attempt: number of retries made so far
+        :param response: the response, None if the request failed without one
+        :return: seconds to wait before the retry, or None to give up
+        """
+        if attempt >= self.max_retries or http_method.upper() not in self.retry_methods:
+            return None
+        if response is not None and response.status_code not in self.retry_statuses:
+            return None
+        if not self.budget.withdraw():
+            return None
+
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        backoff = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+    def _retry_after(self, response: Optional[httpx.Response]) -> Optional[float]:
+        if not self.respect_retry_after or response is None:
+            return None
+
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        min_rate: float = 1,
+        decrease_factor: float = 0.5,
+        increase: float = 0.1,
+    ):
+        """
+        Client-side token bucket that adapts to the server: every 429 response
+        multiplies the rate by decrease_factor, every successful response raises
+        it by increase again, up to the configured rate.
+        :param rate: maximum number of requests per second
+        :param burst: bucket size, defaults to one second worth of requests
+        :param min_rate: lower bound of the adapted rate
+        :param decrease_factor: rate multiplier applied on 429 responses
+        :param increase: requests per second added after each successful response
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.increase = increase
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token for the next request
+        :return: seconds to wait before sending it
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # tokens can go negative, waiting requests queue up behind each other
+            self._tokens -= 1
+
+            return 0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def on_response(self, status_code: int) -> None:
+        with self._lock:
+            if status_code == 429:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            elif status_code < 400:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        """
+        Fails fast while Directus is down: after failure_threshold consecutive
+        failures (connection errors or 5xx responses) the circuit opens and
+        requests raise DirectusCircuitOpenException. After recovery_timeout
+        seconds a single trial request is let through, its outcome closes or
+        reopens the circuit.
+        :param failure_threshold: consecutive failures that open the circuit
+        :param recovery_timeout: seconds the circuit stays open
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return "half-open"
+            return "open"
+
+    def before_request(self) -> None:
+        """
+        Raise DirectusCircuitOpenException unless the request may be sent
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+
+            if (
+                time.monotonic() - self._opened_at >= self.recovery_timeout
+                and not self._trial_running
+            ):
+                self._trial_running = True
+                return
+
+        raise DirectusCircuitOpenException(
+            "Directus is unavailable, the circuit breaker is open!"
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def release_trial(self) -> None:
+        """
+        Let another trial request through, if the trial was aborted without an outcome
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
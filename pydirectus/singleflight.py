@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Deduplicate concurrent calls across threads: while a call for a key is in
+        flight, further calls with the same key wait for it and share its result.
+        """
+        self._lock = threading.Lock()
+        self._calls: dict[tuple[str, Any], _Call] = {}
+
+    def do(self, key: tuple[str, Any], fn: Callable[[], Any]) -> Any:
+        """
+        Call fn, unless a call for key is already in flight
+        :param key: identifies identical calls, the request key and the decoder
+        :param fn: the call to make
+        :return: the result of fn
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        """
+        Deduplicate concurrent calls across tasks of one event loop: while a call for
+        a key is in flight, further calls with the same key await its result.
+        """
+        self._calls: dict[tuple[str, Any], asyncio.Task] = {}
+
+    async def do(self, key: tuple[str, Any], fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn, unless a call for key is already in flight
+        :param key: identifies identical calls, the request key and the decoder
+        :param fn: coroutine function making the call
+        :return: the result of fn
+        """
+        task = self._calls.get(key)
+
+        if task is None:
+            # run in its own task, so a cancelled caller does not cancel the others
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+        # avoid "exception was never retrieved" warnings if all callers were cancelled
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,253 @@
+import codecs
+import re
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from .exceptions import DirectusException
+
+_WHITESPACE = re.compile(r"\s*")
+_DELIMITERS = frozenset(" \t\n\r,:]}")
+_decoder = JSONDecoder()
+
+
+class DataArrayParser:
+    """
+    Incremental parser for Directus responses ({"data": [...], "meta": {...}}).
+    Items of the data array are returned as soon as they are complete, so only
+    the unparsed remainder of the body is buffered. Other top level values,
+    like meta, are parsed as a whole.
+    """
+
+    def __init__(self):
+        self.meta: Optional[dict] = None
+        self.finished = False
+
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        # decoded chunks not yet appended to the buffer
+        self._pending: list[str] = []
+        self._pending_size = 0
+        # object_start, key, colon, value, array_item, array_separator, object_separator, end
+        self._state = "object_start"
+        self._key: Optional[str] = None
+        # size of the buffer when the last value was incomplete
+        self._incomplete_size = 0
+
+    def feed(self, chunk: bytes) -> list:
+        """
+        Parse the next chunk of the response body
+        :param chunk: raw bytes, may end within a multi-byte character
+        :return: the items of the data array completed by this chunk
+        """
+        text = self._utf8.decode(chunk)
+        self._pending.append(text)
+        self._pending_size += len(text)
+
+        # wait for the buffer to double before decoding an incomplete value again,
+        # so that values spanning many chunks are parsed in linear time
+        if (
+            len(self._buffer) - self._pos + self._pending_size
+            < 2 * self._incomplete_size
+        ):
+            return []
+
+        self._fill_buffer()
+        return self._parse(final=False)
+
+    def _fill_buffer(self) -> None:
+        self._buffer = self._buffer[self._pos :] + "".join(self._pending)
+        self._pos = 0
+        self._pending = []
+        self._pending_size = 0
+
+    def close(self) -> list:
+        """
+        Parse the rest of the body after the last chunk
+        :return: the remaining items of the data array
+        """
+        self._pending.append(self._utf8.decode(b"", final=True))
+        self._fill_buffer()
+
+        items = self._parse(final=True)
+        if self._state != "end":
+            raise DirectusException("Incomplete JSON response!")
+
+        self.finished = True
+        return items
+
+    def _skip_whitespace(self) -> bool:
+        """
+        Advance to the next token
+        :return: False if the buffer is exhausted
+        """
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+        return self._pos < len(self._buffer)
+
+    def _decode_value(self, final: bool) -> tuple[bool, Any]:
+        """
+        Decode the JSON value at the current position
+        :return: whether a complete value was decoded, and the value
+        """
+        try:
+            value, end = _decoder.raw_decode(self._buffer, self._pos)
+        except JSONDecodeError:
+            if final:
+                raise
+            self._incomplete_size = len(self._buffer) - self._pos
+            return False, None
+
+        # a number at the end of the buffer (or followed by a partial fraction
+        # or exponent) may continue in the next chunk
+        if not final and (
+            end == len(self._buffer) or self._buffer[end] not in _DELIMITERS
+        ):
+            self._incomplete_size = len(self._buffer) - self._pos
+            return False, None
+
+        self._pos = end
+        self._incomplete_size = 0
+        return True, value
+
+    def _expect(self, char: str) -> None:
+        if self._buffer[self._pos] != char:
+            raise DirectusException(
+                f"Unexpected {self._buffer[self._pos]!r} at position {self._pos}, expected {char!r}!"
+            )
+        self._pos += 1
+
+    def _parse(self, final: bool) -> list:
+        items = []
+
+        try:
+            while self._state != "end" and self._skip_whitespace():
+                char = self._buffer[self._pos]
+
+                if self._state == "object_start":
+                    self._expect("{")
+                    self._state = "key"
+
+                elif self._state == "key":
+                    if char == "}":
+                        self._pos += 1
+                        self._state = "end"
+                        continue
+
+                    complete, self._key = self._decode_value(final)
+                    if not complete:
+                        break
+                    self._state = "colon"
+
+                elif self._state == "colon":
+                    self._expect(":")
+                    self._state = "value"
+
+                elif self._state == "value":
+                    if self._key == "data" and char == "[":
+                        self._pos += 1
+                        self._state = "array_item"
+                        continue
+
+                    complete, value = self._decode_value(final)
+                    if not complete:
+                        break
+
+                    if self._key == "meta":
+                        self.meta = value
+                    elif self._key == "data" and value is not None:
+                        # single item endpoints
+                        items.append(value)
+                    self._state = "object_separator"
+
+                elif self._state == "array_item":
+                    if char == "]":
+                        self._pos += 1
+                        self._state = "object_separator"
+                        continue
+
+                    complete, value = self._decode_value(final)
+                    if not complete:
+                        break
+                    items.append(value)
+                    self._state = "array_separator"
+
+                elif self._state == "array_separator":
+                    if char == "]":
+                        self._pos += 1
+                        self._state = "object_separator"
+                    else:
+                        self._expect(",")
+                        self._state = "array_item"
+
+                elif self._state == "object_separator":
+                    if char == "}":
+                        self._pos += 1
+                        self._state = "end"
+                    else:
+                        self._expect(",")
+                        self._state = "key"
+        except JSONDecodeError as e:
+            raise DirectusException(f"Invalid JSON response: {e}") from e
+
+        return items
+
+
+class ItemStream:
+    def __init__(
+        self,
+        chunks: Iterator[bytes],
+        convert: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Iterator over the items of a streamed response
+        :param chunks: the raw chunks of the response body
+        :param convert: optional conversion of every item, e.g. to a record
+        """
+        self._chunks = chunks
+        self._convert = convert
+        self._parser = DataArrayParser()
+
+    @property
+    def meta(self) -> Optional[dict]:
+        """
+        The meta of the response, available once all items have been consumed
+        """
+        return self._parser.meta
+
+    @property
+    def finished(self) -> bool:
+        return self._parser.finished
+
+    def _items(self, items: list) -> list:
+        return list(map(self._convert, items)) if self._convert else items
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in self._chunks:
+            yield from self._items(self._parser.feed(chunk))
+
+        yield from self._items(self._parser.close())
+
+
+class AsyncItemStream(ItemStream):
+    def __init__(
+        self,
+        chunks: AsyncIterator[bytes],
+        convert: Optional[Callable[[Any], Any]] = None,
+    ):
+        """
+        Async iterator over the items of a streamed response
+        :param chunks: the raw chunks of the response body
+        :param convert: optional conversion of every item, e.g. to a record
+        """
+        super().__init__(chunks, convert)
+
+    def __iter__(self):
+        raise TypeError("Use 'async for' with an AsyncItemStream!")
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        async for chunk in self._chunks:
+            for item in self._items(self._parser.feed(chunk)):
+                yield item
+
+        for item in self._items(self._parser.close()):
+            yield item
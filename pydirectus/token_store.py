@@ -0,0 +1,143 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import ContextManager, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class TokenStore(ABC):
+    """
+    Storage of access/refresh token pairs shared by several DirectusAuth instances,
+    e.g. the worker processes of a host. Subclass it to plug in another store.
+    Tokens are dicts with access_token, refresh_token, expires and expiration_date.
+    The lock, load and save of one login or refresh are called on the same thread.
+    """
+
+    @abstractmethod
+    def lock(self) -> ContextManager[None]:
+        """
+        Exclusive lock held while a login or refresh is coordinated
+        """
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[dict]: ...
+
+    @abstractmethod
+    def save(self, key: str, tokens: dict) -> None: ...
+
+
+class FileTokenStore(TokenStore):
+    def __init__(self, path: str | os.PathLike):
+        """
+        Token store in a JSON file, locked with flock (POSIX only)
+        :param path: path of the token file, a lock file is created next to it
+        """
+        if fcntl is None:
+            raise RuntimeError(
+                "FileTokenStore requires fcntl, which is not available on this "
+                "platform (e.g. Windows), use the SQLiteTokenStore instead!"
+            )
+
+        self.path = Path(path)
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> dict:
+        try:
+            return json.loads(self.path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def load(self, key: str) -> Optional[dict]:
+        return self._read().get(key)
+
+    def save(self, key: str, tokens: dict) -> None:
+        data = self._read()
+        data[key] = tokens
+
+        # write atomically, readers never see a partial file
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+class SQLiteTokenStore(TokenStore):
+    def __init__(self, path: str | os.PathLike, timeout: float = 60):
+        """
+        Token store in a SQLite database, locked with an immediate transaction
+        :param path: path of the database file
+        :param timeout: seconds to wait for the lock of another process
+        """
+        self.path = str(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, tokens TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        # reuse the connection holding the lock, a second one would wait for it
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            yield connection
+            return
+
+        connection = self._connect()
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        self._local.connection = connection
+
+        try:
+            yield
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.connection = None
+            connection.close()
+
+    def load(self, key: str) -> Optional[dict]:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT tokens FROM tokens WHERE key = ?", (key,)
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def save(self, key: str, tokens: dict) -> None:
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO tokens VALUES (?, ?)", (key, json.dumps(tokens))
+            )
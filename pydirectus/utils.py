@@ -1,8 +1,24 @@
+from __future__ import annotations
+
 import time
-from typing import Optional
+from json import dumps
+from typing import TYPE_CHECKING, Optional
 
 from .exceptions import DirectusException
-from .rest_adapter import Result
+
+if TYPE_CHECKING:
+    from .query_builder import CompiledQuery
+    from .rest_adapter import Result
+
+# endpoints of system collections, e.g. /files for directus_files
+SYSTEM_ENDPOINTS = {
+    "activity": "directus_activity",
+    "assets": "directus_files",
+    "files": "directus_files",
+    "folders": "directus_folders",
+    "revisions": "directus_revisions",
+    "users": "directus_users",
+}
 
 
 def list_to_string(s: Optional[list[str]]) -> Optional[str]:
@@ -13,6 +29,110 @@ def list_to_string(s: Optional[list[str]]) -> Optional[str]:
     return ",".join(s) if s else None
 
 
+def collection_from_endpoint(endpoint: str) -> Optional[str]:
+    """
+    Get the collection an endpoint belongs to, e.g. "articles" for /items/articles/1.
+
+    """
+    segments = endpoint.strip("/").split("/")
+
+    if segments[0] == "items":
+        return segments[1] if len(segments) > 1 else None
+
+    return SYSTEM_ENDPOINTS.get(segments[0])
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    The endpoint without collection names and IDs, e.g. /items/{collection}/{id} for
+    /items/articles/1, to label metrics without unbounded cardinality.
+
+    """
+    segments = endpoint.strip("/").split("/")
+
+    if segments[0] == "items":
+        placeholders = ["{collection}", "{id}"]
+    elif segments[0] in ("fields", "relations"):
+        placeholders = ["{collection}", "{field}"]
+    elif segments[0] in SYSTEM_ENDPOINTS:
+        placeholders = ["{id}"]
+    else:
+        return endpoint
+
+    for index, placeholder in enumerate(placeholders, start=1):
+        if len(segments) > index and segments[index] != "me":
+            segments[index] = placeholder
+
+    return "/" + "/".join(segments)
+
+
+def endpoint_for_collection(collection: str) -> str:
+    """
+    The endpoint of a collection, e.g. /files for directus_files and /items/articles for articles.
+
+    """
+    if collection.startswith("directus_"):
+        return "/" + collection[len("directus_") :]
+
+    return f"/items/{collection}"
+
+
+def request_key(url: str, params: Optional[dict | CompiledQuery]) -> str:
+    """
+    Canonical key of a GET request, independent of the order of the params.
+
+    """
+    # compiled queries carry their canonical form
+    key = getattr(params, "key", None)
+    if key is not None:
+        return f"GET {url} {key}"
+
+    # default=str for values the client's codec encodes but json does not, e.g. datetime
+    params = dumps(params or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return f"GET {url} {params}"
+
+
+# aggregate functions whose results are numbers, some databases return them as strings
+NUMERIC_AGGREGATES = (
+    "count",
+    "countDistinct",
+    "countAll",
+    "sum",
+    "sumDistinct",
+    "avg",
+    "avgDistinct",
+)
+
+
+def _to_number(value):
+    if not isinstance(value, str):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+def parse_aggregates(rows: Optional[list[dict]]) -> list[dict]:
+    """
+    Convert the numeric strings of aggregate results to numbers, e.g. counts returned as
+    bigint strings by PostgreSQL. min and max keep the type of their field.
+
+    """
+    for row in rows or []:
+        for function in NUMERIC_AGGREGATES:
+            values = row.get(function)
+            if isinstance(values, dict):
+                row[function] = {field: _to_number(v) for field, v in values.items()}
+            elif values is not None:
+                row[function] = _to_number(values)
+
+    return rows or []
+
+
 def current_time_in_ms():
     """
     Calculate current time in milliseconds.
@@ -23,6 +143,23 @@ def current_time_in_ms():
 
 def handle_directus_response(result: Result):
     if not result.success:
-        raise DirectusException(result.data["errors"])
+        raise DirectusException(
+            result.data["errors"] if result.data else result.message
+        )
+
+    # e.g. 204 No Content on delete
+    if result.data is None:
+        return None
 
     return result.data["data"]
+
+
+def handle_directus_meta(result: Result) -> dict:
+    """
+    Get the meta object of a response, requested with the meta query parameter.
+
+    """
+    if not result.success:
+        raise DirectusException(result.data["errors"])
+
+    return result.data.get("meta") or {}
@@ -0,0 +1,19 @@
+import pytest
+
+from benchmarks.mock_directus import MockDirectus
+from pydirectus import DirectusClient
+
+
+@pytest.fixture
+def mock() -> MockDirectus:
+    return MockDirectus({"articles": 250}, file_size=1024)
+
+
+@pytest.fixture
+def client(mock: MockDirectus):
+    with DirectusClient(
+        "http://directus.test",
+        static_token=mock.static_token,
+        transport=mock.transport(),
+    ) as client:
+        yield client
@@ -0,0 +1,106 @@
+import asyncio
+
+import httpx
+import pytest
+
+from pydirectus import AsyncDirectusClient, DirectusClient
+from pydirectus.exceptions import DirectusAuthException
+
+LOGIN = ("POST", "/auth/login")
+REFRESH = ("POST", "/auth/refresh")
+READ = ("GET", "/items/{collection}")
+
+
+def login_client(mock, **kwargs) -> DirectusClient:
+    return DirectusClient(
+        "http://directus.test",
+        username="admin@example.com",
+        password="secret",
+        transport=mock.transport(),
+        **kwargs,
+    )
+
+
+def test_login_once(mock):
+    with login_client(mock) as client:
+        client.read_items("articles", {"limit": 1})
+        client.read_items("articles", {"limit": 2})
+
+    assert mock.requests[LOGIN] == 1
+    assert mock.requests[REFRESH] == 0
+    assert mock.requests[READ] == 2
+
+
+def test_refresh_ahead_of_expiry(mock):
+    mock.token_ttl = 20000
+
+    # the token expires within the refresh skew, so every request refreshes it
+    with login_client(mock, refresh_skew=30000) as client:
+        client.read_items("articles", {"limit": 1})
+        client.read_items("articles", {"limit": 2})
+
+    assert mock.requests[LOGIN] == 1
+    assert mock.requests[REFRESH] == 1
+
+
+def test_rejected_token_is_replaced(mock):
+    with login_client(mock) as client:
+        client.read_items("articles", {"limit": 1})
+        # the server revokes the access token before it expires
+        mock._access_tokens.clear()
+        assert len(client.read_items("articles", {"limit": 2})) == 2
+
+    assert mock.requests[LOGIN] == 1
+    assert mock.requests[REFRESH] == 1
+    assert mock.requests[READ] == 3
+
+
+def test_failed_refresh_falls_back_to_login(mock):
+    with login_client(mock) as client:
+        client.read_items("articles", {"limit": 1})
+        mock._access_tokens.clear()
+        mock._refresh_token = None
+        client.read_items("articles", {"limit": 2})
+
+    assert mock.requests[LOGIN] == 2
+    assert mock.requests[REFRESH] == 1
+
+
+def test_async_refresh(mock):
+    mock.token_ttl = 20000
+
+    async def run() -> None:
+        async with AsyncDirectusClient(
+            "http://directus.test",
+            username="admin@example.com",
+            password="secret",
+            refresh_skew=30000,
+            transport=mock.async_transport(),
+        ) as client:
+            await client.read_items("articles", {"limit": 1})
+            await client.read_items("articles", {"limit": 1})
+
+    asyncio.run(run())
+
+    assert mock.requests[LOGIN] == 1
+    assert mock.requests[REFRESH] == 1
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        httpx.Response(502, text="<html>Bad Gateway</html>"),
+        httpx.Response(200, json={"data": {"access_token": "a"}}),
+        httpx.Response(200, json=["unexpected"]),
+        httpx.Response(401, json={"errors": [{"message": "Invalid credentials"}]}),
+    ],
+    ids=["html", "incomplete", "list", "errors"],
+)
+def test_invalid_token_response(response):
+    transport = httpx.MockTransport(lambda request: response)
+
+    with DirectusClient(
+        "http://directus.test", "admin", "secret", transport=transport
+    ) as client:
+        with pytest.raises(DirectusAuthException):
+            client.read_items("articles")
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+
+from pydirectus.batch import arun_chunks, chunk_rows, envelope_budget, run_chunks
+from pydirectus.exceptions import DirectusException
+
+
+def test_chunk_rows_by_count():
+    assert list(chunk_rows(range(7), chunk_size=3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_chunk_rows_by_bytes():
+    rows = [{"title": "x" * 10} for _ in range(10)]
+    row_bytes = len(json.dumps(rows[0], separators=(",", ":")))
+
+    chunks = list(chunk_rows(rows, chunk_size=100, max_chunk_bytes=3 * row_bytes + 5))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+    for chunk in chunks:
+        assert len(json.dumps(chunk, separators=(",", ":"))) <= 3 * row_bytes + 5
+
+
+def test_chunk_rows_oversized_row_is_own_chunk():
+    rows = ["a", "b" * 100, "c"]
+
+    assert list(chunk_rows(rows, max_chunk_bytes=20)) == [["a"], ["b" * 100], ["c"]]
+
+
+def test_chunk_rows_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        list(chunk_rows([1], chunk_size=0))
+
+
+def test_envelope_budget():
+    assert envelope_budget(None, {"data": {}}) is None
+
+    envelope = {"data": {"status": "published"}}
+    chunks = list(chunk_rows(range(1000), 1000, envelope_budget(100, envelope)))
+
+    assert [key for chunk in chunks for key in chunk] == list(range(1000))
+    for chunk in chunks:
+        payload = json.dumps({"keys": chunk, **envelope}, separators=(",", ":"))
+        assert len(payload) <= 100
+
+    with pytest.raises(ValueError):
+        envelope_budget(10, {"data": {"body": "x" * 20}})
+
+
+def test_run_chunks_keeps_results_of_other_chunks():
+    def send_chunk(chunk: list) -> list:
+        if 3 in chunk:
+            raise DirectusException("failed")
+        return [row * 10 for row in chunk]
+
+    result = run_chunks(send_chunk, chunk_rows(range(6), chunk_size=2), workers=2)
+
+    assert not result.success
+    assert result.data == [0, 10, 40, 50]
+    assert [(e.index, e.rows) for e in result.errors] == [(1, [2, 3])]
+    with pytest.raises(DirectusException):
+        result.raise_for_errors()
+
+
+def test_arun_chunks_catches_any_exception():
+    async def send_chunk(chunk: list) -> list:
+        if 0 in chunk:
+            raise KeyError("unexpected")
+        return chunk
+
+    result = asyncio.run(arun_chunks(send_chunk, [[0], [1], [2]], workers=2))
+
+    assert result.data == [1, 2]
+    assert isinstance(result.errors[0].exception, KeyError)
+
+
+def test_create_items_in_chunks(client, mock):
+    items = [{"title": f"item {i}"} for i in range(25)]
+
+    result = client.create_items("articles", items, chunk_size=10)
+
+    assert result.success
+    assert result.data == items
+    assert mock.requests[("POST", "/items/{collection}")] == 3
+
+
+def test_update_items_with_one_payload(client, mock):
+    result = client.update_items(
+        "articles", {"status": "draft"}, keys=list(range(1, 21)), max_chunk_bytes=64
+    )
+
+    keys = [key for payload in result.data for key in payload["keys"]]
+    assert result.success
+    assert keys == list(range(1, 21))
+    assert len(result.data) > 1
+    assert mock.requests[("PATCH", "/items/{collection}")] == len(result.data)
+
+
+def test_failed_chunks_are_reported(client):
+    result = client.create_items("unknown", [{"title": "a"}, {"title": "b"}], 1)
+
+    assert [e.index for e in result.errors] == [0, 1]
+    assert result.data == []
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pydirectus.local_query import compile_filter, compile_sort, run_query
+
+ITEMS = [
+    {
+        "id": 1,
+        "title": "Hello World",
+        "views": 10,
+        "tags": ["a", "b"],
+        "author": {"name": "Ann"},
+    },
+    {"id": 2, "title": "second", "views": None, "tags": [], "author": {"name": "Bob"}},
+    {"id": 3, "title": "Third", "views": 5, "tags": None, "author": None},
+]
+
+
+def ids(filter: dict) -> list:
+    predicate = compile_filter(filter)
+    return [item["id"] for item in ITEMS if predicate(item)]
+
+
+@pytest.mark.parametrize(
+    "filter, expected",
+    [
+        ({}, [1, 2, 3]),
+        ({"id": {"_eq": 2}}, [2]),
+        ({"id": {"_neq": 2}}, [1, 3]),
+        ({"views": {"_gt": 5}}, [1]),
+        ({"views": {"_lte": 5}}, [3]),
+        ({"views": {"_null": True}}, [2]),
+        ({"views": {"_nnull": True}}, [1, 3]),
+        ({"views": {"_in": [5, 10]}}, [1, 3]),
+        ({"views": {"_between": [5, 10]}}, [1, 3]),
+        ({"title": {"_contains": "o"}}, [1, 2]),
+        ({"title": {"_icontains": "third"}}, [3]),
+        ({"title": {"_starts_with": "Hello"}}, [1]),
+        ({"tags": {"_empty": True}}, [2, 3]),
+        ({"author": {"name": {"_eq": "Bob"}}}, [2]),
+        ({"_or": [{"id": {"_eq": 1}}, {"views": {"_null": True}}]}, [1, 2]),
+        ({"_and": [{"views": {"_nnull": True}}, {"id": {"_gt": 1}}]}, [3]),
+    ],
+)
+def test_compile_filter(filter, expected):
+    assert ids(filter) == expected
+
+
+def test_now_variable():
+    now = datetime.now(timezone.utc)
+    items = [
+        {"id": 1, "date": (now - timedelta(days=3)).isoformat()},
+        {"id": 2, "date": (now - timedelta(days=10)).isoformat()},
+    ]
+
+    predicate = compile_filter({"date": {"_gte": "$NOW(-7 days)"}})
+
+    assert [item["id"] for item in items if predicate(item)] == [1]
+
+
+def test_invalid_filter():
+    with pytest.raises(ValueError):
+        compile_filter({"id": 1})
+    with pytest.raises(ValueError):
+        compile_filter({"id": {"_eq": "$CURRENT_USER"}})
+
+
+def test_sort_nulls_last_by_default():
+    sort = compile_sort(["views"])
+
+    assert [item["id"] for item in sort(ITEMS)] == [3, 1, 2]
+    assert [item["id"] for item in compile_sort(["-views"])(ITEMS)] == [2, 1, 3]
+    assert [item["id"] for item in compile_sort(["views"], True)(ITEMS)] == [2, 3, 1]
+
+
+def test_run_query():
+    query = {
+        "filter": {"views": {"_nnull": True}},
+        "sort": ["-id"],
+        "fields": ["id", "author.name"],
+    }
+
+    assert run_query(ITEMS, query) == [
+        {"id": 3, "author": None},
+        {"id": 1, "author": {"name": "Ann"}},
+    ]
+
+
+def test_run_query_page_replaces_offset():
+    query = {"sort": ["id"], "limit": 1, "offset": 2, "page": 2}
+
+    assert [item["id"] for item in run_query(ITEMS, query)] == [2]
+    with pytest.raises(ValueError):
+        run_query(ITEMS, {"page": 2}, default_limit=None)
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from pydirectus import AsyncDirectusClient
+from pydirectus.pagination import (
+    aiter_keyset_pages,
+    iter_keyset_pages,
+    iter_pages,
+    page_offset,
+    page_queries,
+)
+
+
+def test_page_queries():
+    assert list(page_queries({"limit": 5, "filter": {}}, 2)) == [
+        {"filter": {}, "limit": 2, "offset": 0},
+        {"filter": {}, "limit": 2, "offset": 2},
+        {"filter": {}, "limit": 1, "offset": 4},
+    ]
+
+
+def test_page_queries_without_limit():
+    queries = page_queries({"offset": 10}, 3)
+
+    assert [next(queries)["offset"] for _ in range(3)] == [10, 13, 16]
+
+
+def test_page_replaces_offset():
+    queries = list(page_queries({"limit": 4, "page": 3, "offset": 100}, 4))
+
+    assert queries == [{"limit": 4, "offset": 8}]
+
+
+@pytest.mark.parametrize("limit, page", [(None, 2), (-1, 2), (0, 2), (10, 0)], ids=str)
+def test_page_requires_positive_limit(limit, page):
+    with pytest.raises(ValueError):
+        page_offset(limit, None, page)
+
+
+def test_iter_pages(client, mock):
+    fetch = lambda query: client.read_items("articles", query)
+
+    pages = list(iter_pages(fetch, {"limit": 230}, page_size=100, prefetch=True))
+
+    assert [len(page) for page in pages] == [100, 100, 30]
+    assert [item["id"] for page in pages for item in page] == list(range(1, 231))
+    assert mock.requests[("GET", "/items/{collection}")] == 3
+
+
+def test_iter_pages_stops_on_incomplete_page(client, mock):
+    fetch = lambda query: client.read_items("articles", query)
+
+    pages = list(iter_pages(fetch, None, page_size=100))
+
+    assert [len(page) for page in pages] == [100, 100, 50]
+    assert mock.requests[("GET", "/items/{collection}")] == 3
+
+
+def test_iter_keyset_pages(client, mock):
+    fetch = lambda query: client.read_items("articles", query)
+    query = {"filter": {"status": {"_eq": "draft"}}, "fields": ["title"]}
+
+    pages = list(iter_keyset_pages(fetch, query, page_size=20))
+
+    ids = [item["id"] for page in pages for item in page]
+    expected = [
+        item["id"] for item in mock.collections["articles"] if item["status"] == "draft"
+    ]
+    assert ids == expected
+    assert all(len(page) == 20 for page in pages[:-1])
+
+
+def test_iter_keyset_pages_descending(client):
+    fetch = lambda query: client.read_items("articles", query)
+
+    pages = list(iter_keyset_pages(fetch, {"limit": 45}, page_size=20, key="-id"))
+
+    assert [item["id"] for page in pages for item in page] == list(range(250, 205, -1))
+
+
+def test_keyset_rejects_offset():
+    with pytest.raises(ValueError):
+        list(iter_keyset_pages(lambda query: [], {"offset": 10}))
+
+
+def test_aiter_keyset_pages(mock):
+    async def run() -> list:
+        async with AsyncDirectusClient(
+            "http://directus.test",
+            static_token=mock.static_token,
+            transport=mock.async_transport(),
+        ) as client:
+            fetch = lambda query: client.read_items("articles", query)
+            return [page async for page in aiter_keyset_pages(fetch, None, 100)]
+
+    pages = asyncio.run(run())
+
+    assert [len(page) for page in pages] == [100, 100, 50]
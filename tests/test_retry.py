@@ -0,0 +1,138 @@
+import httpx
+import pytest
+
+from pydirectus.exceptions import DirectusCircuitOpenException
+from pydirectus.rest_adapter import RestAdapter
+from pydirectus.retry import CircuitBreaker, RetryBudget, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr("pydirectus.retry.time", clock)
+    return clock
+
+
+def test_retry_delay_backoff():
+    policy = RetryPolicy(max_retries=3, backoff_factor=0.5, jitter=False)
+
+    assert [policy.retry_delay("GET", attempt) for attempt in range(4)] == [
+        0.5,
+        1.0,
+        2.0,
+        None,
+    ]
+
+
+def test_retry_delay_only_for_idempotent_methods_and_statuses():
+    policy = RetryPolicy(jitter=False)
+
+    assert policy.retry_delay("POST", 0) is None
+    assert policy.retry_delay("GET", 0, httpx.Response(404)) is None
+    assert policy.retry_delay("GET", 0, httpx.Response(503)) == 0.5
+
+
+def test_retry_delay_respects_retry_after():
+    policy = RetryPolicy(max_backoff=10)
+
+    assert policy.retry_delay("GET", 0, _retry_after("3")) == 3
+    assert policy.retry_delay("GET", 0, _retry_after("120")) == 10
+
+
+def test_retry_budget_limits_retries():
+    policy = RetryPolicy(jitter=False, budget=RetryBudget(ratio=0.5, min_retries=1))
+
+    assert policy.retry_delay("GET", 0) == 0.5
+    assert policy.retry_delay("GET", 0) is None
+
+    policy.budget.deposit()
+    policy.budget.deposit()
+    assert policy.retry_delay("GET", 0) == 0.5
+
+
+def test_adapter_retries_until_success():
+    statuses = iter([503, 502, 200])
+    adapter = RestAdapter(
+        "http://directus.test",
+        retry_policy=RetryPolicy(backoff_factor=0),
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(next(statuses), json={"data": []})
+        ),
+    )
+
+    assert adapter.get("/items/articles").success
+
+
+def test_circuit_breaker_states(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(DirectusCircuitOpenException):
+        breaker.before_request()
+
+    clock.now += 30
+    assert breaker.state == "half-open"
+    breaker.before_request()
+    # only a single trial request is let through
+    with pytest.raises(DirectusCircuitOpenException):
+        breaker.before_request()
+
+    # a failed trial reopens the circuit
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 30
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_request()
+
+
+def test_circuit_breaker_released_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=1)
+    breaker.record_failure()
+    clock.now += 1
+
+    breaker.before_request()
+    breaker.release_trial()
+    breaker.before_request()
+
+
+def test_adapter_fails_fast_while_circuit_is_open(clock):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(503, json={"errors": [{"message": "down"}]})
+
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+    adapter = RestAdapter(
+        "http://directus.test",
+        retry_policy=RetryPolicy(max_retries=0),
+        circuit_breaker=breaker,
+        transport=httpx.MockTransport(handler),
+    )
+
+    assert not adapter.get("/items/articles").success
+    assert not adapter.get("/items/articles").success
+    with pytest.raises(DirectusCircuitOpenException):
+        adapter.get("/items/articles")
+    assert len(requests) == 2 and breaker.state == "open"
+
+
+def _retry_after(value: str) -> httpx.Response:
+    return httpx.Response(503, headers={"Retry-After": value})
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from pydirectus.exceptions import DirectusException
+from pydirectus.streaming import DataArrayParser
+
+BODY = json.dumps(
+    {
+        "data": [
+            {"id": 1, "title": "Grüße", "tags": ["a", "b"]},
+            {"id": 2, "title": 'quote " and ] bracket', "author": None},
+            [1, 2.5, True],
+        ],
+        "meta": {"filter_count": 3},
+    },
+    ensure_ascii=False,
+).encode()
+
+
+def parse(body: bytes, chunk_size: int) -> tuple[list, DataArrayParser]:
+    parser = DataArrayParser()
+    items = []
+    for start in range(0, len(body), chunk_size):
+        items.extend(parser.feed(body[start : start + chunk_size]))
+    items.extend(parser.close())
+    return items, parser
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 20])
+def test_chunk_boundaries(chunk_size):
+    items, parser = parse(BODY, chunk_size)
+
+    assert items == json.loads(BODY)["data"]
+    assert parser.meta == {"filter_count": 3}
+    assert parser.finished
+
+
+def test_items_are_returned_when_complete():
+    parser = DataArrayParser()
+
+    assert parser.feed(b'{"data": [{"id": 1}, {"id"') == [{"id": 1}]
+    assert parser.feed(b": 2}]}") == [{"id": 2}]
+    assert parser.close() == []
+
+
+def test_empty_and_null_data():
+    assert parse(b'{"data": []}', 3)[0] == []
+    assert parse(b'{"meta": {}, "data": null}', 3)[0] == []
+
+
+def test_incomplete_body_raises():
+    parser = DataArrayParser()
+    parser.feed(b'{"data": [{"id": 1}, {"id": 2')
+
+    with pytest.raises(DirectusException):
+        parser.close()
+
+
+def test_stream_items(client, mock):
+    stream = client.stream_items("articles", {"limit": -1, "meta": "*"}, chunk_size=512)
+
+    assert list(stream) == mock.collections["articles"]
+    assert stream.meta["filter_count"] == 250